@@ -7,6 +7,7 @@ from flask_login import LoginManager
 from authlib.integrations.flask_client import OAuth
 
 from app.config import Config
+from app.utils.http import mount_shared_pool
 
 # Initialize extensions
 db = SQLAlchemy()
@@ -38,7 +39,8 @@ def create_app(test_config=None):
         server_metadata_url='https://accounts.google.com/.well-known/openid_configuration',
         client_kwargs={
             'scope': 'openid email profile'
-        }
+        },
+        compliance_fix=mount_shared_pool
     )
 
     oauth.register(
@@ -49,6 +51,7 @@ def create_app(test_config=None):
         authorize_url='https://www.facebook.com/v18.0/dialog/oauth',
         api_base_url='https://graph.facebook.com/v18.0/',
         client_kwargs={'scope': 'email'},
+        compliance_fix=mount_shared_pool
     )
 
     oauth.register(
@@ -57,9 +60,28 @@ def create_app(test_config=None):
         client_secret=app.config['APPLE_PRIVATE_KEY'],
         access_token_url='https://appleid.apple.com/auth/token',
         authorize_url='https://appleid.apple.com/auth/authorize',
+        jwks_uri='https://appleid.apple.com/auth/keys',
         client_kwargs={'scope': 'name email'},
+        compliance_fix=mount_shared_pool
     )
 
+    # Materialize provider clients once rather than on every OAuth request
+    from app.services.oauth_service import OAUTH_PROVIDERS
+    app.extensions['oauth_clients'] = {
+        provider: oauth.create_client(provider) for provider in OAUTH_PROVIDERS
+    }
+
+    # Share cached subtitle content across workers when Redis is configured
+    if app.config.get('SUBTITLE_CACHE_REDIS_URL'):
+        from app.utils.cache import redis, subtitle_cache
+        if redis is None:
+            app.logger.warning('SUBTITLE_CACHE_REDIS_URL is set but redis is not installed')
+        else:
+            subtitle_cache.use_shared_store(
+                redis.Redis.from_url(app.config['SUBTITLE_CACHE_REDIS_URL']),
+                app.config.get('SUBTITLE_CACHE_LOCAL_TTL', 60)
+            )
+
     # Configure Flask-Login
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Please log in to access this page.'
@@ -91,6 +113,10 @@ def create_app(test_config=None):
 
     # Test database connection on startup
     with app.app_context():
+        # Apply SQLite PRAGMAs to every pooled connection, starting with this one
+        from app.utils.database import register_sqlite_pragmas
+        register_sqlite_pragmas(db.engine)
+
         try:
             with db.engine.connect() as conn:
                 conn.execute(db.text('SELECT 1'))
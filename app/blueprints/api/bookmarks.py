@@ -1,5 +1,5 @@
 """Bookmark API endpoints for user bookmark management."""
-from flask import jsonify, request
+from flask import Response, jsonify, request, stream_with_context
 from flask_login import login_required, current_user
 from sqlalchemy import exc
 from app.blueprints.api import api_bp
@@ -367,4 +367,39 @@ def export_bookmarks():
         return jsonify({
             'error': 'Internal server error',
             'code': 'INTERNAL_ERROR'
-        }), 500
\ No newline at end of file
+        }), 500
+
+
+@api_bp.route('/bookmarks/export/download', methods=['GET'])
+@login_required
+def download_bookmarks_export():
+    """
+    Stream user bookmarks as a plain text file for external study tools.
+    
+    Unlike /bookmarks/export, the export is sent as it is generated, so
+    large bookmark collections are never held in memory at once.
+    
+    Query parameters:
+        format (str): Export format, currently only 'text' is supported (default 'text')
+        
+    Returns:
+        Streamed text/plain attachment with the exported bookmarks
+    """
+    export_format = request.args.get('format', 'text').lower()
+    
+    try:
+        chunks = BookmarkService.iter_export_bookmarks(
+            user_id=current_user.id,
+            format=export_format
+        )
+    except BookmarkServiceError:
+        return jsonify({
+            'error': 'Only "text" format is currently supported',
+            'code': 'UNSUPPORTED_FORMAT'
+        }), 400
+    
+    return Response(
+        stream_with_context(chunks),
+        mimetype='text/plain; charset=utf-8',
+        headers={'Content-Disposition': 'attachment; filename=bookmarks.txt'}
+    )
@@ -1,4 +1,5 @@
 """Dashboard API endpoints for comprehensive learning analytics."""
+from datetime import datetime
 from flask import jsonify, request
 from flask_login import login_required, current_user
 from sqlalchemy import exc
@@ -115,9 +116,12 @@ def get_session_history():
     Query parameters:
         limit (int): Maximum number of sessions to return (default 50, max 100)
         days (int): Number of days back to include (default 30, max 365)
+        before (str): Cursor from a previous page's next_cursor, as
+            "<ISO datetime>,<progress id>"; a bare ISO datetime returns the
+            sessions accessed before that time
         
     Returns:
-        JSON response with session history and analytics
+        JSON response with session history, analytics and the next page cursor
     """
     try:
         from app.services.session_analytics_service import SessionAnalyticsService
@@ -144,13 +148,32 @@ def get_session_history():
         except (ValueError, TypeError):
             days = 30
         
+        before = request.args.get('before')
+        if before is not None:
+            accessed, _, progress_id = before.partition(',')
+            try:
+                # A bare datetime pairs with ID 0, keeping only sessions accessed before it
+                before = (datetime.fromisoformat(accessed), int(progress_id or 0))
+            except ValueError:
+                return jsonify({
+                    'error': 'Invalid before cursor',
+                    'code': 'INVALID_CURSOR'
+                }), 400
+        
         # Get session history
-        session_history = SessionAnalyticsService.get_session_history(current_user.id, limit, days)
+        session_history = SessionAnalyticsService.get_session_history(current_user.id, limit, days, before)
+        
+        # A full page may have older sessions after it
+        next_cursor = None
+        if len(session_history) == limit:
+            last_session = session_history[-1]
+            next_cursor = f"{last_session['datetime']},{last_session['progress_id']}"
         
         return jsonify({
             'session_history': session_history,
             'limit': limit,
-            'days': days
+            'days': days,
+            'next_cursor': next_cursor
         }), 200
         
     except Exception as e:
@@ -18,6 +18,8 @@ def get_movies():
     
     Query Parameters:
         search (str, optional): Search query for partial title matching (case-insensitive)
+        search_mode (str, optional): 'contains' (default) or 'prefix' for faster
+            title-start matching, e.g. for autocomplete
         letter (str, optional): Letter filter (A-Z, #, or 'all')
     
     Returns:
@@ -33,6 +35,7 @@ def get_movies():
 
         # Get optional query parameters
         search_query = request.args.get('search', '').strip()
+        search_mode = request.args.get('search_mode', 'contains').strip().lower()
         letter_filter = request.args.get('letter', '').strip()
 
         # Use content service to get available movies with optional filters
@@ -40,7 +43,8 @@ def get_movies():
             current_user.native_language_id,
             current_user.target_language_id,
             search_query=search_query if search_query else None,
-            letter_filter=letter_filter if letter_filter else None
+            letter_filter=letter_filter if letter_filter else None,
+            search_mode=search_mode
         )
 
         response_data = {
@@ -92,6 +96,7 @@ def get_letter_counts():
     
     Query Parameters:
         search (str, optional): Search query to filter counts (case-insensitive)
+        search_mode (str, optional): 'contains' (default) or 'prefix'
     
     Returns:
         JSON response with letter counts and metadata
@@ -106,12 +111,14 @@ def get_letter_counts():
 
         # Get optional search query parameter
         search_query = request.args.get('search', '').strip()
+        search_mode = request.args.get('search_mode', 'contains').strip().lower()
 
         # Use content service to get letter counts with optional search filter
         letter_counts = ContentService.get_letter_counts(
             current_user.native_language_id,
             current_user.target_language_id,
-            search_query=search_query if search_query else None
+            search_query=search_query if search_query else None,
+            search_mode=search_mode
         )
 
         # Create full alphabet with zero counts for missing letters
@@ -70,7 +70,8 @@ def update_progress(sub_link_id):
     Expected JSON payload:
     {
         "current_alignment_index": integer,
-        "session_duration_minutes": integer (optional, default 0)
+        "session_duration_minutes": integer (optional, default 0),
+        "defer": boolean (optional, default false; allow the write to be buffered)
     }
     
     Returns:
@@ -123,7 +124,8 @@ def update_progress(sub_link_id):
             user_id=current_user.id,
             sub_link_id=sub_link_id,
             current_alignment_index=current_alignment_index,
-            session_duration_minutes=session_duration_minutes
+            session_duration_minutes=session_duration_minutes,
+            defer=bool(data.get('defer', False))
         )
 
         return jsonify({
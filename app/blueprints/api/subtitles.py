@@ -359,8 +359,12 @@ def get_subtitle_alignments(sub_link_id):
         all_line_ids = source_line_ids.union(target_line_ids)
         subtitle_lines = {}
         if all_line_ids:
-            lines = SubLine.query.filter(SubLine.id.in_(all_line_ids)).all()
-            subtitle_lines = {line.id: line.to_dict() for line in lines}
+            # Read plain rows; the response only needs the column values
+            lines = SubLine.query.with_entities(
+                SubLine.id, SubLine.movie_id, SubLine.sequence,
+                SubLine.content, SubLine.language_id
+            ).filter(SubLine.id.in_(all_line_ids)).all()
+            subtitle_lines = {line.id: line._asdict() for line in lines}
 
         # Format alignment data for response
         formatted_alignments = []
@@ -5,12 +5,13 @@ from wtforms.validators import (
     DataRequired, Email, Length, EqualTo, ValidationError, Regexp
 )
 from app.models import User
+from app.services.auth_service import normalize_email
 
 
 class RegistrationForm(FlaskForm):
     """User registration form with email validation and password strength."""
 
-    email = StringField('Email', validators=[
+    email = StringField('Email', filters=[normalize_email], validators=[
         DataRequired(message='Email is required'),
         Email(message='Please enter a valid email address'),
         Length(max=255, message='Email must be less than 255 characters')
@@ -36,7 +37,7 @@ class RegistrationForm(FlaskForm):
 
     def validate_email(self, email):
         """Check if email is already registered."""
-        user = User.query.filter_by(email=email.data.lower()).first()
+        user = User.query.filter_by(email=email.data).first()
         if user:
             raise ValidationError(
                 'Email address already registered. Please choose a different one.'
@@ -46,7 +47,7 @@ class RegistrationForm(FlaskForm):
 class LoginForm(FlaskForm):
     """User login form with email/password inputs and remember-me option."""
 
-    email = StringField('Email', validators=[
+    email = StringField('Email', filters=[normalize_email], validators=[
         DataRequired(message='Email is required'),
         Email(message='Please enter a valid email address')
     ])
@@ -63,7 +64,7 @@ class LoginForm(FlaskForm):
 class PasswordResetRequestForm(FlaskForm):
     """Password reset request form."""
 
-    email = StringField('Email', validators=[
+    email = StringField('Email', filters=[normalize_email], validators=[
         DataRequired(message='Email is required'),
         Email(message='Please enter a valid email address')
     ])
@@ -72,7 +73,7 @@ class PasswordResetRequestForm(FlaskForm):
 
     def validate_email(self, email):
         """Check if email exists in the database."""
-        user = User.query.filter_by(email=email.data.lower()).first()
+        user = User.query.filter_by(email=email.data).first()
         if not user:
             raise ValidationError('No account found with that email address.')
 
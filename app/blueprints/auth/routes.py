@@ -302,7 +302,7 @@ def oauth_callback(provider):
             return redirect(url_for('auth.login'))
         
         # Validate state parameter for CSRF protection
-        if not OAuthService.validate_state(state):
+        if not OAuthService.validate_state(state, provider):
             flash('OAuth security validation failed. Please try again.', 'error')
             return redirect(url_for('auth.login'))
         
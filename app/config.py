@@ -22,6 +22,29 @@ class Config:
     )
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True
+    }
+    # SQLite engines use pools that take no size or recycle options
+    if not DATABASE_URL.startswith('sqlite'):
+        SQLALCHEMY_ENGINE_OPTIONS.update({
+            'pool_size': 10,
+            'pool_recycle': 3600
+        })
+
+    # Seconds deferred progress updates may be buffered before being written;
+    # 0 writes every update through
+    PROGRESS_WRITE_BEHIND_SECONDS = float(os.environ.get('PROGRESS_WRITE_BEHIND_SECONDS', 0))
+
+    # Redis URL sharing cached subtitle content across workers, which then
+    # keep their own copies for SUBTITLE_CACHE_LOCAL_TTL seconds; unset keeps
+    # the cache in-process only
+    SUBTITLE_CACHE_REDIS_URL = os.environ.get('SUBTITLE_CACHE_REDIS_URL')
+    SUBTITLE_CACHE_LOCAL_TTL = int(os.environ.get('SUBTITLE_CACHE_LOCAL_TTL', 60))
+
+    # Draw session and reset tokens from a buffered entropy pool instead of
+    # asking the OS for every token; off uses secrets.token_urlsafe
+    TOKEN_POOL_ENABLED = os.environ.get('TOKEN_POOL_ENABLED', 'false').lower() in ['true', '1', 'on']
 
     # OAuth configuration
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
@@ -1,4 +1,5 @@
 """Bookmark model for user subtitle learning bookmarks."""
+from sqlalchemy import DDL, event
 from app import db
 
 
@@ -24,7 +25,8 @@ class Bookmark(db.Model):
         db.UniqueConstraint('user_id', 'sub_link_id', 'alignment_index'),
         db.Index('idx_bookmarks_user', 'user_id'),
         db.Index('idx_bookmarks_link', 'sub_link_id'),
-        db.Index('idx_bookmarks_active', 'user_id', 'is_active')
+        # Covers the active-bookmark listings ordered by created_at
+        db.Index('idx_bookmarks_active_created', 'user_id', 'is_active', 'created_at')
     )
     
     def to_dict(self):
@@ -40,4 +42,38 @@ class Bookmark(db.Model):
         }
     
     def __repr__(self):
-        return f'<Bookmark {self.id}: User {self.user_id}, SubLink {self.sub_link_id}, Index {self.alignment_index}>'
\ No newline at end of file
+        return f'<Bookmark {self.id}: User {self.user_id}, SubLink {self.sub_link_id}, Index {self.alignment_index}>'
+
+
+# SQLite FTS5 index over bookmark notes, kept in sync with the bookmarks table by triggers
+BOOKMARK_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS bookmark_fts USING fts5(
+        note, content='bookmarks', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bookmarks_fts_insert AFTER INSERT ON bookmarks BEGIN
+        INSERT INTO bookmark_fts(rowid, note) VALUES (new.id, new.note);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bookmarks_fts_delete AFTER DELETE ON bookmarks BEGIN
+        INSERT INTO bookmark_fts(bookmark_fts, rowid, note) VALUES ('delete', old.id, old.note);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bookmarks_fts_update AFTER UPDATE OF note ON bookmarks BEGIN
+        INSERT INTO bookmark_fts(bookmark_fts, rowid, note) VALUES ('delete', old.id, old.note);
+        INSERT INTO bookmark_fts(rowid, note) VALUES (new.id, new.note);
+    END
+    """,
+]
+
+for _statement in BOOKMARK_FTS_DDL:
+    event.listen(Bookmark.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+
+event.listen(
+    Bookmark.__table__, 'before_drop',
+    DDL('DROP TABLE IF EXISTS bookmark_fts').execute_if(dialect='sqlite')
+)
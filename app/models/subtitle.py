@@ -1,7 +1,14 @@
 """Subtitle models for movie content management."""
+from sqlalchemy import DDL, bindparam, event, func, select
 from app import db
 
 
+TITLE_LETTER_SQL = (
+    "CASE WHEN substr(title, 1, 1) BETWEEN '0' AND '9' THEN '#' "
+    "ELSE upper(substr(title, 1, 1)) END"
+)
+
+
 class SubTitle(db.Model):
     """Movie title model for subtitle catalog."""
     
@@ -9,6 +16,14 @@ class SubTitle(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.Text, nullable=False)
+    # Browse letter of the title: its uppercased initial, or '#' for a digit
+    title_letter = db.Column(db.String(1), db.Computed(TITLE_LETTER_SQL, persisted=True))
+    
+    __table_args__ = (
+        db.Index('idx_sub_titles_title_letter', 'title_letter'),
+        # Serves case-insensitive title prefix searches
+        db.Index('idx_sub_titles_title_lower', db.func.lower(title)),
+    )
     
     def to_dict(self):
         """Convert SubTitle to dictionary for JSON serialization."""
@@ -21,6 +36,41 @@ class SubTitle(db.Model):
         return f'<SubTitle {self.id}: {self.title}>'
 
 
+# SQLite FTS5 trigram index over movie titles, kept in sync with the sub_titles
+# table by triggers; trigrams serve case-insensitive substring searches
+SUB_TITLE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS sub_title_fts USING fts5(
+        title, content='sub_titles', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sub_titles_fts_insert AFTER INSERT ON sub_titles BEGIN
+        INSERT INTO sub_title_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sub_titles_fts_delete AFTER DELETE ON sub_titles BEGIN
+        INSERT INTO sub_title_fts(sub_title_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sub_titles_fts_update AFTER UPDATE OF title ON sub_titles BEGIN
+        INSERT INTO sub_title_fts(sub_title_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        INSERT INTO sub_title_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+]
+
+for _statement in SUB_TITLE_FTS_DDL:
+    event.listen(SubTitle.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+
+event.listen(
+    SubTitle.__table__, 'before_drop',
+    DDL('DROP TABLE IF EXISTS sub_title_fts').execute_if(dialect='sqlite')
+)
+
+
 class SubLine(db.Model):
     """Subtitle line model for storing individual subtitle content."""
     
@@ -32,6 +82,11 @@ class SubLine(db.Model):
     content = db.Column(db.Text, nullable=False)
     language_id = db.Column(db.Integer, db.ForeignKey('languages.id'), nullable=False)
     
+    # Serves the per-movie, per-language line listing in sequence order
+    __table_args__ = (
+        db.Index('ix_sublines_mls', 'movie_id', 'language_id', 'sequence'),
+    )
+    
     # Relationships
     movie = db.relationship('SubTitle', backref='subtitle_lines')
     language = db.relationship('Language', backref='subtitle_lines')
@@ -67,6 +122,12 @@ class SubLink(db.Model):
     from_language = db.relationship('Language', foreign_keys=[fromlang], backref='from_sub_links')
     to_language = db.relationship('Language', foreign_keys=[tolang], backref='to_sub_links')
     
+    # Language-pair indexes covering each side of the link for movie lookups
+    __table_args__ = (
+        db.Index('idx_sub_links_from_pair', 'fromlang', 'tolang', 'fromid'),
+        db.Index('idx_sub_links_to_pair', 'fromlang', 'tolang', 'toid'),
+    )
+    
     def to_dict(self):
         """Convert SubLink to dictionary for JSON serialization."""
         return {
@@ -105,6 +166,69 @@ class SubLinkLine(db.Model):
         return f'<SubLinkLine {self.id}: SubLink {self.sub_link_id}>'
 
 
+class SubLinkAlignment(db.Model):
+    """One aligned line pair of a subtitle link, addressable by its index."""
+    
+    __tablename__ = 'sub_link_alignments'
+    
+    sub_link_id = db.Column(db.Integer, db.ForeignKey('sub_links.id'), primary_key=True)
+    idx = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    source_line_ids = db.Column(db.JSON, nullable=False)
+    target_line_ids = db.Column(db.JSON, nullable=False)
+    
+    @staticmethod
+    def rows_from_link_data(sub_link_id, link_data):
+        """
+        Split a SubLinkLine link_data array into alignment rows.
+        
+        Args:
+            sub_link_id (int): ID of the subtitle link
+            link_data (list): Array of [[source_line_ids], [target_line_ids]] pairs
+            
+        Returns:
+            list: Row dictionaries for the sub_link_alignments table
+        """
+        rows = []
+        for idx, pair in enumerate(link_data or []):
+            source_line_ids = pair[0] if len(pair) > 0 else []
+            target_line_ids = pair[1] if len(pair) > 1 else []
+            rows.append({
+                'sub_link_id': sub_link_id,
+                'idx': idx,
+                'source_line_ids': source_line_ids or [],
+                'target_line_ids': target_line_ids or []
+            })
+        return rows
+    
+    def __repr__(self):
+        return f'<SubLinkAlignment {self.sub_link_id}#{self.idx}>'
+
+
+# Alignment totals are counted from these rows, which are kept in step with
+# link_data, so a link's JSON never has to be loaded just to take its length
+ALIGNMENT_COUNT_BY_SUB_LINK = select(func.count()).where(
+    SubLinkAlignment.sub_link_id == bindparam('sub_link_id')
+)
+
+
+@event.listens_for(SubLinkLine, 'after_insert')
+@event.listens_for(SubLinkLine, 'after_update')
+def _sync_sub_link_alignments(mapper, connection, target):
+    """Rewrite the alignment rows of a link whenever its link_data is saved."""
+    alignments = SubLinkAlignment.__table__
+    connection.execute(alignments.delete().where(alignments.c.sub_link_id == target.sub_link_id))
+    rows = SubLinkAlignment.rows_from_link_data(target.sub_link_id, target.link_data)
+    if rows:
+        connection.execute(alignments.insert(), rows)
+
+
+@event.listens_for(SubLinkLine, 'after_delete')
+def _delete_sub_link_alignments(mapper, connection, target):
+    """Drop the alignment rows of a link when its link_data is removed."""
+    alignments = SubLinkAlignment.__table__
+    connection.execute(alignments.delete().where(alignments.c.sub_link_id == target.sub_link_id))
+
+
 class UserProgress(db.Model):
     """User progress tracking model for subtitle learning sessions."""
     
@@ -124,7 +248,13 @@ class UserProgress(db.Model):
     sub_link = db.relationship('SubLink', backref='user_sessions')
     
     # Unique constraint to ensure one progress record per user per sub_link
-    __table_args__ = (db.UniqueConstraint('user_id', 'sub_link_id'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'sub_link_id'),
+        # Covers recent-progress listings ordered by last_accessed, and carries
+        # the summed columns so analytics aggregate from the index alone
+        db.Index('idx_user_progress_user_accessed_totals', 'user_id', 'last_accessed',
+                 'session_duration_minutes', 'total_alignments_completed', 'current_alignment_index'),
+    )
     
     def to_dict(self):
         """Convert UserProgress to dictionary for JSON serialization."""
@@ -4,6 +4,34 @@ from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
 
+try:
+    from gevent import monkey as gevent_monkey, get_hub as gevent_get_hub
+except ImportError:
+    gevent_monkey = None
+
+try:
+    from eventlet import patcher as eventlet_patcher, tpool as eventlet_tpool
+except ImportError:
+    eventlet_patcher = None
+
+
+def _run_password_hashing(func, *args):
+    """
+    Run a password hashing call without stalling a cooperative worker.
+
+    Werkzeug hashes through hashlib, which releases the GIL, so threaded
+    workers already hash in parallel and the call runs inline. Under
+    gevent or eventlet monkey patching the hash would block the whole
+    event loop, so it is moved to the hub's native thread pool instead.
+    """
+    if gevent_monkey is not None and gevent_monkey.is_module_patched('socket'):
+        return gevent_get_hub().threadpool.apply(func, args)
+
+    if eventlet_patcher is not None and eventlet_patcher.is_monkey_patched('socket'):
+        return eventlet_tpool.execute(func, *args)
+
+    return func(*args)
+
 
 class User(UserMixin, db.Model):
     """User model with authentication and OAuth support."""
@@ -46,13 +74,13 @@ class User(UserMixin, db.Model):
     def set_password(self, password):
         """Hash and set password using Werkzeug security."""
         if password:
-            self.password_hash = generate_password_hash(password)
+            self.password_hash = _run_password_hashing(generate_password_hash, password)
 
     def check_password(self, password):
         """Check password against stored hash."""
         if not self.password_hash:
             return False
-        return check_password_hash(self.password_hash, password)
+        return _run_password_hashing(check_password_hash, self.password_hash, password)
 
     def __repr__(self):
         """Debug representation of User model."""
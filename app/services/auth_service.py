@@ -1,9 +1,17 @@
 """Authentication service layer with business logic."""
-import secrets
 from datetime import datetime, timezone
 from flask import current_app
+from sqlalchemy import bindparam, select
+from werkzeug.security import check_password_hash, generate_password_hash
 from app import db
 from app.models import User, Language
+from app.models.user import _run_password_hashing
+from app.utils.tokens import token_urlsafe
+
+
+# Pre-built statement for the hot email lookup; SQLAlchemy's compiled cache
+# reuses its SQL on every execution instead of rebuilding the query
+USER_BY_EMAIL = select(User).where(User.email == bindparam('email'))
 
 
 class AuthenticationError(Exception):
@@ -11,6 +19,30 @@ class AuthenticationError(Exception):
     pass
 
 
+def normalize_email(email):
+    """
+    Normalize an email address for storage and lookup.
+
+    Safe to apply more than once, so forms can normalize at the edge and
+    the service still accepts raw input from the JSON API.
+
+    Args:
+        email (str): Raw email address, or None
+
+    Returns:
+        str: The trimmed, lowercased address (None passes through)
+    """
+    if not email:
+        return email
+    return email.strip().lower()
+
+
+# Throwaway hash verified for unknown emails, built once at import with the
+# app's normal hashing method so a miss costs the same as checking a real
+# user's password, the first miss included
+DUMMY_PASSWORD_HASH = generate_password_hash(token_urlsafe(16))
+
+
 class AuthService:
     """Authentication business logic service."""
 
@@ -32,22 +64,23 @@ class AuthService:
         Raises:
             AuthenticationError: If email is already registered or validation fails
         """
-        email = email.lower().strip()
+        email = normalize_email(email)
 
         # Check if email already exists
-        existing_user = User.query.filter_by(email=email).first()
+        existing_user = db.session.execute(USER_BY_EMAIL, {'email': email}).scalar_one_or_none()
         if existing_user:
             raise AuthenticationError('Email address already registered')
 
         try:
-            # Create new user
+            # Create new user with matching creation and update timestamps
+            now = datetime.now(timezone.utc)
             user = User(
                 email=email,
                 native_language_id=native_language_id,
                 target_language_id=target_language_id,
                 is_active=True,
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc)
+                created_at=now,
+                updated_at=now
             )
             user.set_password(password)
 
@@ -80,12 +113,15 @@ class AuthService:
         Raises:
             AuthenticationError: If authentication fails
         """
-        email = email.lower().strip()
+        email = normalize_email(email)
 
         # Find user by email
-        user = User.query.filter_by(email=email).first()
+        user = db.session.execute(USER_BY_EMAIL, {'email': email}).scalar_one_or_none()
 
         if not user:
+            # Verify against a dummy hash so unknown emails are not
+            # distinguishable by response time
+            _run_password_hashing(check_password_hash, DUMMY_PASSWORD_HASH, password)
             current_app.logger.warning(
                 f'Login attempt with non-existent email: {email}'
             )
@@ -111,7 +147,7 @@ class AuthService:
         Returns:
             str: A secure random token for password reset
         """
-        return secrets.token_urlsafe(32)
+        return token_urlsafe(32)
 
     @staticmethod
     def validate_password_reset_token(token, expiry_hours=24):
@@ -154,9 +190,9 @@ class AuthService:
         Raises:
             AuthenticationError: If user not found or reset fails
         """
-        email = email.lower().strip()
+        email = normalize_email(email)
 
-        user = User.query.filter_by(email=email).first()
+        user = db.session.execute(USER_BY_EMAIL, {'email': email}).scalar_one_or_none()
         if not user:
             raise AuthenticationError('User not found')
 
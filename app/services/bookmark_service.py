@@ -1,9 +1,32 @@
 """Bookmark service for managing user subtitle bookmarks."""
-from sqlalchemy import exc, and_, or_, text
-from sqlalchemy.orm import exc as orm_exc
+import itertools
+from sqlalchemy import exc, and_, text, select, tuple_
+from sqlalchemy.orm import exc as orm_exc, joinedload
 from app import db
 from app.models.bookmark import Bookmark
-from app.models.subtitle import SubLink, SubLinkLine, SubLine, SubTitle
+from app.models.subtitle import ALIGNMENT_COUNT_BY_SUB_LINK, SubLink, SubLinkAlignment, SubLine, SubTitle
+
+
+# Eager-load the SubLink details used by bookmark enrichment in the same query
+ENRICHMENT_LOAD_OPTIONS = (
+    joinedload(Bookmark.sub_link).joinedload(SubLink.from_subtitle),
+    joinedload(Bookmark.sub_link).joinedload(SubLink.from_language),
+    joinedload(Bookmark.sub_link).joinedload(SubLink.to_language),
+)
+
+
+# Text export layout, one block per bookmark
+EXPORT_BATCH_SIZE = 200
+EXPORT_HEADER = "Subtitle Learning Bookmarks Export\n" + "=" * 40 + "\n"
+EXPORT_ENTRY_TEMPLATE = (
+    "Movie: {movie_title}\n"
+    "Languages: {from_language} → {to_language}\n"
+    "Alignment #{alignment_number}\n"
+    "{content_line}"
+    "{note_line}"
+    "Bookmarked: {created}\n"
+    + "-" * 30 + "\n"
+)
 
 
 class BookmarkServiceError(Exception):
@@ -36,34 +59,26 @@ class BookmarkService:
             if alignment_index < 0:
                 raise BookmarkServiceError("Alignment index cannot be negative")
             
-            # Validate sub_link exists and get alignment data
-            sub_link = db.session.get(SubLink, sub_link_id)
-            if not sub_link:
-                raise BookmarkServiceError(f"Subtitle link {sub_link_id} not found")
-                
-            alignment_data = SubLinkLine.query.filter_by(sub_link_id=sub_link_id).first()
-            if not alignment_data or not alignment_data.link_data:
-                raise BookmarkServiceError("No alignment data found for this subtitle link")
-                
-            total_alignments = len(alignment_data.link_data)
-            if alignment_index >= total_alignments:
-                raise BookmarkServiceError(f"Alignment index {alignment_index} exceeds available alignments ({total_alignments})")
-            
-            # Check for duplicate bookmark (unique constraint will also prevent this)
-            existing_bookmark = Bookmark.query.filter_by(
-                user_id=user_id,
-                sub_link_id=sub_link_id,
-                alignment_index=alignment_index,
-                is_active=True
-            ).first()
-            
-            if existing_bookmark:
-                raise BookmarkServiceError("Bookmark already exists for this alignment")
-            
             # Validate note length (optional constraint)
             if note and len(note) > 1000:
                 raise BookmarkServiceError("Bookmark note cannot exceed 1000 characters")
             
+            # The alignment row exists only for an existing sub_link, so one
+            # primary key lookup validates both; the rarer failure cases are
+            # told apart afterwards
+            alignment = db.session.get(SubLinkAlignment, (sub_link_id, alignment_index))
+            if not alignment:
+                if not db.session.get(SubLink, sub_link_id):
+                    raise BookmarkServiceError(f"Subtitle link {sub_link_id} not found")
+                total_alignments = db.session.execute(
+                    ALIGNMENT_COUNT_BY_SUB_LINK, {'sub_link_id': sub_link_id}
+                ).scalar()
+                if not total_alignments:
+                    raise BookmarkServiceError("No alignment data found for this subtitle link")
+                raise BookmarkServiceError(f"Alignment index {alignment_index} exceeds available alignments ({total_alignments})")
+            
+            # Duplicates, active or soft-deleted, are rejected by the unique
+            # constraint on insert rather than checked for up front
             # Create new bookmark
             bookmark = Bookmark(
                 user_id=user_id,
@@ -78,7 +93,8 @@ class BookmarkService:
                 
         except exc.IntegrityError as e:
             db.session.rollback()
-            if "UNIQUE constraint failed" in str(e):
+            # SQLite reports the constraint in the message, PostgreSQL by SQLSTATE
+            if "UNIQUE constraint failed" in str(e.orig) or getattr(e.orig, 'pgcode', None) == '23505':
                 raise BookmarkServiceError("Bookmark already exists for this alignment")
             raise BookmarkServiceError(f"Database constraint violation: {str(e)}")
         except exc.SQLAlchemyError as e:
@@ -115,28 +131,18 @@ class BookmarkService:
             
             # Add search functionality if provided
             if search_query and search_query.strip():
-                # Join with SubLink and SubLinkLine to search content
-                query = query.join(SubLink).join(SubLinkLine, SubLink.id == SubLinkLine.sub_link_id)
-                # Use SQLite FTS if available, otherwise use LIKE search
-                search_term = f"%{search_query.strip().lower()}%"
-                query = query.filter(
-                    or_(
-                        Bookmark.note.ilike(search_term),
-                        # Note: Content search would require JSON extraction which is complex
-                        # For now, focus on note search
-                    )
-                )
+                query = query.filter(BookmarkService._note_search_filter(search_query))
             
             # Get total count for pagination
             total_count = query.count()
             
             # Get paginated results
-            bookmarks = query.order_by(Bookmark.created_at.desc()).offset(offset).limit(limit).all()
+            bookmarks = query.options(*ENRICHMENT_LOAD_OPTIONS).order_by(
+                Bookmark.created_at.desc()
+            ).offset(offset).limit(limit).all()
             
             # Enrich with content data
-            enriched_bookmarks = []
-            for bookmark in bookmarks:
-                enriched_bookmarks.append(BookmarkService._enrich_bookmark_data(bookmark))
+            enriched_bookmarks = BookmarkService._enrich_bookmarks_bulk(bookmarks)
             
             return {
                 'bookmarks': enriched_bookmarks,
@@ -225,16 +231,16 @@ class BookmarkService:
                 and_(
                     Bookmark.user_id == user_id,
                     Bookmark.is_active == True,
-                    Bookmark.note.ilike(f"%{search_term}%")
+                    BookmarkService._note_search_filter(search_term)
                 )
-            ).order_by(Bookmark.created_at.desc()).limit(limit).all()
+            ).options(*ENRICHMENT_LOAD_OPTIONS).order_by(Bookmark.created_at.desc()).limit(limit).all()
             
             # Enrich with content data and search highlighting
             results = []
-            for bookmark in bookmarks:
-                enriched = BookmarkService._enrich_bookmark_data(bookmark)
-                # Add search highlight info
-                if bookmark.note and search_term in bookmark.note.lower():
+            enriched_bookmarks = BookmarkService._enrich_bookmarks_bulk(bookmarks)
+            for bookmark, enriched in zip(bookmarks, enriched_bookmarks):
+                # Add search highlight info (only notes are indexed for search)
+                if bookmark.note:
                     enriched['search_highlight'] = 'note'
                 results.append(enriched)
             
@@ -260,44 +266,119 @@ class BookmarkService:
         Raises:
             BookmarkServiceError: If database error occurs
         """
-        try:
-            if format != 'text':
-                raise BookmarkServiceError("Only 'text' format is currently supported")
+        return "".join(BookmarkService.iter_export_bookmarks(user_id, format))
+    
+    @staticmethod
+    def iter_export_bookmarks(user_id, format='text'):
+        """
+        Export user bookmarks as a stream of text chunks.
+        
+        Bookmarks are fetched and enriched in batches of
+        EXPORT_BATCH_SIZE, so memory stays flat however many bookmarks
+        the user has. Joining the chunks gives the same text as
+        export_bookmarks.
+        
+        Args:
+            user_id (int): ID of the user
+            format (str): Export format ('text' is currently supported)
             
-            bookmarks = Bookmark.query.filter_by(
+        Returns:
+            iterator: Text chunks of the export
+            
+        Raises:
+            BookmarkServiceError: If the format is unsupported, or while
+                iterating if a database error occurs
+        """
+        if format != 'text':
+            raise BookmarkServiceError("Only 'text' format is currently supported")
+        
+        return BookmarkService._generate_text_export(user_id)
+    
+    @staticmethod
+    def _generate_text_export(user_id):
+        """Yield the text export for a user batch by batch."""
+        try:
+            bookmarks = iter(Bookmark.query.filter_by(
                 user_id=user_id,
                 is_active=True
-            ).order_by(Bookmark.created_at.desc()).all()
-            
-            if not bookmarks:
-                return "No bookmarks found for export."
-            
-            export_lines = ["Subtitle Learning Bookmarks Export", "="*40, ""]
-            
-            for bookmark in bookmarks:
-                enriched = BookmarkService._enrich_bookmark_data(bookmark)
+            ).options(*ENRICHMENT_LOAD_OPTIONS).order_by(
+                Bookmark.created_at.desc()
+            ).yield_per(EXPORT_BATCH_SIZE))
+            
+            has_bookmarks = False
+            batch = list(itertools.islice(bookmarks, EXPORT_BATCH_SIZE))
+            while batch:
+                if not has_bookmarks:
+                    has_bookmarks = True
+                    yield EXPORT_HEADER
                 
-                export_lines.append(f"Movie: {enriched.get('movie_title', 'Unknown')}")
-                export_lines.append(f"Languages: {enriched.get('from_language', 'Unknown')} → {enriched.get('to_language', 'Unknown')}")
-                export_lines.append(f"Alignment #{bookmark.alignment_index + 1}")
+                enriched_bookmarks = BookmarkService._enrich_bookmarks_bulk(batch)
+                for bookmark, enriched in zip(batch, enriched_bookmarks):
+                    yield "\n" + BookmarkService._format_export_entry(bookmark, enriched)
                 
-                if enriched.get('content_preview'):
-                    export_lines.append(f"Content: {enriched['content_preview']}")
-                
-                if bookmark.note:
-                    export_lines.append(f"Note: {bookmark.note}")
-                
-                export_lines.append(f"Bookmarked: {bookmark.created_at.strftime('%Y-%m-%d %H:%M')}")
-                export_lines.append("-" * 30)
-                export_lines.append("")
+                batch = list(itertools.islice(bookmarks, EXPORT_BATCH_SIZE))
             
-            return "\n".join(export_lines)
+            if not has_bookmarks:
+                yield "No bookmarks found for export."
             
         except exc.SQLAlchemyError as e:
             raise BookmarkServiceError(f"Database error exporting bookmarks: {str(e)}")
         except Exception as e:
             raise BookmarkServiceError(f"Error exporting bookmarks: {str(e)}")
     
+    @staticmethod
+    def _format_export_entry(bookmark, enriched):
+        """
+        Format a single bookmark as a text export block.
+        
+        Args:
+            bookmark (Bookmark): Bookmark instance
+            enriched (dict): Enriched bookmark data for the same bookmark
+            
+        Returns:
+            str: Export block terminated by a separator line
+        """
+        content_preview = enriched.get('content_preview')
+        
+        return EXPORT_ENTRY_TEMPLATE.format(
+            movie_title=enriched.get('movie_title', 'Unknown'),
+            from_language=enriched.get('from_language', 'Unknown'),
+            to_language=enriched.get('to_language', 'Unknown'),
+            alignment_number=bookmark.alignment_index + 1,
+            content_line=f"Content: {content_preview}\n" if content_preview else "",
+            note_line=f"Note: {bookmark.note}\n" if bookmark.note else "",
+            created=bookmark.created_at.strftime('%Y-%m-%d %H:%M')
+        )
+    
+    @staticmethod
+    def _note_search_filter(search_query):
+        """
+        Build a filter clause matching bookmarks whose note contains the search terms.
+        
+        On SQLite the bookmark_fts full-text index is used; each whitespace
+        separated term is matched as a quoted prefix so user input cannot
+        inject FTS5 query syntax. Other databases fall back to ILIKE.
+        
+        Args:
+            search_query (str): Raw user search query
+            
+        Returns:
+            ClauseElement: Filter clause for Bookmark queries
+        """
+        search_query = search_query.strip()
+        
+        if db.engine.dialect.name != 'sqlite':
+            return Bookmark.note.ilike(f"%{search_query}%")
+        
+        fts_query = " ".join(
+            '"{}"*'.format(term.replace('"', '""')) for term in search_query.split()
+        )
+        fts_rowids = text(
+            "SELECT rowid FROM bookmark_fts WHERE bookmark_fts MATCH :fts_query"
+        ).columns(db.column('rowid')).bindparams(fts_query=fts_query)
+        
+        return Bookmark.id.in_(fts_rowids)
+    
     @staticmethod
     def _enrich_bookmark_data(bookmark):
         """
@@ -309,50 +390,83 @@ class BookmarkService:
         Returns:
             dict: Enriched bookmark data with content preview
         """
+        return BookmarkService._enrich_bookmarks_bulk([bookmark])[0]
+    
+    @staticmethod
+    def _enrich_bookmarks_bulk(bookmarks):
+        """
+        Enrich a batch of bookmarks with content previews and movie details.
+        
+        The bookmarked alignments and their preview lines are each fetched
+        with a single query for the whole batch rather than per bookmark.
+        Load bookmarks with ENRICHMENT_LOAD_OPTIONS to avoid lazy loads of
+        the SubLink details.
+        
+        Args:
+            bookmarks (list): Bookmark instances
+            
+        Returns:
+            list: Enriched bookmark dicts in the same order as bookmarks
+        """
+        if not bookmarks:
+            return []
+        
         try:
-            bookmark_dict = bookmark.to_dict()
+            # Look up only the bookmarked alignments by (sub_link_id, idx)
+            alignment_keys = {(bookmark.sub_link_id, bookmark.alignment_index) for bookmark in bookmarks}
+            alignments = {
+                (row.sub_link_id, row.idx): row
+                for row in db.session.execute(
+                    select(
+                        SubLinkAlignment.sub_link_id,
+                        SubLinkAlignment.idx,
+                        SubLinkAlignment.source_line_ids,
+                        SubLinkAlignment.target_line_ids
+                    ).where(
+                        tuple_(SubLinkAlignment.sub_link_id, SubLinkAlignment.idx).in_(alignment_keys)
+                    )
+                )
+            }
             
-            # Get SubLink and related data
-            sub_link = bookmark.sub_link
-            alignment_data = SubLinkLine.query.filter_by(sub_link_id=bookmark.sub_link_id).first()
+            # Collect the first source/target line of each bookmarked alignment
+            preview_line_ids = {}
+            for bookmark in bookmarks:
+                alignment = alignments.get((bookmark.sub_link_id, bookmark.alignment_index))
+                if alignment and alignment.source_line_ids and alignment.target_line_ids:
+                    preview_line_ids[bookmark.id] = (alignment.source_line_ids[0], alignment.target_line_ids[0])
+            
+            line_content = {}
+            all_line_ids = {line_id for pair in preview_line_ids.values() for line_id in pair}
+            if all_line_ids:
+                line_content = dict(
+                    db.session.query(SubLine.id, SubLine.content).filter(SubLine.id.in_(all_line_ids)).all()
+                )
             
-            if sub_link and alignment_data and alignment_data.link_data:
-                # Get movie titles
-                from_movie = sub_link.from_subtitle
-                to_movie = sub_link.to_subtitle
-                
-                bookmark_dict['movie_title'] = from_movie.title if from_movie else 'Unknown'
-                bookmark_dict['from_language'] = sub_link.from_language.display_name if sub_link.from_language else 'Unknown'
-                bookmark_dict['to_language'] = sub_link.to_language.display_name if sub_link.to_language else 'Unknown'
+            enriched_bookmarks = []
+            for bookmark in bookmarks:
+                bookmark_dict = bookmark.to_dict()
+                sub_link = bookmark.sub_link
                 
-                # Get content preview for this alignment
-                if bookmark.alignment_index < len(alignment_data.link_data):
-                    alignment_pair = alignment_data.link_data[bookmark.alignment_index]
+                if sub_link and (bookmark.sub_link_id, bookmark.alignment_index) in alignments:
+                    from_movie = sub_link.from_subtitle
                     
-                    if len(alignment_pair) >= 2 and alignment_pair[0] and alignment_pair[1]:
-                        # Get first line from each language as preview
-                        source_line_ids = alignment_pair[0][:1]  # First source line
-                        target_line_ids = alignment_pair[1][:1]  # First target line
-                        
-                        source_content = ""
-                        target_content = ""
-                        
-                        if source_line_ids:
-                            source_line = SubLine.query.get(source_line_ids[0])
-                            if source_line:
-                                source_content = source_line.content[:100]  # Truncate for preview
-                        
-                        if target_line_ids:
-                            target_line = SubLine.query.get(target_line_ids[0])
-                            if target_line:
-                                target_content = target_line.content[:100]  # Truncate for preview
+                    bookmark_dict['movie_title'] = from_movie.title if from_movie else 'Unknown'
+                    bookmark_dict['from_language'] = sub_link.from_language.display_name if sub_link.from_language else 'Unknown'
+                    bookmark_dict['to_language'] = sub_link.to_language.display_name if sub_link.to_language else 'Unknown'
+                    
+                    if bookmark.id in preview_line_ids:
+                        source_line_id, target_line_id = preview_line_ids[bookmark.id]
+                        source_content = (line_content.get(source_line_id) or "")[:100]  # Truncate for preview
+                        target_content = (line_content.get(target_line_id) or "")[:100]
                         
                         bookmark_dict['content_preview'] = f"{source_content} | {target_content}"
                         bookmark_dict['source_content'] = source_content
                         bookmark_dict['target_content'] = target_content
                 
-            return bookmark_dict
+                enriched_bookmarks.append(bookmark_dict)
+            
+            return enriched_bookmarks
             
         except Exception:
             # If enrichment fails, return basic bookmark data
-            return bookmark.to_dict()
\ No newline at end of file
+            return [bookmark.to_dict() for bookmark in bookmarks]
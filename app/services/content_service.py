@@ -1,14 +1,254 @@
 """Content service for movie discovery and subtitle management."""
-from typing import List, Dict, Optional
-from sqlalchemy import text, exc
+from typing import Iterator, List, Dict, Optional
+from sqlalchemy import bindparam, exc, event, func, select, text, union_all
 from app import db
+from app.models.subtitle import SubLine, SubLink, SubTitle
+from app.utils.cache import letter_count_cache, movie_list_cache
+
+
+# Number of the two bound language IDs that exist
+LANGUAGE_PAIR_COUNT = text("""
+    SELECT COUNT(*) as count
+    FROM languages 
+    WHERE id IN (:native_lang, :target_lang)
+""")
+
+
+def _language_pair_criteria():
+    """Criteria matching sub_links in either direction of the bound language pair."""
+    pair = [bindparam('native_lang'), bindparam('target_lang')]
+    return (
+        SubLink.fromlang.in_(pair),
+        SubLink.tolang.in_(pair),
+        SubLink.fromlang != SubLink.tolang,
+    )
+
+
+# Movies on either side of a link between the language pair. Each UNION ALL
+# branch resolves through its own (fromlang, tolang, movie) index instead of
+# an OR-join over sub_links; links from a movie to itself are listed once.
+LANGUAGE_PAIR_LINKS = union_all(
+    select(SubLink.fromid.label('movie_id')).where(*_language_pair_criteria()),
+    select(SubLink.toid.label('movie_id')).where(
+        *_language_pair_criteria(),
+        SubLink.toid != SubLink.fromid
+    ),
+).subquery('links')
+
+# Rows fetched per round trip when streaming movie listings
+MOVIE_STREAM_BATCH_SIZE = 500
+
+# Built once so SQLAlchemy's compiled statement cache is reused across calls.
+# Only whether a movie has links matters, so IN deduplicates the link rows
+# instead of joining and grouping them to count links per movie. The final
+# sort is deliberate: walking a title index in order would probe every
+# title in the catalog, which measured no faster for pairs covering most
+# titles and several times slower for selective ones.
+AVAILABLE_MOVIES = (
+    select(SubTitle.id, SubTitle.title)
+    .where(SubTitle.id.in_(select(LANGUAGE_PAIR_LINKS.c.movie_id)))
+    .order_by(SubTitle.title.asc())
+)
+
+
+# Movies per browse letter, read from the indexed title_letter column. As
+# above, IN yields each linked movie once, so a plain COUNT replaces
+# COUNT(DISTINCT) over the duplicated join rows.
+LETTER_COUNTS = (
+    select(
+        SubTitle.title_letter.label('letter'),
+        func.count().label('count')
+    )
+    .where(SubTitle.id.in_(select(LANGUAGE_PAIR_LINKS.c.movie_id)))
+    .group_by(SubTitle.title_letter)
+    .order_by(SubTitle.title_letter.asc())
+)
+
+
+def _movies_language_pair_links():
+    """Links between the bound language pair on either side of the bound movies."""
+    movie_ids = bindparam('movie_ids', expanding=True)
+    link_columns = (
+        SubLink.id.label('link_id'),
+        SubLink.fromlang,
+        SubLink.tolang,
+    )
+    return union_all(
+        select(SubLink.fromid.label('movie_id'), *link_columns).where(
+            *_language_pair_criteria(),
+            SubLink.fromid.in_(movie_ids)
+        ),
+        select(SubLink.toid.label('movie_id'), *link_columns).where(
+            *_language_pair_criteria(),
+            SubLink.toid.in_(movie_ids),
+            SubLink.toid != SubLink.fromid
+        ),
+    ).subquery('movie_links')
+
+
+_MOVIE_LINKS = _movies_language_pair_links()
+
+# Language pair links of a batch of movies, one index seek per movie and direction
+MOVIE_LANGUAGE_PAIR_LINKS = (
+    select(
+        SubTitle.id,
+        SubTitle.title,
+        _MOVIE_LINKS.c.link_id,
+        _MOVIE_LINKS.c.fromlang,
+        _MOVIE_LINKS.c.tolang
+    )
+    .select_from(_MOVIE_LINKS)
+    .join(SubTitle, SubTitle.id == _MOVIE_LINKS.c.movie_id)
+    .order_by(_MOVIE_LINKS.c.movie_id, _MOVIE_LINKS.c.link_id)
+)
+
+
+# Distinct subtitle languages of a movie, one integer row per language; a
+# movie without lines yields a single row with a NULL language
+MOVIE_SUBTITLE_LANGUAGES = (
+    select(SubTitle.id, SubTitle.title, SubLine.language_id)
+    .select_from(SubTitle)
+    .outerjoin(SubLine, SubLine.movie_id == SubTitle.id)
+    .where(SubTitle.id == bindparam('movie_id'))
+    .distinct()
+    .order_by(SubLine.language_id)
+)
+
+
+# Title search modes: 'prefix' is served by the lower(title) index, while
+# 'contains' needs a leading wildcard and scans every title
+SEARCH_MODES = ('prefix', 'contains')
+
+# Sorts after any character, closing the range of titles sharing a prefix
+_PREFIX_RANGE_END = '\U0010ffff'
+
+# 'contains' searches run against the sub_title_fts trigram index on SQLite;
+# shorter queries have no trigram to match and fall back to LIKE
+_FULLTEXT_MIN_LENGTH = 3
+
+# Statement variants per title search: the public modes plus 'fulltext'
+_SEARCH_VARIANTS = SEARCH_MODES + ('fulltext',)
+
+# Escapes LIKE wildcards and the escape character itself in one pass
+_LIKE_ESCAPE = str.maketrans({'%': r'\%', '_': r'\_', '\\': r'\\'})
+
+# Browse letters accepted as letter filters, matched after upper-casing
+_VALID_LETTERS = frozenset('#ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+
+def _title_search_variant(search_query: str, search_mode: str) -> str:
+    """
+    Pick the statement variant serving a title search.
+
+    Args:
+        search_query: Text typed by the user
+        search_mode: One of SEARCH_MODES
+
+    Returns:
+        One of _SEARCH_VARIANTS
+    """
+    if (search_mode == 'contains' and len(search_query) >= _FULLTEXT_MIN_LENGTH
+            and db.engine.dialect.name == 'sqlite'):
+        return 'fulltext'
+    return search_mode
+
+
+def _title_search_criteria(search_variant: str):
+    """
+    Build the where criteria for a case-insensitive title search.
+
+    Args:
+        search_variant: One of _SEARCH_VARIANTS
+
+    Returns:
+        Tuple of where criteria over bind parameters from _title_search_params
+    """
+    lower_title = func.lower(SubTitle.title)
+
+    if search_variant == 'fulltext':
+        fts_rowids = text(
+            "SELECT rowid FROM sub_title_fts WHERE sub_title_fts MATCH :search_match"
+        ).columns(db.column('rowid'))
+        return (SubTitle.id.in_(fts_rowids),)
+
+    if search_variant == 'prefix':
+        # A range on lower(title) instead of LIKE 'query%', which SQLite
+        # cannot match against an expression index
+        return (
+            lower_title >= func.lower(bindparam('search_prefix')),
+            lower_title < func.lower(bindparam('search_prefix_end')),
+        )
+
+    return (lower_title.like(func.lower(bindparam('search_pattern')), escape='\\'),)
+
+
+def _title_search_params(search_query: str, search_variant: str) -> Dict[str, str]:
+    """
+    Build the bind values for a case-insensitive title search.
+
+    Args:
+        search_query: Text typed by the user
+        search_variant: One of _SEARCH_VARIANTS
+
+    Returns:
+        Dictionary of bind parameter values for _title_search_criteria
+    """
+    if search_variant == 'fulltext':
+        # A quoted trigram phrase matches the query as a substring, and
+        # quoting keeps user input from being read as FTS5 query syntax
+        return {'search_match': '"{}"'.format(search_query.replace('"', '""'))}
+
+    if search_variant == 'prefix':
+        return {
+            'search_prefix': search_query,
+            'search_prefix_end': search_query + _PREFIX_RANGE_END,
+        }
+
+    # Escape LIKE wildcards so they match literally
+    return {'search_pattern': f'%{search_query.translate(_LIKE_ESCAPE)}%'}
+
+
+def _with_filters(statement, search_variant: Optional[str], has_letter: bool):
+    """Narrow a catalog statement by title search and/or browse letter."""
+    if search_variant:
+        statement = statement.where(*_title_search_criteria(search_variant))
+    if has_letter:
+        # '#' is stored as the title letter of titles starting with a number
+        statement = statement.where(SubTitle.title_letter == bindparam('letter_filter'))
+    return statement
+
+
+# Every filter combination is built once at import, keyed by (search variant
+# or None, has letter filter), so requests only pick a statement and bind values
+AVAILABLE_MOVIES_VARIANTS = {
+    (search_variant, has_letter): _with_filters(AVAILABLE_MOVIES, search_variant, has_letter)
+    for search_variant in (None,) + _SEARCH_VARIANTS
+    for has_letter in (False, True)
+}
+
+LETTER_COUNTS_VARIANTS = {
+    search_variant: _with_filters(LETTER_COUNTS, search_variant, False)
+    for search_variant in (None,) + _SEARCH_VARIANTS
+}
+
+
+@event.listens_for(SubTitle, 'after_insert')
+@event.listens_for(SubTitle, 'after_update')
+@event.listens_for(SubTitle, 'after_delete')
+@event.listens_for(SubLink, 'after_insert')
+@event.listens_for(SubLink, 'after_update')
+@event.listens_for(SubLink, 'after_delete')
+def _invalidate_catalog_caches(mapper, connection, target):
+    """Drop cached movie listings and letter counts whenever movies or their links change."""
+    movie_list_cache.clear()
+    letter_count_cache.clear()
 
 
 class ContentService:
     """Service class for managing movie content and subtitle availability."""
 
     @staticmethod
-    def get_available_movies(native_language_id: int, target_language_id: int, search_query: Optional[str] = None, letter_filter: Optional[str] = None) -> List[Dict]:
+    def get_available_movies(native_language_id: int, target_language_id: int, search_query: Optional[str] = None, letter_filter: Optional[str] = None, search_mode: str = 'contains') -> List[Dict]:
         """
         Get movies available for a specific language pair, optionally filtered by search query and/or letter.
         
@@ -17,14 +257,69 @@ class ContentService:
             target_language_id: User's target language ID
             search_query: Optional search query for partial title matching (case-insensitive)
             letter_filter: Optional letter filter (A-Z, #, or 'all')
+            search_mode: 'contains' (default) matches anywhere in the title;
+                'prefix' matches title starts and can use the title index
             
         Returns:
             List of movie dictionaries with id, title, and subtitle availability info
             
         Raises:
-            ValueError: If language IDs are invalid or letter filter is invalid
+            ValueError: If language IDs, letter filter or search mode are invalid
             Exception: For database connection issues
         """
+        query, query_params = ContentService._available_movies_query(
+            native_language_id, target_language_id, search_query, letter_filter, search_mode
+        )
+
+        cache_filters = (search_query, search_mode if search_query else None, letter_filter)
+        cached = movie_list_cache.get(native_language_id, target_language_id, cache_filters)
+        if cached is not None:
+            return [dict(movie) for movie in cached]
+
+        movies = list(ContentService._generate_movies(query, query_params))
+
+        movie_list_cache.set(native_language_id, target_language_id, cache_filters, movies)
+        return [dict(movie) for movie in movies]
+
+    @staticmethod
+    def iter_available_movies(native_language_id: int, target_language_id: int, search_query: Optional[str] = None, letter_filter: Optional[str] = None, search_mode: str = 'contains') -> Iterator[Dict]:
+        """
+        Stream movies available for a specific language pair.
+        
+        Rows are fetched MOVIE_STREAM_BATCH_SIZE at a time, so callers that
+        page through or stop early never hold the whole catalog in memory.
+        Results are not cached; use get_available_movies for full listings.
+        
+        Args:
+            native_language_id: User's native language ID
+            target_language_id: User's target language ID
+            search_query: Optional search query for partial title matching (case-insensitive)
+            letter_filter: Optional letter filter (A-Z, #, or 'all')
+            search_mode: 'contains' (default) or 'prefix', as for get_available_movies
+            
+        Returns:
+            Iterator of movie dictionaries in title order, as returned by get_available_movies
+            
+        Raises:
+            ValueError: If language IDs, letter filter or search mode are invalid
+            Exception: While iterating, for database connection issues
+        """
+        query, query_params = ContentService._available_movies_query(
+            native_language_id, target_language_id, search_query, letter_filter, search_mode
+        )
+        return ContentService._generate_movies(query, query_params)
+
+    @staticmethod
+    def _available_movies_query(native_language_id: int, target_language_id: int, search_query: Optional[str], letter_filter: Optional[str], search_mode: str):
+        """
+        Validate movie listing filters and build the matching statement.
+        
+        Returns:
+            Tuple of (select statement, bind parameter values)
+            
+        Raises:
+            ValueError: If language IDs, letter filter or search mode are invalid
+        """
         if not native_language_id or not target_language_id:
             raise ValueError("Both native_language_id and target_language_id are required")
             
@@ -36,64 +331,40 @@ class ContentService:
             if not ContentService._is_valid_letter_filter(letter_filter):
                 raise ValueError("Letter filter must be A-Z, #, or 'all'")
 
-        try:
-            # Base query for movies with available subtitle links between the language pair
-            base_query = """
-                SELECT DISTINCT st.id, st.title,
-                       COUNT(sl.id) as subtitle_links_count
-                FROM sub_titles st
-                JOIN sub_links sl ON st.id = sl.fromid OR st.id = sl.toid
-                WHERE ((sl.fromlang = :native_lang AND sl.tolang = :target_lang) 
-                    OR (sl.fromlang = :target_lang AND sl.tolang = :native_lang))
-            """
-            
-            # Add search filter if search query is provided
-            if search_query:
-                base_query += " AND LOWER(st.title) LIKE LOWER(:search_pattern)"
-            
-            # Add letter filter if provided and not 'all'
-            if letter_filter and letter_filter != 'all':
-                if letter_filter == '#':
-                    # Filter for titles starting with numbers
-                    base_query += " AND SUBSTR(st.title, 1, 1) REGEXP '^[0-9]'"
-                else:
-                    # Filter for titles starting with specific letter
-                    base_query += " AND UPPER(SUBSTR(st.title, 1, 1)) = UPPER(:letter_filter)"
-            
-            base_query += """
-                GROUP BY st.id, st.title
-                ORDER BY st.title ASC
-            """
+        if search_mode not in SEARCH_MODES:
+            raise ValueError("Search mode must be 'prefix' or 'contains'")
 
-            query = text(base_query)
-            query_params = {
-                'native_lang': native_language_id,
-                'target_lang': target_language_id
-            }
-            
-            # Add search pattern parameter if search query is provided
-            if search_query:
-                # Sanitize search query to prevent SQL injection
-                sanitized_query = search_query.replace('%', r'\%').replace('_', r'\_')
-                query_params['search_pattern'] = f'%{sanitized_query}%'
-            
-            # Add letter filter parameter if provided and not '#' or 'all'
-            if letter_filter and letter_filter != 'all' and letter_filter != '#':
-                query_params['letter_filter'] = letter_filter
-
-            with db.engine.connect() as conn:
-                result = conn.execute(query, query_params)
-                
-                movies = []
-                for row in result:
-                    movies.append({
-                        'id': row.id,
-                        'title': row.title,
-                        'subtitle_links_count': row.subtitle_links_count,
-                        'has_subtitles': True  # All returned movies have subtitles
-                    })
+        search_variant = _title_search_variant(search_query, search_mode) if search_query else None
+        has_letter = bool(letter_filter) and letter_filter != 'all'
+        query = AVAILABLE_MOVIES_VARIANTS[(search_variant, has_letter)]
+        query_params = {
+            'native_lang': native_language_id,
+            'target_lang': target_language_id
+        }
+
+        if search_variant:
+            query_params.update(_title_search_params(search_query, search_variant))
+
+        if has_letter:
+            query_params['letter_filter'] = letter_filter.upper()
+
+        return query, query_params
 
-            return movies
+    @staticmethod
+    def _generate_movies(query, query_params):
+        """Yield movie dictionaries from a server-side cursor, batch by batch."""
+        try:
+            result = db.session.execute(query, query_params, execution_options={
+                'stream_results': True,
+                'yield_per': MOVIE_STREAM_BATCH_SIZE
+            })
+
+            for row in result:
+                yield {
+                    'id': row.id,
+                    'title': row.title,
+                    'has_subtitles': True  # All returned movies have subtitles
+                }
 
         except exc.SQLAlchemyError as e:
             raise Exception(f"Database error while fetching movies: {str(e)}")
@@ -111,34 +382,47 @@ class ContentService:
         Returns:
             Dictionary with movie and subtitle link information, or None if not found
         """
+        return ContentService.get_movie_subtitle_info_bulk(
+            [movie_id], native_language_id, target_language_id
+        ).get(movie_id)
+
+    @staticmethod
+    def get_movie_subtitle_info_bulk(movie_ids: List[int], native_language_id: int, target_language_id: int) -> Dict[int, Dict]:
+        """
+        Get subtitle information for several movies and a language pair in one query.
+        
+        Args:
+            movie_ids: Movie IDs to get info for
+            native_language_id: User's native language ID
+            target_language_id: User's target language ID
+            
+        Returns:
+            Dictionary mapping movie ID to its movie and subtitle link information;
+            movies without a link for the language pair are left out
+        """
+        if not movie_ids:
+            return {}
+
         try:
-            query = text("""
-                SELECT st.id, st.title, sl.id as link_id, sl.fromlang, sl.tolang
-                FROM sub_titles st
-                JOIN sub_links sl ON st.id = sl.fromid OR st.id = sl.toid
-                WHERE st.id = :movie_id 
-                  AND ((sl.fromlang = :native_lang AND sl.tolang = :target_lang) 
-                       OR (sl.fromlang = :target_lang AND sl.tolang = :native_lang))
-                LIMIT 1
-            """)
-
-            with db.engine.connect() as conn:
-                result = conn.execute(query, {
-                    'movie_id': movie_id,
-                    'native_lang': native_language_id,
-                    'target_lang': target_language_id
-                }).fetchone()
-                
-                if result:
-                    return {
-                        'movie_id': result.id,
-                        'title': result.title,
-                        'sub_link_id': result.link_id,
-                        'from_language': result.fromlang,
-                        'to_language': result.tolang
+            result = db.session.execute(MOVIE_LANGUAGE_PAIR_LINKS, {
+                'movie_ids': list(set(movie_ids)),
+                'native_lang': native_language_id,
+                'target_lang': target_language_id
+            })
+
+            movie_info = {}
+            for row in result:
+                # Rows are ordered by link ID, so keep each movie's first link
+                if row.id not in movie_info:
+                    movie_info[row.id] = {
+                        'movie_id': row.id,
+                        'title': row.title,
+                        'sub_link_id': row.link_id,
+                        'from_language': row.fromlang,
+                        'to_language': row.tolang
                     }
-                
-                return None
+
+            return movie_info
 
         except exc.SQLAlchemyError as e:
             raise Exception(f"Database error while fetching movie info: {str(e)}")
@@ -155,26 +439,23 @@ class ContentService:
         Returns:
             True if both languages exist, False otherwise
         """
+        # A missing or repeated ID can never name two existing languages
+        if not native_language_id or not target_language_id or native_language_id == target_language_id:
+            return False
+
         try:
-            query = text("""
-                SELECT COUNT(*) as count
-                FROM languages 
-                WHERE id IN (:native_lang, :target_lang)
-            """)
-
-            with db.engine.connect() as conn:
-                result = conn.execute(query, {
-                    'native_lang': native_language_id,
-                    'target_lang': target_language_id
-                }).fetchone()
-                
-                return result.count == 2
+            result = db.session.execute(LANGUAGE_PAIR_COUNT, {
+                'native_lang': native_language_id,
+                'target_lang': target_language_id
+            }).fetchone()
+
+            return result.count == 2
 
         except exc.SQLAlchemyError:
             return False
 
     @staticmethod
-    def get_letter_counts(native_language_id: int, target_language_id: int, search_query: Optional[str] = None) -> Dict[str, int]:
+    def get_letter_counts(native_language_id: int, target_language_id: int, search_query: Optional[str] = None, search_mode: str = 'contains') -> Dict[str, int]:
         """
         Get count of movies available for each letter (A-Z, #) for a specific language pair.
         
@@ -182,12 +463,13 @@ class ContentService:
             native_language_id: User's native language ID
             target_language_id: User's target language ID
             search_query: Optional search query to filter counts (case-insensitive)
+            search_mode: 'contains' (default) or 'prefix', as for get_available_movies
             
         Returns:
             Dictionary with letters as keys and movie counts as values
             
         Raises:
-            ValueError: If language IDs are invalid
+            ValueError: If language IDs or search mode are invalid
             Exception: For database connection issues
         """
         if not native_language_id or not target_language_id:
@@ -196,54 +478,34 @@ class ContentService:
         if native_language_id == target_language_id:
             raise ValueError("Native and target languages must be different")
 
+        if search_mode not in SEARCH_MODES:
+            raise ValueError("Search mode must be 'prefix' or 'contains'")
+
+        cache_filters = (search_query, search_mode if search_query else None)
+        cached = letter_count_cache.get(native_language_id, target_language_id, cache_filters)
+        if cached is not None:
+            return dict(cached)
+
         try:
-            # Base query for letter counts
-            base_query = """
-                SELECT 
-                    CASE 
-                        WHEN SUBSTR(st.title, 1, 1) REGEXP '^[0-9]' THEN '#'
-                        ELSE UPPER(SUBSTR(st.title, 1, 1))
-                    END as letter,
-                    COUNT(DISTINCT st.id) as count
-                FROM sub_titles st
-                JOIN sub_links sl ON st.id = sl.fromid OR st.id = sl.toid
-                WHERE ((sl.fromlang = :native_lang AND sl.tolang = :target_lang) 
-                    OR (sl.fromlang = :target_lang AND sl.tolang = :native_lang))
-            """
-            
-            # Add search filter if search query is provided
-            if search_query:
-                base_query += " AND LOWER(st.title) LIKE LOWER(:search_pattern)"
-            
-            base_query += """
-                GROUP BY 
-                    CASE 
-                        WHEN SUBSTR(st.title, 1, 1) REGEXP '^[0-9]' THEN '#'
-                        ELSE UPPER(SUBSTR(st.title, 1, 1))
-                    END
-                ORDER BY letter ASC
-            """
-
-            query = text(base_query)
+            search_variant = _title_search_variant(search_query, search_mode) if search_query else None
+            query = LETTER_COUNTS_VARIANTS[search_variant]
             query_params = {
                 'native_lang': native_language_id,
                 'target_lang': target_language_id
             }
-            
-            # Add search pattern parameter if search query is provided
-            if search_query:
-                # Sanitize search query to prevent SQL injection
-                sanitized_query = search_query.replace('%', r'\%').replace('_', r'\_')
-                query_params['search_pattern'] = f'%{sanitized_query}%'
 
-            with db.engine.connect() as conn:
-                result = conn.execute(query, query_params)
-                
-                letter_counts = {}
-                for row in result:
-                    letter_counts[row.letter] = row.count
+            # Add search filter values if search query is provided
+            if search_variant:
+                query_params.update(_title_search_params(search_query, search_variant))
+
+            result = db.session.execute(query, query_params)
+            
+            letter_counts = {}
+            for row in result:
+                letter_counts[row.letter] = row.count
 
-            return letter_counts
+            letter_count_cache.set(native_language_id, target_language_id, cache_filters, letter_counts)
+            return dict(letter_counts)
 
         except exc.SQLAlchemyError as e:
             raise Exception(f"Database error while fetching letter counts: {str(e)}")
@@ -268,36 +530,21 @@ class ContentService:
 
         try:
             # Check if movie exists and get available subtitle languages
-            query = text("""
-                SELECT st.id, st.title,
-                       GROUP_CONCAT(DISTINCT sl.language_id) as available_languages
-                FROM sub_titles st
-                LEFT JOIN sub_lines sl ON st.id = sl.movie_id
-                WHERE st.id = :movie_id
-                GROUP BY st.id, st.title
-            """)
-
-            with db.engine.connect() as conn:
-                result = conn.execute(query, {'movie_id': movie_id}).fetchone()
-                
-                if not result:
-                    raise ValueError(f"Movie with ID {movie_id} not found")
-
-                available_languages = []
-                if result.available_languages:
-                    # Convert comma-separated string to list of integers
-                    available_languages = [
-                        int(lang_id) for lang_id in result.available_languages.split(',')
-                        if lang_id.strip()
-                    ]
-
-                return {
-                    'movie_id': result.id,
-                    'title': result.title,
-                    'has_subtitles': len(available_languages) > 0,
-                    'available_language_ids': available_languages,
-                    'subtitle_count': len(available_languages)
-                }
+            rows = db.session.execute(MOVIE_SUBTITLE_LANGUAGES, {'movie_id': movie_id}).all()
+            
+            if not rows:
+                raise ValueError(f"Movie with ID {movie_id} not found")
+
+            result = rows[0]
+            available_languages = [row.language_id for row in rows if row.language_id is not None]
+
+            return {
+                'movie_id': result.id,
+                'title': result.title,
+                'has_subtitles': len(available_languages) > 0,
+                'available_language_ids': available_languages,
+                'subtitle_count': len(available_languages)
+            }
 
         except exc.SQLAlchemyError as e:
             raise Exception(f"Database error while checking subtitle availability: {str(e)}")
@@ -313,7 +560,4 @@ class ContentService:
         Returns:
             True if letter is valid (A-Z or #), False otherwise
         """
-        if not letter or len(letter) != 1:
-            return False
-        
-        return letter == '#' or (letter.isalpha() and letter.upper() in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ')
\ No newline at end of file
+        return isinstance(letter, str) and len(letter) == 1 and letter.upper() in _VALID_LETTERS
\ No newline at end of file
@@ -1,10 +1,20 @@
 """Learning goals service for managing user learning goals."""
 from datetime import datetime, date
-from sqlalchemy import exc
+import datetime as dt
+from sqlalchemy import exc, and_, case, func, update
+from sqlalchemy.orm import raiseload
 from app import db
 from app.models.learning_goal import LearningGoal
 
 
+# LearningGoal.to_dict only reads the goal's own columns; raise instead of
+# silently issuing a second query per goal if a relationship is touched
+GOAL_LOAD_OPTIONS = (raiseload('*'),)
+
+# Goals hydrated per fetch when listing a user's goals
+GOAL_BATCH_SIZE = 200
+
+
 class LearningGoalsServiceError(Exception):
     """Custom exception for learning goals service errors."""
     pass
@@ -107,7 +117,9 @@ class LearningGoalsService:
             if active_only:
                 query = query.filter_by(is_active=True)
                 
-            goals = query.order_by(LearningGoal.created_at.desc()).all()
+            goals = query.options(*GOAL_LOAD_OPTIONS).order_by(
+                LearningGoal.created_at.desc()
+            ).yield_per(GOAL_BATCH_SIZE)
             
             return [goal.to_dict() for goal in goals]
             
@@ -266,18 +278,38 @@ class LearningGoalsService:
             LearningGoalsServiceError: If database error occurs
         """
         try:
-            # Get all active goals of this type for user
-            goals = LearningGoal.query.filter_by(
-                user_id=user_id,
-                goal_type=goal_type,
-                is_active=True
-            ).all()
-            
-            updated_goals = []
+            criteria = (
+                LearningGoal.user_id == user_id,
+                LearningGoal.goal_type == goal_type,
+                LearningGoal.is_active == True
+            )
+            new_value = case(
+                (LearningGoal.current_value + progress_amount < 0, 0),
+                else_=LearningGoal.current_value + progress_amount
+            )
             
-            for goal in goals:
-                goal.increment_progress(progress_amount)
-                updated_goals.append(goal.to_dict())
+            # Increment every matching goal in one UPDATE; SET expressions see the
+            # old row, so completion is checked against the new value explicitly
+            stmt = update(LearningGoal).where(*criteria).values(
+                current_value=new_value,
+                completed_at=case(
+                    (and_(new_value >= LearningGoal.target_value,
+                          LearningGoal.completed_at.is_(None)),
+                     datetime.now(dt.timezone.utc)),
+                    else_=LearningGoal.completed_at
+                )
+            ).execution_options(synchronize_session=False)
+            
+            if db.engine.dialect.update_returning:
+                goals = db.session.scalars(
+                    stmt.returning(LearningGoal),
+                    execution_options={'populate_existing': True}
+                ).all()
+            else:
+                db.session.execute(stmt)
+                goals = LearningGoal.query.filter(*criteria).populate_existing().all()
+            
+            updated_goals = [goal.to_dict() for goal in sorted(goals, key=lambda g: g.id)]
             
             if updated_goals:
                 db.session.commit()
@@ -306,18 +338,30 @@ class LearningGoalsService:
             LearningGoalsServiceError: If database error occurs
         """
         try:
-            # Find goals that are completed but don't have completed_at timestamp
-            newly_completed = LearningGoal.query.filter(
+            completed_at = datetime.utcnow()
+            
+            # Stamp goals that are completed but don't have completed_at
+            # timestamp in one UPDATE
+            stmt = update(LearningGoal).where(
                 LearningGoal.user_id == user_id,
                 LearningGoal.is_active == True,
                 LearningGoal.current_value >= LearningGoal.target_value,
                 LearningGoal.completed_at == None
-            ).all()
-            
-            achievements = []
-            for goal in newly_completed:
-                goal.completed_at = datetime.utcnow()
-                achievements.append(goal.to_dict())
+            ).values(completed_at=completed_at).execution_options(synchronize_session=False)
+            
+            if db.engine.dialect.update_returning:
+                newly_completed = db.session.scalars(
+                    stmt.returning(LearningGoal),
+                    execution_options={'populate_existing': True}
+                ).all()
+            else:
+                db.session.execute(stmt)
+                newly_completed = LearningGoal.query.filter(
+                    LearningGoal.user_id == user_id,
+                    LearningGoal.completed_at == completed_at
+                ).populate_existing().all()
+            
+            achievements = [goal.to_dict() for goal in sorted(newly_completed, key=lambda g: g.id)]
             
             if achievements:
                 db.session.commit()
@@ -346,9 +390,25 @@ class LearningGoalsService:
             LearningGoalsServiceError: If database error occurs
         """
         try:
-            goals = LearningGoal.query.filter_by(user_id=user_id).all()
+            is_completed = LearningGoal.current_value >= LearningGoal.target_value
+            is_overdue = and_(
+                LearningGoal.deadline.isnot(None),
+                LearningGoal.deadline < date.today(),
+                ~is_completed
+            )
             
-            if not goals:
+            # Aggregate per goal type in the database instead of loading every goal
+            rows = db.session.query(
+                LearningGoal.goal_type,
+                func.count(LearningGoal.id).label('total'),
+                func.sum(case((is_completed, 1), else_=0)).label('completed'),
+                func.sum(case((LearningGoal.is_active == True, 1), else_=0)).label('active'),
+                func.sum(case((is_overdue, 1), else_=0)).label('overdue')
+            ).filter(
+                LearningGoal.user_id == user_id
+            ).group_by(LearningGoal.goal_type).all()
+            
+            if not rows:
                 return {
                     'total_goals': 0,
                     'completed_goals': 0,
@@ -358,23 +418,20 @@ class LearningGoalsService:
                     'goals_by_type': {}
                 }
             
-            completed = len([g for g in goals if g.is_goal_completed()])
-            active = len([g for g in goals if g.is_active])
-            overdue = len([g for g in goals if g.is_overdue()])
+            total = sum(row.total for row in rows)
+            completed = sum(row.completed for row in rows)
+            active = sum(row.active for row in rows)
+            overdue = sum(row.overdue for row in rows)
             
-            # Group by goal type
-            goals_by_type = {}
-            for goal in goals:
-                if goal.goal_type not in goals_by_type:
-                    goals_by_type[goal.goal_type] = {'total': 0, 'completed': 0}
-                goals_by_type[goal.goal_type]['total'] += 1
-                if goal.is_goal_completed():
-                    goals_by_type[goal.goal_type]['completed'] += 1
+            goals_by_type = {
+                row.goal_type: {'total': row.total, 'completed': row.completed}
+                for row in rows
+            }
             
-            completion_rate = (completed / len(goals)) * 100 if goals else 0.0
+            completion_rate = (completed / total) * 100
             
             return {
-                'total_goals': len(goals),
+                'total_goals': total,
                 'completed_goals': completed,
                 'active_goals': active,
                 'completion_rate': round(completion_rate, 2),
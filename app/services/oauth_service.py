@@ -1,10 +1,64 @@
 """OAuth service for handling social login providers."""
+import json
 import secrets
 from typing import Optional, Dict, Any, Tuple
 from flask import current_app, session, url_for
 from flask_login import login_user
-from app import oauth, db
+from sqlalchemy import and_, or_
+from app import db
 from app.models.user import User
+from app.utils.cache import code_exchange_cache, id_token_cache
+from app.utils.tokens import token_urlsafe
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+OAUTH_PROVIDERS = frozenset(('google', 'facebook', 'apple'))
+
+FACEBOOK_ME_URL = 'me?fields=id,email,name,first_name,last_name,picture'
+
+GOOGLE_USERINFO_URL = 'userinfo'
+
+
+def _oauth_client(provider: str):
+    """Look up the client materialized for a provider when the app was created."""
+    return current_app.extensions['oauth_clients'].get(provider)
+
+
+def _parse_id_token(client, token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Verify a token's ID token, reusing claims verified for the same token moments ago."""
+    # Claims Authlib already verified, nonce included, during the code exchange
+    if token.get('userinfo'):
+        return token['userinfo']
+    
+    id_token = token.get('id_token')
+    if not id_token:
+        return None
+    
+    # Without the nonce this flow was started with, a replayed ID token
+    # cannot be told apart from a fresh one
+    nonce = session.get('oauth_nonce')
+    if not nonce:
+        return None
+    
+    claims = id_token_cache.get(client.name, id_token, nonce)
+    if claims is None:
+        # The JWKS is fetched once per client and kept in its server metadata;
+        # parse_id_token raises unless the signature, claims and nonce verify
+        claims = client.parse_id_token(token, nonce=nonce)
+        if claims:
+            id_token_cache.set(client.name, id_token, nonce, claims)
+    return claims
+
+
+def _parse_json(resp) -> Any:
+    """Parse a provider response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return json.loads(resp.content)
 
 
 class OAuthService:
@@ -13,7 +67,7 @@ class OAuthService:
     @staticmethod
     def generate_oauth_state() -> str:
         """Generate secure state parameter for CSRF protection."""
-        return secrets.token_urlsafe(32)
+        return token_urlsafe(32)
 
     @staticmethod
     def get_authorization_url(provider: str, redirect_uri: str) -> Tuple[str, str]:
@@ -27,16 +81,16 @@ class OAuthService:
         Returns:
             Tuple of (authorization_url, state)
         """
-        if provider not in ['google', 'facebook', 'apple']:
+        if provider not in OAUTH_PROVIDERS:
             raise ValueError(f"Unsupported OAuth provider: {provider}")
         
-        client = oauth.create_client(provider)
+        client = _oauth_client(provider)
         if not client:
             raise ValueError(f"OAuth client not configured for provider: {provider}")
         
         state = OAuthService.generate_oauth_state()
-        session['oauth_state'] = state
-        session['oauth_provider'] = provider
+        # One compact key keeps the signed session cookie small
+        session['oauth'] = f"{provider}:{state}"
         
         if provider == 'apple':
             # Apple Sign-In requires response_mode=form_post
@@ -48,21 +102,36 @@ class OAuthService:
         else:
             authorization_url = client.create_authorization_url(redirect_uri, state=state)
         
+        # OpenID Connect providers get a nonce that their ID token must echo
+        if authorization_url.get('nonce'):
+            session['oauth_nonce'] = authorization_url['nonce']
+        
         return authorization_url['url'], state
 
     @staticmethod
-    def validate_state(received_state: str) -> bool:
+    def validate_state(received_state: str, provider: Optional[str] = None) -> bool:
         """
         Validate OAuth state parameter against session stored state.
         
+        Every comparison runs in constant time, including when nothing is
+        stored, so timing does not reveal whether a flow is in progress.
+        
         Args:
             received_state: State parameter received from OAuth callback
+            provider: Provider of the callback, checked against the provider
+                the flow was started with when given
             
         Returns:
             True if state is valid, False otherwise
         """
-        stored_state = session.get('oauth_state')
-        return stored_state and secrets.compare_digest(stored_state, received_state)
+        stored_provider, _, stored_state = (session.get('oauth') or '').partition(':')
+        state_valid = secrets.compare_digest(stored_state.encode(), (received_state or '').encode())
+        
+        provider_valid = True
+        if provider is not None:
+            provider_valid = secrets.compare_digest(stored_provider.encode(), provider.encode())
+        
+        return bool(stored_state) and state_valid and provider_valid
 
     @staticmethod
     def get_user_info(provider: str, code: str, redirect_uri: str) -> Optional[Dict[str, Any]]:
@@ -77,8 +146,27 @@ class OAuthService:
         Returns:
             User info dictionary or None if failed
         """
+        flow = session.get('oauth')
+        if not code or not flow:
+            return OAuthService._exchange_code(provider, redirect_uri)
+        
+        # Double submits of a callback carry the same single-use code; while
+        # the exchange is in flight they share it instead of racing the
+        # provider. Keyed on this session's flow so no other session can
+        # pick up the result
+        try:
+            return code_exchange_cache.run(
+                provider, flow, code, lambda: OAuthService._exchange_code(provider, redirect_uri)
+            )
+        except Exception as e:
+            current_app.logger.error(f"OAuth code exchange wait failed for {provider}: {e}")
+            return None
+
+    @staticmethod
+    def _exchange_code(provider: str, redirect_uri: str) -> Optional[Dict[str, Any]]:
+        """Exchange the callback's authorization code for a token and retrieve user info."""
         try:
-            client = oauth.create_client(provider)
+            client = _oauth_client(provider)
             if not client:
                 current_app.logger.error(f"OAuth client not found for provider: {provider}")
                 return None
@@ -90,12 +178,9 @@ class OAuthService:
                 return None
             
             # Get user info based on provider
-            if provider == 'google':
-                return OAuthService._get_google_user_info(client, token)
-            elif provider == 'facebook':
-                return OAuthService._get_facebook_user_info(client, token)
-            elif provider == 'apple':
-                return OAuthService._get_apple_user_info(client, token)
+            handler = _USER_INFO_HANDLERS.get(provider)
+            if handler:
+                return handler(client, token)
             
         except Exception as e:
             current_app.logger.error(f"OAuth user info retrieval failed for {provider}: {e}")
@@ -107,10 +192,10 @@ class OAuthService:
     def _get_google_user_info(client, token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Get user info from Google OAuth."""
         try:
-            resp = client.parse_id_token(token)
+            resp = _parse_id_token(client, token)
             if not resp:
                 # Fallback to userinfo endpoint
-                resp = client.get('userinfo', token=token).json()
+                resp = _parse_json(client.get(GOOGLE_USERINFO_URL, token=token))
             
             return {
                 'oauth_id': resp.get('sub'),
@@ -128,12 +213,12 @@ class OAuthService:
     def _get_facebook_user_info(client, token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Get user info from Facebook OAuth."""
         try:
-            resp = client.get('me?fields=id,email,name,first_name,last_name,picture', token=token)
+            resp = client.get(FACEBOOK_ME_URL, token=token)
             if resp.status_code != 200:
                 current_app.logger.error(f"Facebook API error: {resp.status_code}")
                 return None
             
-            user_data = resp.json()
+            user_data = _parse_json(resp)
             return {
                 'oauth_id': user_data.get('id'),
                 'email': user_data.get('email'),
@@ -157,7 +242,11 @@ class OAuthService:
                 return None
             
             # Parse JWT token to get user info
-            user_info = client.parse_id_token(token)
+            user_info = _parse_id_token(client, token)
+            if not user_info:
+                current_app.logger.error("Apple ID token could not be verified")
+                return None
+            
             return {
                 'oauth_id': user_info.get('sub'),
                 'email': user_info.get('email'),
@@ -190,17 +279,21 @@ class OAuthService:
                 current_app.logger.error(f"Missing required user data from {provider}")
                 return None
             
-            # First, check if user exists with this OAuth provider and ID
-            existing_user = User.query.filter_by(
-                oauth_provider=provider, 
-                oauth_id=oauth_id
-            ).first()
+            # Look up the user by OAuth identity and by email (for account
+            # linking) together; each is unique, so at most two rows match
+            existing_user = existing_email_user = None
+            for user in User.query.filter(or_(
+                and_(User.oauth_provider == provider, User.oauth_id == oauth_id),
+                User.email == email
+            )):
+                if user.oauth_provider == provider and user.oauth_id == oauth_id:
+                    existing_user = user
+                if user.email == email:
+                    existing_email_user = user
             
             if existing_user:
                 return existing_user
             
-            # Check if user exists with same email (for account linking)
-            existing_email_user = User.query.filter_by(email=email).first()
             if existing_email_user:
                 # Link OAuth to existing account if no OAuth provider set
                 if not existing_email_user.oauth_provider:
@@ -257,5 +350,13 @@ class OAuthService:
     @staticmethod
     def cleanup_oauth_session():
         """Clean up OAuth-related session data."""
-        session.pop('oauth_state', None)
-        session.pop('oauth_provider', None)
\ No newline at end of file
+        session.pop('oauth', None)
+        session.pop('oauth_nonce', None)
+
+
+# Provider-specific user info extraction, keyed like OAUTH_PROVIDERS
+_USER_INFO_HANDLERS = {
+    'google': OAuthService._get_google_user_info,
+    'facebook': OAuthService._get_facebook_user_info,
+    'apple': OAuthService._get_apple_user_info,
+}
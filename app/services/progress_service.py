@@ -1,8 +1,314 @@
 """Progress service for managing user learning progress."""
-from sqlalchemy import exc
+import atexit
+import os
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import and_, bindparam, case, event, exc, exists, func, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import exc as orm_exc
 from app import db
-from app.models.subtitle import UserProgress, SubLink, SubLinkLine
+from app.models.subtitle import (
+    ALIGNMENT_COUNT_BY_SUB_LINK, UserProgress, SubLink, SubLinkAlignment, SubLinkLine
+)
+from app.utils.cache import alignment_total_cache, analytics_cache
+
+
+# Recent progress is projected to plain columns so no UserProgress instances
+# are built; the alignment total of each link is counted alongside
+RECENT_PROGRESS = select(
+    UserProgress.id,
+    UserProgress.user_id,
+    UserProgress.sub_link_id,
+    UserProgress.current_alignment_index,
+    UserProgress.total_alignments_completed,
+    UserProgress.session_duration_minutes,
+    UserProgress.last_accessed,
+    UserProgress.created_at,
+    select(func.count()).where(
+        SubLinkAlignment.sub_link_id == UserProgress.sub_link_id
+    ).correlate(UserProgress).scalar_subquery().label('total_alignments')
+).where(
+    UserProgress.user_id == bindparam('user_id')
+).order_by(UserProgress.last_accessed.desc()).limit(bindparam('limit'))
+
+# Outer joins so a link comes back even when the user has no progress on it,
+# confirming it exists in the same round trip that loads the progress
+PROGRESS_BY_SUB_LINKS = select(
+    SubLink.id,
+    UserProgress,
+    select(func.count()).where(
+        SubLinkAlignment.sub_link_id == SubLink.id
+    ).correlate(SubLink).scalar_subquery().label('total_alignments')
+).outerjoin(UserProgress, and_(
+    UserProgress.sub_link_id == SubLink.id,
+    UserProgress.user_id == bindparam('user_id')
+)).where(
+    SubLink.id.in_(bindparam('sub_link_ids', expanding=True))
+)
+
+SUB_LINK_EXISTS = select(exists().where(SubLink.id == bindparam('sub_link_id')))
+
+PROGRESS_BY_SUB_LINK = select(SubLink.id, UserProgress).outerjoin(UserProgress, and_(
+    UserProgress.sub_link_id == SubLink.id,
+    UserProgress.user_id == bindparam('user_id')
+)).where(SubLink.id == bindparam('sub_link_id'))
+
+
+def _progress_upsert(insert):
+    """Build an upsert of a user's progress on a link with a dialect's INSERT construct."""
+    # Selecting from sub_links inserts nothing, and returns no row, for a missing link
+    stmt = insert(UserProgress.__table__).from_select(
+        [UserProgress.user_id, UserProgress.sub_link_id, UserProgress.current_alignment_index,
+         UserProgress.total_alignments_completed, UserProgress.session_duration_minutes,
+         UserProgress.last_accessed],
+        select(
+            bindparam('user_id', type_=UserProgress.user_id.type),
+            SubLink.id,
+            bindparam('current_alignment_index', type_=UserProgress.current_alignment_index.type),
+            bindparam('total_alignments_completed', type_=UserProgress.total_alignments_completed.type),
+            bindparam('session_duration_minutes', type_=UserProgress.session_duration_minutes.type),
+            bindparam('last_accessed', type_=UserProgress.last_accessed.type)
+        ).where(SubLink.id == bindparam('sub_link_id'))
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[UserProgress.user_id, UserProgress.sub_link_id],
+        set_={
+            'current_alignment_index': stmt.excluded.current_alignment_index,
+            'total_alignments_completed': case(
+                (UserProgress.total_alignments_completed > stmt.excluded.total_alignments_completed,
+                 UserProgress.total_alignments_completed),
+                else_=stmt.excluded.total_alignments_completed
+            ),
+            'session_duration_minutes': UserProgress.session_duration_minutes + stmt.excluded.session_duration_minutes,
+            'last_accessed': stmt.excluded.last_accessed
+        }
+    ).returning(*UserProgress.__table__.c)
+
+
+# Upserts for the dialects supporting INSERT ... ON CONFLICT DO UPDATE, loading
+# the returned row as a UserProgress instance
+PROGRESS_UPSERTS = {
+    'sqlite': select(UserProgress).from_statement(_progress_upsert(sqlite.insert)),
+    'postgresql': select(UserProgress).from_statement(_progress_upsert(postgresql.insert))
+}
+
+
+def _total_alignments(sub_link_id: int, use_cache: bool = True) -> int:
+    """Count a link's alignments, cached briefly since alignment data is written once at ingest."""
+    if use_cache:
+        total = alignment_total_cache.get(sub_link_id)
+        if total is not None:
+            return total
+    
+    total = db.session.execute(
+        ALIGNMENT_COUNT_BY_SUB_LINK, {'sub_link_id': sub_link_id}
+    ).scalar()
+    
+    # A link whose alignments are not loaded yet is counted again next time
+    if total:
+        alignment_total_cache.set(sub_link_id, total)
+    return total
+
+
+@event.listens_for(SubLinkLine, 'after_insert')
+@event.listens_for(SubLinkLine, 'after_update')
+@event.listens_for(SubLinkLine, 'after_delete')
+def _invalidate_alignment_totals(mapper, connection, target):
+    """Drop the cached alignment total of a link whenever its alignment data changes."""
+    alignment_total_cache.invalidate(target.sub_link_id)
+
+
+class ProgressWriteBuffer:
+    """Thread-safe write-behind buffer coalescing progress updates per user and link."""
+    
+    def __init__(self, max_size: int = 10000):
+        """
+        Initialize the write buffer.
+        
+        Args:
+            max_size: Maximum number of tracked user and link pairs (default: 10000)
+        """
+        # (user_id, sub_link_id) -> [progress view, pending update or None, expiry]
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.max_size = max_size
+    
+    @staticmethod
+    def _merge(older, newer):
+        """Combine two pending updates as applying them one after the other would."""
+        return {
+            'current_alignment_index': newer['current_alignment_index'],
+            'total_alignments_completed': max(older['total_alignments_completed'],
+                                              newer['total_alignments_completed']),
+            'session_duration_minutes': older['session_duration_minutes'] + newer['session_duration_minutes'],
+            'last_accessed': newer['last_accessed']
+        }
+    
+    @staticmethod
+    def _apply(progress_dict, update):
+        """Return progress data as it reads once a pending update is written."""
+        progress_dict = dict(progress_dict)
+        progress_dict['current_alignment_index'] = update['current_alignment_index']
+        progress_dict['total_alignments_completed'] = max(progress_dict['total_alignments_completed'],
+                                                          update['total_alignments_completed'])
+        progress_dict['session_duration_minutes'] += update['session_duration_minutes']
+        progress_dict['last_accessed'] = update['last_accessed'].isoformat()
+        return progress_dict
+    
+    def stage(self, key, update, ttl):
+        """
+        Buffer an update for a pair whose stored progress is known.
+        
+        Args:
+            key: (user_id, sub_link_id) tuple
+            update: Pending update with current_alignment_index,
+                total_alignments_completed, session_duration_minutes and last_accessed
+            ttl: Seconds the progress view stays usable without being touched
+            
+        Returns:
+            dict: Progress data including the update, or None if the update
+                has to be written through
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is None or now > entry[2]:
+                return None
+            
+            view, pending, _ = entry
+            view = self._apply(view, update)
+            
+            pending = update if pending is None else self._merge(pending, update)
+            self._entries[key] = [view, pending, now + ttl]
+            return dict(view)
+    
+    def remember(self, key, progress_dict, ttl):
+        """
+        Record the stored progress of a pair so later updates can be buffered.
+        
+        Args:
+            key: (user_id, sub_link_id) tuple
+            progress_dict: Progress data as written to the database
+            ttl: Seconds the progress view stays usable without being touched
+        """
+        with self._lock:
+            if len(self._entries) >= self.max_size and key not in self._entries:
+                # Only forget pairs with nothing left to write
+                self._entries = {k: e for k, e in self._entries.items() if e[1] is not None}
+                if len(self._entries) >= self.max_size:
+                    return
+            
+            entry = self._entries.get(key)
+            pending = entry[1] if entry is not None else None
+            self._entries[key] = [dict(progress_dict), pending, time.time() + ttl]
+    
+    def pending(self, key):
+        """
+        Return the pending update of a pair without removing it.
+        
+        Args:
+            key: (user_id, sub_link_id) tuple
+            
+        Returns:
+            dict: Pending update or None if nothing is buffered
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None else None
+    
+    def take(self, key):
+        """
+        Remove and return the pending update of a pair.
+        
+        Args:
+            key: (user_id, sub_link_id) tuple
+            
+        Returns:
+            dict: Pending update or None if nothing is buffered
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            pending, entry[1] = entry[1], None
+            return pending
+    
+    def restore(self, key, update):
+        """
+        Put back an update that could not be written, ahead of newer ones.
+        
+        Args:
+            key: (user_id, sub_link_id) tuple
+            update: Pending update previously taken from the buffer
+        """
+        if update is None:
+            return
+        with self._lock:
+            entry = self._entries.setdefault(key, [None, None, 0.0])
+            entry[1] = update if entry[1] is None else self._merge(update, entry[1])
+    
+    def drain(self):
+        """
+        Remove and return every pending update.
+        
+        Returns:
+            dict: Pending updates keyed by (user_id, sub_link_id)
+        """
+        with self._lock:
+            pending = {}
+            for key, entry in self._entries.items():
+                if entry[1] is not None:
+                    pending[key], entry[1] = entry[1], None
+            return pending
+    
+    def clear(self):
+        """Forget all tracked pairs, including pending updates."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global buffer instance
+progress_write_buffer = ProgressWriteBuffer()
+
+# A forked worker must not write its parent's pending updates a second time
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=progress_write_buffer.clear)
+
+_progress_writer = None
+_progress_writer_lock = threading.Lock()
+
+
+def _flush_progress_writes(app):
+    """Write buffered progress updates in an application context, logging failures."""
+    with app.app_context():
+        try:
+            ProgressService.flush_pending_progress()
+        except ProgressServiceError as e:
+            app.logger.error(f"Buffered progress flush failed: {e}")
+
+
+def _run_progress_writer(app, interval):
+    """Flush buffered progress updates every interval seconds."""
+    while True:
+        time.sleep(interval)
+        _flush_progress_writes(app)
+
+
+def _ensure_progress_writer(app, interval):
+    """Start the background writer unless one is running in this process."""
+    global _progress_writer
+    with _progress_writer_lock:
+        if _progress_writer is not None and _progress_writer.is_alive():
+            return
+        if _progress_writer is None:
+            atexit.register(_flush_progress_writes, app)
+        _progress_writer = threading.Thread(
+            target=_run_progress_writer, args=(app, interval),
+            name='progress-writer', daemon=True
+        )
+        _progress_writer.start()
 
 
 class ProgressServiceError(Exception):
@@ -28,37 +334,57 @@ class ProgressService:
         Raises:
             ProgressServiceError: If validation fails or database error occurs
         """
-        try:
-            # Validate user owns this progress or sub_link exists
-            sub_link = db.session.get(SubLink, sub_link_id)
-            if not sub_link:
-                raise ProgressServiceError(f"Subtitle link {sub_link_id} not found")
+        return ProgressService.get_user_progress_bulk(user_id, [sub_link_id])[sub_link_id]
+    
+    @staticmethod
+    def get_user_progress_bulk(user_id, sub_link_ids):
+        """
+        Get user progress for several subtitle links in one query.
+        
+        Args:
+            user_id (int): ID of the user
+            sub_link_ids (list): IDs of the subtitle links
             
-            # Get user progress
-            progress = UserProgress.query.filter_by(
-                user_id=user_id,
-                sub_link_id=sub_link_id
-            ).first()
+        Returns:
+            dict: Progress data with completion statistics keyed by sub_link_id,
+                None for links without progress
             
-            if not progress:
-                return None
-                
-            # Get alignment data to calculate completion percentage
-            alignment_data = SubLinkLine.query.filter_by(sub_link_id=sub_link_id).first()
-            total_alignments = len(alignment_data.link_data) if alignment_data and alignment_data.link_data else 0
+        Raises:
+            ProgressServiceError: If any link does not exist or database error occurs
+        """
+        try:
+            sub_link_ids = list(dict.fromkeys(sub_link_ids))
+            if not sub_link_ids:
+                return {}
             
-            # Calculate completion percentage
-            completion_percentage = 0.0
-            if total_alignments > 0:
-                completion_percentage = (progress.current_alignment_index / total_alignments) * 100
-                completion_percentage = min(100.0, max(0.0, completion_percentage))
+            # Get progress and alignment totals for all links, validating they exist
+            rows = db.session.execute(PROGRESS_BY_SUB_LINKS, {
+                'user_id': user_id,
+                'sub_link_ids': sub_link_ids
+            }).all()
+            found = {row.id for row in rows}
+            for sub_link_id in sub_link_ids:
+                if sub_link_id not in found:
+                    raise ProgressServiceError(f"Subtitle link {sub_link_id} not found")
             
-            # Return progress with statistics
-            progress_dict = progress.to_dict()
-            progress_dict['completion_percentage'] = round(completion_percentage, 2)
-            progress_dict['total_alignments'] = total_alignments
+            result = dict.fromkeys(sub_link_ids)
+            for _, progress, total_alignments in rows:
+                if progress is None:
+                    continue
+                
+                progress_dict = progress.to_dict()
+                # Updates still waiting in the write buffer are already part of
+                # the progress the user sees
+                pending = progress_write_buffer.pending((user_id, progress.sub_link_id))
+                if pending is not None:
+                    progress_dict = ProgressWriteBuffer._apply(progress_dict, pending)
+                progress_dict['completion_percentage'] = ProgressService.calculate_completion_percentage(
+                    progress_dict['current_alignment_index'], total_alignments
+                )
+                progress_dict['total_alignments'] = total_alignments
+                result[progress.sub_link_id] = progress_dict
             
-            return progress_dict
+            return result
             
         except exc.SQLAlchemyError as e:
             raise ProgressServiceError(f"Database error retrieving progress: {str(e)}")
@@ -66,15 +392,21 @@ class ProgressService:
             raise ProgressServiceError(f"Error retrieving progress: {str(e)}")
     
     @staticmethod
-    def update_progress(user_id, sub_link_id, current_alignment_index, session_duration_minutes=0):
+    def update_progress(user_id, sub_link_id, current_alignment_index, session_duration_minutes=0, defer=False):
         """
         Update user progress for a subtitle link.
         
+        When PROGRESS_WRITE_BEHIND_SECONDS is set, deferred updates to a link
+        written recently are buffered and coalesced, and written by a
+        background thread within that many seconds. A later update that is
+        not deferred writes the buffered ones along with it.
+        
         Args:
             user_id (int): ID of the user
             sub_link_id (int): ID of the subtitle link
             current_alignment_index (int): Current position in alignment array
             session_duration_minutes (int): Minutes spent in current session
+            defer (bool): Whether the write may be buffered
             
         Returns:
             dict: Updated progress data with completion statistics
@@ -89,55 +421,69 @@ class ProgressService:
             if session_duration_minutes < 0:
                 raise ProgressServiceError("Session duration cannot be negative")
                 
-            # Validate sub_link exists and get total alignments
-            sub_link = db.session.get(SubLink, sub_link_id)
-            if not sub_link:
-                raise ProgressServiceError(f"Subtitle link {sub_link_id} not found")
-                
-            alignment_data = SubLinkLine.query.filter_by(sub_link_id=sub_link_id).first()
-            total_alignments = len(alignment_data.link_data) if alignment_data and alignment_data.link_data else 0
+            total_alignments = _total_alignments(sub_link_id)
             
-            # Validate alignment index is within bounds
+            # Validate alignment index is within bounds; a missing link has no alignments.
+            # The cached total may predate alignment data loaded outside this
+            # process, so it is counted again before the index is rejected
+            if current_alignment_index > total_alignments:
+                total_alignments = _total_alignments(sub_link_id, use_cache=False)
             if current_alignment_index > total_alignments:
+                if not db.session.execute(SUB_LINK_EXISTS, {'sub_link_id': sub_link_id}).scalar():
+                    raise ProgressServiceError(f"Subtitle link {sub_link_id} not found")
                 raise ProgressServiceError(f"Alignment index {current_alignment_index} exceeds total alignments {total_alignments}")
             
-            # Get or create progress record
-            progress = UserProgress.query.filter_by(
-                user_id=user_id,
-                sub_link_id=sub_link_id
-            ).first()
-            
-            if progress:
-                # Update existing progress
-                progress.current_alignment_index = current_alignment_index
-                progress.session_duration_minutes += session_duration_minutes
-                progress.last_accessed = db.func.current_timestamp()
-                
-                # Update total completed alignments (progress made)
-                progress.total_alignments_completed = max(progress.total_alignments_completed, current_alignment_index)
-            else:
-                # Create new progress record
-                progress = UserProgress(
-                    user_id=user_id,
-                    sub_link_id=sub_link_id,
-                    current_alignment_index=current_alignment_index,
-                    total_alignments_completed=current_alignment_index,
-                    session_duration_minutes=session_duration_minutes
-                )
-                db.session.add(progress)
+            # Stamped in Python, matching CURRENT_TIMESTAMP, so writing the
+            # record leaves nothing to fetch back from the database
+            last_accessed = datetime.utcnow().replace(microsecond=0)
+            update = {
+                'current_alignment_index': current_alignment_index,
+                'total_alignments_completed': current_alignment_index,
+                'session_duration_minutes': session_duration_minutes,
+                'last_accessed': last_accessed
+            }
             
-            # Commit changes
-            db.session.commit()
+            key = (user_id, sub_link_id)
+            write_behind = current_app.config.get('PROGRESS_WRITE_BEHIND_SECONDS', 0)
+            progress_dict = None
+            if defer and write_behind > 0:
+                progress_dict = progress_write_buffer.stage(key, update, write_behind)
+                if progress_dict is not None:
+                    _ensure_progress_writer(current_app._get_current_object(), write_behind)
             
-            # Calculate completion percentage
+            if progress_dict is None:
+                # Write through, together with any updates buffered for the link
+                pending = progress_write_buffer.take(key)
+                if pending is not None:
+                    update = ProgressWriteBuffer._merge(pending, update)
+                
+                try:
+                    progress = ProgressService._persist_progress(user_id, sub_link_id, **update)
+                    if progress is None:
+                        raise ProgressServiceError(f"Subtitle link {sub_link_id} not found")
+                    
+                    # Flush so generated values are in place, and serialize before the
+                    # commit expires the instance and reading it would refresh it
+                    db.session.flush()
+                    progress_dict = progress.to_dict()
+                    db.session.commit()
+                    
+                    # Upserts bypass the ORM events that invalidate analytics
+                    analytics_cache.invalidate_user(user_id)
+                except Exception:
+                    progress_write_buffer.restore(key, pending)
+                    raise
+                
+                if write_behind > 0:
+                    progress_write_buffer.remember(key, progress_dict, write_behind)
+            
+            # The index was validated against the total, so no clamping is needed
             completion_percentage = 0.0
             if total_alignments > 0:
-                completion_percentage = (progress.current_alignment_index / total_alignments) * 100
-                completion_percentage = min(100.0, max(0.0, completion_percentage))
+                completion_percentage = round(current_alignment_index * 100.0 / total_alignments, 2)
             
             # Return progress with statistics
-            progress_dict = progress.to_dict()
-            progress_dict['completion_percentage'] = round(completion_percentage, 2)
+            progress_dict['completion_percentage'] = completion_percentage
             progress_dict['total_alignments'] = total_alignments
             
             return progress_dict
@@ -152,6 +498,89 @@ class ProgressService:
             db.session.rollback()
             raise ProgressServiceError(f"Error updating progress: {str(e)}")
     
+    @staticmethod
+    def flush_pending_progress():
+        """
+        Write all buffered progress updates in one transaction.
+        
+        Returns:
+            int: Number of progress records written
+            
+        Raises:
+            ProgressServiceError: If database error occurs; the updates stay buffered
+        """
+        pending = progress_write_buffer.drain()
+        if not pending:
+            return 0
+        
+        try:
+            for (user_id, sub_link_id), update in pending.items():
+                ProgressService._persist_progress(user_id, sub_link_id, **update)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            for key, update in pending.items():
+                progress_write_buffer.restore(key, update)
+            raise ProgressServiceError(f"Database error flushing progress: {str(e)}")
+        
+        for user_id, _ in pending:
+            analytics_cache.invalidate_user(user_id)
+        return len(pending)
+    
+    @staticmethod
+    def _persist_progress(user_id, sub_link_id, current_alignment_index, total_alignments_completed,
+                          session_duration_minutes, last_accessed):
+        """Upsert a progress record where the dialect allows, returning None for a missing link."""
+        dialect = db.engine.dialect
+        upsert = PROGRESS_UPSERTS.get(dialect.name)
+        if upsert is not None and dialect.insert_returning:
+            return db.session.scalars(upsert, {
+                'user_id': user_id,
+                'sub_link_id': sub_link_id,
+                'current_alignment_index': current_alignment_index,
+                'total_alignments_completed': total_alignments_completed,
+                'session_duration_minutes': session_duration_minutes,
+                'last_accessed': last_accessed
+            }, execution_options={'populate_existing': True}).one_or_none()
+        
+        return ProgressService._write_progress(
+            user_id, sub_link_id, current_alignment_index, total_alignments_completed,
+            session_duration_minutes, last_accessed
+        )
+    
+    @staticmethod
+    def _write_progress(user_id, sub_link_id, current_alignment_index, total_alignments_completed,
+                        session_duration_minutes, last_accessed):
+        """Update or create a progress record by selecting it first, for dialects without upserts."""
+        row = db.session.execute(PROGRESS_BY_SUB_LINK, {
+            'user_id': user_id,
+            'sub_link_id': sub_link_id
+        }).one_or_none()
+        if row is None:
+            return None
+        
+        progress = row.UserProgress
+        if progress:
+            # Update existing progress
+            progress.current_alignment_index = current_alignment_index
+            progress.session_duration_minutes += session_duration_minutes
+            progress.last_accessed = last_accessed
+            
+            # Update total completed alignments (progress made)
+            progress.total_alignments_completed = max(progress.total_alignments_completed, total_alignments_completed)
+        else:
+            # Create new progress record
+            progress = UserProgress(
+                user_id=user_id,
+                sub_link_id=sub_link_id,
+                current_alignment_index=current_alignment_index,
+                total_alignments_completed=total_alignments_completed,
+                session_duration_minutes=session_duration_minutes,
+                last_accessed=last_accessed
+            )
+            db.session.add(progress)
+        return progress
+    
     @staticmethod
     def calculate_completion_percentage(current_index, total_alignments):
         """
@@ -167,8 +596,7 @@ class ProgressService:
         if total_alignments <= 0:
             return 0.0
         
-        percentage = (current_index / total_alignments) * 100
-        return round(min(100.0, max(0.0, percentage)), 2)
+        return round(max(0.0, min(100.0, current_index * 100.0 / total_alignments)), 2)
     
     @staticmethod
     def get_recent_progress(user_id, limit=10):
@@ -186,27 +614,22 @@ class ProgressService:
             ProgressServiceError: If database error occurs
         """
         try:
-            progress_records = UserProgress.query.filter_by(
-                user_id=user_id
-            ).order_by(UserProgress.last_accessed.desc()).limit(limit).all()
-            
-            result = []
-            for progress in progress_records:
-                # Get alignment data for completion calculation
-                alignment_data = SubLinkLine.query.filter_by(sub_link_id=progress.sub_link_id).first()
-                total_alignments = len(alignment_data.link_data) if alignment_data and alignment_data.link_data else 0
-                
-                # Calculate completion percentage
-                completion_percentage = ProgressService.calculate_completion_percentage(
-                    progress.current_alignment_index, total_alignments
-                )
-                
-                progress_dict = progress.to_dict()
-                progress_dict['completion_percentage'] = completion_percentage
-                progress_dict['total_alignments'] = total_alignments
-                result.append(progress_dict)
+            rows = db.session.execute(RECENT_PROGRESS, {'user_id': user_id, 'limit': limit})
             
-            return result
+            return [{
+                'id': row.id,
+                'user_id': row.user_id,
+                'sub_link_id': row.sub_link_id,
+                'current_alignment_index': row.current_alignment_index,
+                'total_alignments_completed': row.total_alignments_completed,
+                'session_duration_minutes': row.session_duration_minutes,
+                'last_accessed': row.last_accessed.isoformat() if row.last_accessed else None,
+                'created_at': row.created_at.isoformat() if row.created_at else None,
+                'completion_percentage': ProgressService.calculate_completion_percentage(
+                    row.current_alignment_index, row.total_alignments
+                ),
+                'total_alignments': row.total_alignments
+            } for row in rows]
             
         except exc.SQLAlchemyError as e:
             raise ProgressServiceError(f"Database error retrieving recent progress: {str(e)}")
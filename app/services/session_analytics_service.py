@@ -1,10 +1,99 @@
 """Session analytics service for comprehensive learning analytics and insights."""
-from datetime import datetime, date, timedelta
-from sqlalchemy import func, desc, and_, or_
+import copy
+import functools
+from datetime import datetime, date, time, timedelta
+from sqlalchemy import func, desc, and_, or_, bindparam, case, event, select, tuple_
 from sqlalchemy import exc
 from app import db
-from app.models.subtitle import UserProgress, SubLink
+from app.models.subtitle import ALIGNMENT_COUNT_BY_SUB_LINK, UserProgress, SubLink, SubLinkAlignment
 from app.models.user import User
+from app.utils.cache import analytics_cache
+
+
+# Rows fetched at a time when walking a user's whole activity history
+STREAM_BATCH_SIZE = 1000
+
+ACTIVITY_DAY = func.date(UserProgress.last_accessed)
+
+# Dashboard totals are aggregated by the database per activity day, most
+# recent first, so the same round trip yields the dates the streak is
+# computed from and one row per day rather than per link
+DASHBOARD_DAILY_TOTALS = select(
+    ACTIVITY_DAY.label('day'),
+    func.sum(UserProgress.session_duration_minutes).label('total_study_minutes'),
+    func.sum(UserProgress.total_alignments_completed).label('total_alignments'),
+    func.count(UserProgress.id).label('total_sessions'),
+    func.sum(case((UserProgress.current_alignment_index > 0, 1), else_=0)).label('active_sessions'),
+    # Consider completed if substantial progress made (this is simplified)
+    func.sum(case((UserProgress.total_alignments_completed > 50, 1), else_=0)).label('movies_completed')
+).where(
+    UserProgress.user_id == bindparam('user_id')
+).group_by(ACTIVITY_DAY).order_by(desc(ACTIVITY_DAY))
+
+# Start date of the chart bucket a timestamp falls in, for the dialects able to
+# group by it; weeks start on Monday
+CHART_BUCKETS = {
+    'sqlite': {
+        'weekly': lambda ts: func.date(ts, 'weekday 0', '-6 days'),
+        'monthly': lambda ts: func.date(ts, 'start of month')
+    },
+    'postgresql': {
+        'weekly': lambda ts: func.date(func.date_trunc('week', ts)),
+        'monthly': lambda ts: func.date(func.date_trunc('month', ts))
+    }
+}
+
+# Chart bucket labels
+WEEK_LABEL_FORMAT = '%b %d'
+MONTH_LABEL_FORMAT = '%b %Y'
+
+
+def _week_key(day):
+    """Key a date's week by the ordinal of its Monday, which sorts chronologically."""
+    return day.toordinal() - day.weekday()
+
+
+def _month_key(day):
+    """Key a date's month by its count of months, which sorts chronologically."""
+    return day.year * 12 + day.month - 1
+
+
+def _as_date(value):
+    """Convert a bucket value, which SQLite returns as text, to a date."""
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _datetime_range(start_date, end_date):
+    """Half-open timestamp bounds covering whole days from start_date through end_date."""
+    return (datetime.combine(start_date, time.min),
+            datetime.combine(end_date + timedelta(days=1), time.min))
+
+
+def _cached(name, ttl):
+    """Serve a user's analytics result from the analytics cache for ttl seconds."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(user_id, *args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            result = analytics_cache.get(user_id, key)
+            if result is None:
+                result = method(user_id, *args, **kwargs)
+                analytics_cache.set(user_id, key, result, ttl)
+            return copy.deepcopy(result)
+        return wrapper
+    return decorator
+
+
+@event.listens_for(UserProgress, 'after_insert')
+@event.listens_for(UserProgress, 'after_update')
+@event.listens_for(UserProgress, 'after_delete')
+def _invalidate_user_analytics(mapper, connection, target):
+    """Drop a user's cached analytics whenever their progress changes."""
+    analytics_cache.invalidate_user(target.user_id)
 
 
 class SessionAnalyticsServiceError(Exception):
@@ -16,6 +105,7 @@ class SessionAnalyticsService:
     """Service class for session analytics and learning insights."""
     
     @staticmethod
+    @_cached('dashboard', ttl=30)
     def get_dashboard_statistics(user_id):
         """
         Get comprehensive dashboard statistics for a user.
@@ -30,10 +120,40 @@ class SessionAnalyticsService:
             SessionAnalyticsServiceError: If database error occurs
         """
         try:
-            # Get all user progress records
-            progress_records = UserProgress.query.filter_by(user_id=user_id).all()
+            one_day = timedelta(days=1)
+            streak_cutoff = date.today() - one_day
+            
+            # Stream the day rows, keeping running totals and counting the
+            # current streak until its first gap; the dashboard shows no other
+            # streak figures
+            total_study_minutes = 0
+            total_alignments = 0
+            movies_completed = 0
+            active_sessions = 0
+            total_sessions = 0
+            current_streak = 0
+            expected_date = None
+            streak_open = True
+            for day in db.session.execute(
+                DASHBOARD_DAILY_TOTALS, {'user_id': user_id},
+                execution_options={'yield_per': STREAM_BATCH_SIZE}
+            ):
+                total_study_minutes += day.total_study_minutes
+                total_alignments += day.total_alignments
+                movies_completed += day.movies_completed
+                active_sessions += day.active_sessions
+                total_sessions += day.total_sessions
+                
+                if streak_open:
+                    activity_date = _as_date(day.day)
+                    # The streak must reach today or yesterday, allowing for timezone flexibility
+                    if activity_date == expected_date or (expected_date is None and activity_date >= streak_cutoff):
+                        current_streak += 1
+                        expected_date = activity_date - one_day
+                    else:
+                        streak_open = False
             
-            if not progress_records:
+            if not total_sessions:
                 return {
                     'total_study_minutes': 0,
                     'movies_completed': 0,
@@ -46,49 +166,11 @@ class SessionAnalyticsService:
                     'total_sessions': 0
                 }
             
-            # Calculate basic statistics
-            total_study_minutes = sum(p.session_duration_minutes for p in progress_records)
-            total_alignments = sum(p.total_alignments_completed for p in progress_records)
-            
-            # Count movies (completed defined as > 80% completion)
-            movies_completed = 0
-            active_sessions = 0
-            total_sessions = len(progress_records)
-            
-            for progress in progress_records:
-                # Get total alignments for this subtitle link
-                sub_link_line = db.session.query(db.func.length(
-                    db.session.query(func.json_extract(
-                        db.select([func.json_array_length(
-                            func.json_extract(
-                                db.select([func.coalesce(
-                                    func.json_extract(
-                                        db.select([func.coalesce(func.json('[]'), func.json('[]'))]).scalar(),
-                                        '$'
-                                    ), 
-                                    func.json('[]')
-                                )]).scalar(), '$'
-                            )
-                        )]).scalar()
-                    )).scalar()
-                )).scalar()
-                
-                # Simplified approach - just check if user has made significant progress
-                if progress.current_alignment_index > 0:
-                    active_sessions += 1
-                    
-                # Consider completed if substantial progress made (this is simplified)
-                if progress.total_alignments_completed > 50:  # Arbitrary threshold
-                    movies_completed += 1
-            
             # Calculate averages
             avg_session_duration = total_study_minutes / total_sessions if total_sessions > 0 else 0.0
             completion_rate = (movies_completed / total_sessions) * 100 if total_sessions > 0 else 0.0
             learning_velocity = total_alignments / (total_study_minutes / 60) if total_study_minutes > 0 else 0.0
             
-            # Get current streak
-            current_streak = SessionAnalyticsService.calculate_learning_streak(user_id)['current_streak']
-            
             return {
                 'total_study_minutes': total_study_minutes,
                 'movies_completed': movies_completed,
@@ -125,19 +207,30 @@ class SessionAnalyticsService:
         try:
             end_date = date.today()
             start_date = end_date - timedelta(days=days)
-            
-            # Get progress records within date range
-            progress_records = UserProgress.query.filter(
+            range_start, range_end = _datetime_range(start_date, end_date)
+            
+            # Sum progress within date range per period; dialects without a
+            # period expression sum per day, leaving the rest to Python
+            bucket = CHART_BUCKETS.get(db.engine.dialect.name, {}).get(
+                'weekly' if period == 'weekly' else 'monthly', func.date
+            )
+            bucket_start = bucket(UserProgress.last_accessed)
+            bucket_totals = db.session.query(
+                bucket_start,
+                func.sum(UserProgress.session_duration_minutes),
+                func.sum(UserProgress.total_alignments_completed),
+                func.count()
+            ).filter(
                 UserProgress.user_id == user_id,
-                UserProgress.last_accessed >= start_date,
-                UserProgress.last_accessed <= end_date
-            ).order_by(UserProgress.last_accessed).all()
+                UserProgress.last_accessed >= range_start,
+                UserProgress.last_accessed < range_end
+            ).group_by(bucket_start).all()
             
             # Group data by period
             if period == 'weekly':
-                chart_data = SessionAnalyticsService._group_data_weekly(progress_records, start_date, end_date)
+                chart_data = SessionAnalyticsService._group_data_weekly(bucket_totals, start_date, end_date)
             else:  # monthly
-                chart_data = SessionAnalyticsService._group_data_monthly(progress_records, start_date, end_date)
+                chart_data = SessionAnalyticsService._group_data_monthly(bucket_totals, start_date, end_date)
             
             return chart_data
             
@@ -147,48 +240,36 @@ class SessionAnalyticsService:
             raise SessionAnalyticsServiceError(f"Error retrieving chart data: {str(e)}")
     
     @staticmethod
-    def _group_data_weekly(progress_records, start_date, end_date):
-        """Group progress data by week for chart visualization."""
-        # Create weekly buckets
-        weekly_data = {}
-        current_date = start_date
+    def _group_data_weekly(bucket_totals, start_date, end_date):
+        """
+        Group progress data by week for chart visualization.
         
-        while current_date <= end_date:
-            week_start = current_date - timedelta(days=current_date.weekday())
-            week_key = week_start.strftime('%Y-W%U')
-            week_label = week_start.strftime('%b %d')
-            
-            if week_key not in weekly_data:
-                weekly_data[week_key] = {
-                    'label': week_label,
-                    'study_minutes': 0,
-                    'alignments_completed': 0,
-                    'sessions': 0
-                }
+        Args:
+            bucket_totals (list): (date, study minutes, alignments completed, sessions)
+                rows, dated by week start or by day
+            start_date (date): First day of the chart
+            end_date (date): Last day of the chart
             
-            current_date += timedelta(days=7)
+        Returns:
+            dict: Chart-ready data with labels and datasets
+        """
+        # Create weekly buckets, one per week stepped from the start date
+        first_week = _week_key(start_date)
+        num_weeks = max(0, (end_date - start_date).days // 7 + 1)
+        labels = [
+            date.fromordinal(first_week + 7 * index).strftime(WEEK_LABEL_FORMAT)
+            for index in range(num_weeks)
+        ]
+        study_data = [0] * num_weeks
+        alignment_data = [0] * num_weeks
         
         # Populate data
-        for progress in progress_records:
-            progress_date = progress.last_accessed.date()
-            week_start = progress_date - timedelta(days=progress_date.weekday())
-            week_key = week_start.strftime('%Y-W%U')
-            
-            if week_key in weekly_data:
-                weekly_data[week_key]['study_minutes'] += progress.session_duration_minutes
-                weekly_data[week_key]['alignments_completed'] += progress.total_alignments_completed
-                weekly_data[week_key]['sessions'] += 1
-        
-        # Convert to chart format
-        labels = []
-        study_data = []
-        alignment_data = []
-        
-        for week_key in sorted(weekly_data.keys()):
-            data = weekly_data[week_key]
-            labels.append(data['label'])
-            study_data.append(data['study_minutes'])
-            alignment_data.append(data['alignments_completed'])
+        for bucket_date, study_minutes, alignments_completed, sessions in bucket_totals:
+            index = (_week_key(_as_date(bucket_date)) - first_week) // 7
+            
+            if 0 <= index < num_weeks:
+                study_data[index] += study_minutes
+                alignment_data[index] += alignments_completed
         
         return {
             'labels': labels,
@@ -209,49 +290,36 @@ class SessionAnalyticsService:
         }
     
     @staticmethod
-    def _group_data_monthly(progress_records, start_date, end_date):
-        """Group progress data by month for chart visualization."""
-        monthly_data = {}
-        
-        # Create monthly buckets
-        current_date = start_date.replace(day=1)  # First day of start month
+    def _group_data_monthly(bucket_totals, start_date, end_date):
+        """
+        Group progress data by month for chart visualization.
         
-        while current_date <= end_date:
-            month_key = current_date.strftime('%Y-%m')
-            month_label = current_date.strftime('%b %Y')
-            
-            monthly_data[month_key] = {
-                'label': month_label,
-                'study_minutes': 0,
-                'alignments_completed': 0,
-                'sessions': 0
-            }
+        Args:
+            bucket_totals (list): (date, study minutes, alignments completed, sessions)
+                rows, dated by month start or by day
+            start_date (date): First day of the chart
+            end_date (date): Last day of the chart
             
-            # Move to next month
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
+        Returns:
+            dict: Chart-ready data with labels and datasets
+        """
+        # Create monthly buckets, from the start month through the end month
+        first_month = _month_key(start_date)
+        num_months = max(0, _month_key(end_date) - first_month + 1)
+        labels = []
+        for month_key in range(first_month, first_month + num_months):
+            year, month_index = divmod(month_key, 12)
+            labels.append(date(year, month_index + 1, 1).strftime(MONTH_LABEL_FORMAT))
+        study_data = [0] * num_months
+        alignment_data = [0] * num_months
         
         # Populate data
-        for progress in progress_records:
-            month_key = progress.last_accessed.strftime('%Y-%m')
+        for bucket_date, study_minutes, alignments_completed, sessions in bucket_totals:
+            index = _month_key(_as_date(bucket_date)) - first_month
             
-            if month_key in monthly_data:
-                monthly_data[month_key]['study_minutes'] += progress.session_duration_minutes
-                monthly_data[month_key]['alignments_completed'] += progress.total_alignments_completed
-                monthly_data[month_key]['sessions'] += 1
-        
-        # Convert to chart format
-        labels = []
-        study_data = []
-        alignment_data = []
-        
-        for month_key in sorted(monthly_data.keys()):
-            data = monthly_data[month_key]
-            labels.append(data['label'])
-            study_data.append(data['study_minutes'])
-            alignment_data.append(data['alignments_completed'])
+            if 0 <= index < num_months:
+                study_data[index] += study_minutes
+                alignment_data[index] += alignments_completed
         
         return {
             'labels': labels,
@@ -272,6 +340,7 @@ class SessionAnalyticsService:
         }
     
     @staticmethod
+    @_cached('streak', ttl=60)
     def calculate_learning_streak(user_id):
         """
         Calculate consecutive learning days streak.
@@ -286,67 +355,14 @@ class SessionAnalyticsService:
             SessionAnalyticsServiceError: If database error occurs
         """
         try:
-            # Get all progress records ordered by date
-            progress_records = UserProgress.query.filter_by(
-                user_id=user_id
-            ).order_by(desc(UserProgress.last_accessed)).all()
+            # Get unique activity dates, most recent first
+            activity_dates = db.session.query(ACTIVITY_DAY).filter(
+                UserProgress.user_id == user_id
+            ).distinct().order_by(desc(ACTIVITY_DAY)).yield_per(STREAM_BATCH_SIZE)
             
-            if not progress_records:
-                return {
-                    'current_streak': 0,
-                    'longest_streak': 0,
-                    'last_activity_date': None,
-                    'streak_start_date': None
-                }
-            
-            # Get unique activity dates
-            activity_dates = set()
-            for progress in progress_records:
-                activity_dates.add(progress.last_accessed.date())
-            
-            activity_dates = sorted(activity_dates, reverse=True)
-            
-            # Calculate current streak
-            current_streak = 0
-            today = date.today()
-            
-            # Check if user studied today or yesterday (allow for timezone flexibility)
-            if activity_dates[0] >= today - timedelta(days=1):
-                current_date = activity_dates[0]
-                current_streak = 1
-                
-                # Count consecutive days backwards
-                for i in range(1, len(activity_dates)):
-                    expected_date = current_date - timedelta(days=i)
-                    if activity_dates[i] == expected_date:
-                        current_streak += 1
-                    else:
-                        break
-            
-            # Calculate longest streak
-            longest_streak = 0
-            temp_streak = 1
-            
-            for i in range(1, len(activity_dates)):
-                if activity_dates[i-1] - activity_dates[i] == timedelta(days=1):
-                    temp_streak += 1
-                else:
-                    longest_streak = max(longest_streak, temp_streak)
-                    temp_streak = 1
-            
-            longest_streak = max(longest_streak, temp_streak)
-            
-            # Get streak start date
-            streak_start_date = None
-            if current_streak > 0 and activity_dates:
-                streak_start_date = activity_dates[min(current_streak - 1, len(activity_dates) - 1)]
-            
-            return {
-                'current_streak': current_streak,
-                'longest_streak': longest_streak,
-                'last_activity_date': activity_dates[0].isoformat() if activity_dates else None,
-                'streak_start_date': streak_start_date.isoformat() if streak_start_date else None
-            }
+            return SessionAnalyticsService._streak_from_dates(
+                activity_date for activity_date, in activity_dates
+            )
             
         except exc.SQLAlchemyError as e:
             raise SessionAnalyticsServiceError(f"Database error calculating streak: {str(e)}")
@@ -354,14 +370,71 @@ class SessionAnalyticsService:
             raise SessionAnalyticsServiceError(f"Error calculating streak: {str(e)}")
     
     @staticmethod
-    def get_session_history(user_id, limit=50, days=30):
+    def _streak_from_dates(activity_dates):
+        """
+        Calculate current and longest streaks from unique activity dates.
+        
+        Args:
+            activity_dates (iterable): Activity dates, most recent first; SQLite
+                dates may be given as text
+            
+        Returns:
+            dict: Streak information including current and longest streaks
+        """
+        one_day = timedelta(days=1)
+        streak_cutoff = date.today() - one_day
+        current_streak = 0
+        longest_streak = 0
+        last_activity_date = None
+        streak_start_date = None
+        
+        # Walk the dates once, measuring each run of consecutive days; the
+        # first run is the current streak if it reaches today or yesterday
+        previous_date = None
+        run_length = 0
+        in_current_streak = False
+        for activity_date in activity_dates:
+            activity_date = _as_date(activity_date)
+            
+            if previous_date is not None and previous_date - activity_date == one_day:
+                run_length += 1
+            else:
+                if previous_date is None:
+                    last_activity_date = activity_date
+                    # Allow for timezone flexibility
+                    in_current_streak = activity_date >= streak_cutoff
+                else:
+                    in_current_streak = False
+                run_length = 1
+            
+            if in_current_streak:
+                current_streak = run_length
+                streak_start_date = activity_date
+            longest_streak = max(longest_streak, run_length)
+            previous_date = activity_date
+        
+        return {
+            'current_streak': current_streak,
+            'longest_streak': longest_streak,
+            'last_activity_date': last_activity_date.isoformat() if last_activity_date else None,
+            'streak_start_date': streak_start_date.isoformat() if streak_start_date else None
+        }
+    
+    @staticmethod
+    def get_session_history(user_id, limit=50, days=30, before=None):
         """
         Get detailed session history with movie-language breakdowns.
         
+        Pages deeper into the history by keyset rather than offset: pass the
+        ``datetime`` and ``progress_id`` of the last entry already shown as
+        ``before`` to continue from it without rescanning the newer sessions.
+        
         Args:
             user_id (int): ID of the user
             limit (int): Maximum number of sessions to return
             days (int): Number of days back to include
+            before (tuple, optional): (last_accessed, progress_id) of the last entry
+                already shown; only sessions ordered after it are included
             
         Returns:
             list: List of session history entries
@@ -372,26 +445,45 @@ class SessionAnalyticsService:
         try:
             end_date = date.today()
             start_date = end_date - timedelta(days=days)
+            range_start, range_end = _datetime_range(start_date, end_date)
+            filters = [
+                UserProgress.user_id == user_id,
+                UserProgress.last_accessed >= range_start,
+                UserProgress.last_accessed < range_end
+            ]
             
-            # Get progress records with subtitle link information
+            # Last accessed times are whole seconds, so the keyset includes the
+            # ID to tell apart sessions sharing the cursor's second
+            if before is not None:
+                filters.append(tuple_(UserProgress.last_accessed, UserProgress.id) < tuple(before))
+            
+            # Get the progress columns shown for each session of an existing
+            # link, counting each link's alignments in the same query
+            total_alignments = select(func.count()).where(
+                SubLinkAlignment.sub_link_id == SubLink.id
+            ).correlate(SubLink).scalar_subquery()
             progress_records = db.session.query(
-                UserProgress, SubLink
+                UserProgress.id,
+                UserProgress.last_accessed,
+                UserProgress.session_duration_minutes,
+                UserProgress.total_alignments_completed,
+                UserProgress.current_alignment_index,
+                SubLink.id.label('sub_link_id'),
+                total_alignments.label('total_alignments')
             ).join(
                 SubLink, UserProgress.sub_link_id == SubLink.id
             ).filter(
-                UserProgress.user_id == user_id,
-                UserProgress.last_accessed >= start_date,
-                UserProgress.last_accessed <= end_date
+                *filters
             ).order_by(
-                desc(UserProgress.last_accessed)
+                desc(UserProgress.last_accessed), desc(UserProgress.id)
             ).limit(limit).all()
             
             session_history = []
             
-            for progress, sub_link in progress_records:
+            for progress in progress_records:
                 # Parse language pair from sub_link data if available
                 language_pair = "Unknown"
-                movie_title = f"Movie ID: {sub_link.id}"
+                movie_title = f"Movie ID: {progress.sub_link_id}"
                 
                 # Try to extract movie title and language info from sub_link
                 # This is a simplified version - actual implementation would depend on data structure
@@ -399,14 +491,15 @@ class SessionAnalyticsService:
                 session_entry = {
                     'date': progress.last_accessed.strftime('%Y-%m-%d'),
                     'datetime': progress.last_accessed.isoformat(),
+                    'progress_id': progress.id,
                     'movie_title': movie_title,
                     'language_pair': language_pair,
                     'duration_minutes': progress.session_duration_minutes,
                     'alignments_studied': progress.total_alignments_completed,
                     'current_position': progress.current_alignment_index,
-                    'sub_link_id': sub_link.id,
-                    'progress_percentage': SessionAnalyticsService._calculate_progress_percentage(
-                        progress.current_alignment_index, sub_link.id
+                    'sub_link_id': progress.sub_link_id,
+                    'progress_percentage': SessionAnalyticsService._progress_percentage(
+                        progress.current_alignment_index, progress.total_alignments
                     )
                 }
                 
@@ -423,24 +516,25 @@ class SessionAnalyticsService:
     def _calculate_progress_percentage(current_index, sub_link_id):
         """Calculate progress percentage for a subtitle link."""
         try:
-            from app.models.subtitle import SubLinkLine
-            
-            # Get alignment data
-            alignment_data = SubLinkLine.query.filter_by(sub_link_id=sub_link_id).first()
-            if not alignment_data or not alignment_data.link_data:
-                return 0.0
-            
-            total_alignments = len(alignment_data.link_data)
-            if total_alignments == 0:
-                return 0.0
-            
-            percentage = (current_index / total_alignments) * 100
-            return round(min(100.0, max(0.0, percentage)), 2)
+            total_alignments = db.session.execute(
+                ALIGNMENT_COUNT_BY_SUB_LINK, {'sub_link_id': sub_link_id}
+            ).scalar()
+            return SessionAnalyticsService._progress_percentage(current_index, total_alignments)
             
         except Exception:
             return 0.0
     
     @staticmethod
+    def _progress_percentage(current_index, total_alignments):
+        """Calculate progress percentage from a known alignment total."""
+        if not total_alignments:
+            return 0.0
+        
+        percentage = (current_index / total_alignments) * 100
+        return round(min(100.0, max(0.0, percentage)), 2)
+    
+    @staticmethod
+    @_cached('velocity', ttl=60)
     def get_learning_velocity_trends(user_id, days=30):
         """
         Calculate learning velocity trends (alignments per hour over time).
@@ -458,48 +552,39 @@ class SessionAnalyticsService:
         try:
             end_date = date.today()
             start_date = end_date - timedelta(days=days)
-            
-            # Get progress records within date range
-            progress_records = UserProgress.query.filter(
+            range_start, range_end = _datetime_range(start_date, end_date)
+            
+            # Sum progress within date range per day
+            day = func.date(UserProgress.last_accessed)
+            daily_totals = db.session.query(
+                day,
+                func.sum(UserProgress.total_alignments_completed),
+                func.sum(UserProgress.session_duration_minutes)
+            ).filter(
                 UserProgress.user_id == user_id,
-                UserProgress.last_accessed >= start_date,
-                UserProgress.last_accessed <= end_date
-            ).order_by(UserProgress.last_accessed).all()
+                UserProgress.last_accessed >= range_start,
+                UserProgress.last_accessed < range_end
+            ).group_by(day).order_by(day).all()
             
-            if not progress_records:
+            if not daily_totals:
                 return {
                     'daily_velocities': [],
                     'average_velocity': 0.0,
                     'trend': 'stable'
                 }
             
-            # Group by day and calculate daily velocities
-            daily_data = {}
-            
-            for progress in progress_records:
-                day_key = progress.last_accessed.date()
-                
-                if day_key not in daily_data:
-                    daily_data[day_key] = {
-                        'total_alignments': 0,
-                        'total_minutes': 0
-                    }
-                
-                daily_data[day_key]['total_alignments'] += progress.total_alignments_completed
-                daily_data[day_key]['total_minutes'] += progress.session_duration_minutes
-            
             # Calculate daily velocities
             daily_velocities = []
-            for day, data in sorted(daily_data.items()):
+            for day_value, total_alignments, total_minutes in daily_totals:
                 velocity = 0.0
-                if data['total_minutes'] > 0:
-                    velocity = data['total_alignments'] / (data['total_minutes'] / 60)
+                if total_minutes > 0:
+                    velocity = total_alignments / (total_minutes / 60)
                 
                 daily_velocities.append({
-                    'date': day.isoformat(),
+                    'date': _as_date(day_value).isoformat(),
                     'velocity': round(velocity, 2),
-                    'alignments': data['total_alignments'],
-                    'minutes': data['total_minutes']
+                    'alignments': total_alignments,
+                    'minutes': total_minutes
                 })
             
             # Calculate average velocity
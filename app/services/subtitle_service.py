@@ -1,6 +1,7 @@
 """Subtitle service for database queries and caching."""
-from typing import List, Dict, Optional
-from sqlalchemy import text, exc, and_
+from itertools import groupby
+from typing import List, Dict, Optional, Tuple
+from sqlalchemy import text, exc, and_, bindparam
 from app import db
 from app.models.subtitle import SubLine, SubTitle
 from app.models.language import Language
@@ -10,6 +11,25 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _lines_from_columns(columns: Dict) -> List[Dict]:
+    """Expand a cached column-oriented subtitle entry into line dictionaries."""
+    language_id = columns['language_id']
+    return [
+        {'id': line_id, 'sequence': sequence, 'content': content, 'language_id': language_id}
+        for line_id, sequence, content in zip(columns['ids'], columns['sequences'], columns['contents'])
+    ]
+
+
+def _columns_from_rows(language_id: int, rows) -> Dict:
+    """Build a column-oriented cache entry from one language's line rows."""
+    return {
+        'language_id': language_id,
+        'ids': [row.id for row in rows],
+        'sequences': [row.sequence for row in rows],
+        'contents': [row.content for row in rows]
+    }
+
+
 class SubtitleService:
     """Service class for subtitle retrieval and caching."""
 
@@ -36,43 +56,43 @@ class SubtitleService:
         cached_content = subtitle_cache.get(movie_id, language_id)
         if cached_content is not None:
             logger.debug(f"Cache hit for movie {movie_id}, language {language_id}")
-            return cached_content
+            return _lines_from_columns(cached_content)
 
         try:
-            # Validate that movie exists
-            if not SubtitleService._movie_exists(movie_id):
-                raise ValueError(f"Movie with ID {movie_id} not found")
-
-            # Validate that language exists
-            if not SubtitleService._language_exists(language_id):
-                raise ValueError(f"Language with ID {language_id} not found")
-
-            # Query subtitle content with proper sequencing
+            # Query subtitle content straight off the (movie_id, language_id,
+            # sequence) index so lines come back in order without a sort; the
+            # movie and language checks ride along as one-off subqueries
             query = text("""
-                SELECT sl.id, sl.sequence, sl.content, sl.language_id
+                SELECT EXISTS (SELECT 1 FROM sub_titles WHERE id = :movie_id) AS movie_found,
+                       EXISTS (SELECT 1 FROM languages WHERE id = :language_id) AS language_found,
+                       sl.id, sl.sequence, sl.content, sl.language_id
                 FROM sub_lines sl
-                JOIN sub_titles st ON sl.movie_id = st.id
                 WHERE sl.movie_id = :movie_id AND sl.language_id = :language_id
                 ORDER BY sl.sequence ASC
             """)
+            params = {
+                'movie_id': movie_id,
+                'language_id': language_id
+            }
 
             with db.engine.connect() as conn:
-                result = conn.execute(query, {
-                    'movie_id': movie_id,
-                    'language_id': language_id
-                })
-                
-                subtitles = []
-                for row in result:
-                    subtitles.append({
-                        'id': row.id,
-                        'sequence': row.sequence,
-                        'content': row.content,
-                        'language_id': row.language_id
-                    })
-
-            # Cache the result
-            subtitle_cache.set(movie_id, language_id, subtitles)
+                lines = conn.execute(query, params).all()
+                # Only a movie and language without lines need the checks alone
+                found = lines[0] if lines else conn.execute(text("""
+                    SELECT EXISTS (SELECT 1 FROM sub_titles WHERE id = :movie_id) AS movie_found,
+                           EXISTS (SELECT 1 FROM languages WHERE id = :language_id) AS language_found
+                """), params).one()
+
+            if not found.movie_found:
+                raise ValueError(f"Movie with ID {movie_id} not found")
+            if not found.language_found:
+                raise ValueError(f"Language with ID {language_id} not found")
+
+            # Cache the result column by column, storing the language shared
+            # by every line once instead of repeating each key per line
+            columns = _columns_from_rows(language_id, lines)
+            subtitle_cache.set(movie_id, language_id, columns)
+            subtitles = _lines_from_columns(columns)
             logger.debug(f"Retrieved and cached {len(subtitles)} subtitle lines for movie {movie_id}, language {language_id}")
             
             return subtitles
@@ -81,6 +101,71 @@ class SubtitleService:
             logger.error(f"Database error retrieving subtitles for movie {movie_id}, language {language_id}: {str(e)}")
             raise Exception(f"Database error while fetching subtitles: {str(e)}")
 
+    @staticmethod
+    def get_subtitle_content_pair(movie_id: int, language_a: int, language_b: int) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Get subtitle content for a specific movie in two languages at once.
+        
+        Languages missing from the cache are read together in one query and
+        cached individually, so a movie opened in both languages of a pair
+        costs a single round trip.
+        
+        Args:
+            movie_id: Movie ID to get subtitles for
+            language_a: First language ID for subtitle content
+            language_b: Second language ID for subtitle content
+            
+        Returns:
+            Tuple of subtitle line lists for language_a and language_b
+            
+        Raises:
+            ValueError: If movie_id or either language ID is invalid
+            Exception: For database connection issues
+        """
+        if not movie_id or not language_a or not language_b:
+            raise ValueError("movie_id and both language IDs are required")
+
+        columns = {}
+        for language_id in (language_a, language_b):
+            cached_content = subtitle_cache.get(movie_id, language_id)
+            if cached_content is not None:
+                columns[language_id] = cached_content
+        missing = [language_id for language_id in dict.fromkeys((language_a, language_b))
+                   if language_id not in columns]
+
+        if missing:
+            try:
+                query = text("""
+                    SELECT id, sequence, content, language_id
+                    FROM sub_lines
+                    WHERE movie_id = :movie_id AND language_id IN :language_ids
+                    ORDER BY language_id ASC, sequence ASC
+                """).bindparams(bindparam('language_ids', expanding=True))
+
+                with db.engine.connect() as conn:
+                    rows = conn.execute(query, {
+                        'movie_id': movie_id,
+                        'language_ids': missing
+                    }).all()
+
+            except exc.SQLAlchemyError as e:
+                logger.error(f"Database error retrieving subtitles for movie {movie_id}, languages {missing}: {str(e)}")
+                raise Exception(f"Database error while fetching subtitles: {str(e)}")
+
+            # Rows arrive grouped by language, one cache entry per group
+            for language_id, group in groupby(rows, key=lambda row: row.language_id):
+                columns[language_id] = _columns_from_rows(language_id, list(group))
+                subtitle_cache.set(movie_id, language_id, columns[language_id])
+            logger.debug(f"Retrieved and cached {len(rows)} subtitle lines for movie {movie_id}, languages {missing}")
+
+        # A language without lines takes the single-language path, which
+        # tells an unknown movie or language apart from an empty one
+        return tuple(
+            _lines_from_columns(columns[language_id]) if language_id in columns
+            else SubtitleService.get_subtitle_content(movie_id, language_id)
+            for language_id in (language_a, language_b)
+        )
+
     @staticmethod
     def get_available_languages(movie_id: int) -> List[Dict]:
         """
@@ -100,29 +185,23 @@ class SubtitleService:
             raise ValueError("movie_id is required")
 
         try:
-            # Validate that movie exists
-            if not SubtitleService._movie_exists(movie_id):
-                raise ValueError(f"Movie with ID {movie_id} not found")
-
             # Query available languages for the movie
             query = text("""
-                SELECT DISTINCT sl.language_id, l.name as language_name, l.display_name
+                SELECT DISTINCT sl.language_id AS id, l.name, l.display_name
                 FROM sub_lines sl
                 JOIN languages l ON sl.language_id = l.id
                 WHERE sl.movie_id = :movie_id
                 ORDER BY l.name ASC
             """)
 
+            # Columns are named after the response keys, so rows map directly;
+            # the existence check shares the connection
             with db.engine.connect() as conn:
-                result = conn.execute(query, {'movie_id': movie_id})
-                
-                languages = []
-                for row in result:
-                    languages.append({
-                        'id': row.language_id,
-                        'name': row.language_name,
-                        'display_name': row.display_name
-                    })
+                if not SubtitleService._movie_exists(conn, movie_id):
+                    raise ValueError(f"Movie with ID {movie_id} not found")
+
+                result = conn.execute(query, {'movie_id': movie_id}).mappings().all()
+                languages = [dict(row) for row in result]
 
             logger.debug(f"Found {len(languages)} available languages for movie {movie_id}")
             return languages
@@ -154,9 +233,10 @@ class SubtitleService:
 
         try:
             # Check if there are subtitle links for the user's language pair and this movie
-            # Also ensure the specific language requested has subtitle content
+            # Also ensure the specific language requested has subtitle content;
+            # the first matching pair is enough, so nothing is counted
             query = text("""
-                SELECT COUNT(*) as count
+                SELECT 1
                 FROM sub_links sl
                 JOIN sub_lines sline ON (sline.movie_id = sl.fromid OR sline.movie_id = sl.toid)
                 WHERE (sl.fromid = :movie_id OR sl.toid = :movie_id)
@@ -164,6 +244,7 @@ class SubtitleService:
                   AND sline.language_id = :language_id
                   AND ((sl.fromlang = :native_lang AND sl.tolang = :target_lang) 
                        OR (sl.fromlang = :target_lang AND sl.tolang = :native_lang))
+                LIMIT 1
             """)
 
             with db.engine.connect() as conn:
@@ -172,9 +253,9 @@ class SubtitleService:
                     'language_id': language_id,
                     'native_lang': user_native_lang,
                     'target_lang': user_target_lang
-                }).fetchone()
+                }).first()
                 
-                return result.count > 0
+                return result is not None
 
         except exc.SQLAlchemyError:
             logger.error(f"Database error validating subtitle access for movie {movie_id}")
@@ -198,27 +279,14 @@ class SubtitleService:
         return subtitle_cache.get_stats()
 
     @staticmethod
-    def _movie_exists(movie_id: int) -> bool:
-        """Check if movie exists in database."""
-        try:
-            query = text("SELECT COUNT(*) as count FROM sub_titles WHERE id = :movie_id")
-            
-            with db.engine.connect() as conn:
-                result = conn.execute(query, {'movie_id': movie_id}).fetchone()
-                return result.count > 0
-                
-        except exc.SQLAlchemyError:
-            return False
-
-    @staticmethod
-    def _language_exists(language_id: int) -> bool:
-        """Check if language exists in database."""
+    def _movie_exists(conn, movie_id: int) -> bool:
+        """Check if movie exists in database, using the caller's connection."""
         try:
-            query = text("SELECT COUNT(*) as count FROM languages WHERE id = :language_id")
+            # Stop at the first match instead of counting
+            query = text("SELECT 1 FROM sub_titles WHERE id = :movie_id LIMIT 1")
             
-            with db.engine.connect() as conn:
-                result = conn.execute(query, {'language_id': language_id}).fetchone()
-                return result.count > 0
+            result = conn.execute(query, {'movie_id': movie_id}).first()
+            return result is not None
                 
         except exc.SQLAlchemyError:
             return False
@@ -237,30 +305,32 @@ class SubtitleService:
         if not isinstance(subtitle_lines, list):
             return False
 
-        required_fields = ['id', 'sequence', 'content', 'language_id']
-        
+        # Check fields, types and sequence ordering in a single pass;
+        # sequences start at 0 and must never decrease
+        previous_sequence = 0
         for line in subtitle_lines:
             if not isinstance(line, dict):
                 return False
-                
+
             # Check required fields
-            for field in required_fields:
-                if field not in line:
-                    return False
-                    
+            try:
+                line_id = line['id']
+                sequence = line['sequence']
+                content = line['content']
+                language_id = line['language_id']
+            except KeyError:
+                return False
+
             # Validate field types
-            if not isinstance(line['id'], int) or line['id'] <= 0:
+            if not isinstance(line_id, int) or line_id <= 0:
                 return False
-            if not isinstance(line['sequence'], int) or line['sequence'] < 0:
+            if not isinstance(sequence, int) or sequence < previous_sequence:
                 return False
-            if not isinstance(line['content'], str) or not line['content'].strip():
+            if not isinstance(content, str) or not content.strip():
                 return False
-            if not isinstance(line['language_id'], int) or line['language_id'] <= 0:
+            if not isinstance(language_id, int) or language_id <= 0:
                 return False
 
-        # Check sequence ordering
-        sequences = [line['sequence'] for line in subtitle_lines]
-        if sequences != sorted(sequences):
-            return False
+            previous_sequence = sequence
 
         return True
\ No newline at end of file
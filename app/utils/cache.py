@@ -1,63 +1,138 @@
 """In-memory caching utilities for subtitle content."""
+import gzip
+import hashlib
+import json
 import time
-from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
 from threading import Lock
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
 logger = logging.getLogger(__name__)
 
 
+def _encode(content: Any) -> bytes:
+    """Serialize and compress content, with orjson when it is installed."""
+    if orjson is not None:
+        serialized = orjson.dumps(content)
+    else:
+        serialized = json.dumps(content).encode()
+    return gzip.compress(serialized, compresslevel=1)
+
+
+def _decode(payload: bytes) -> Any:
+    """Decompress and deserialize content stored by _encode."""
+    serialized = gzip.decompress(payload)
+    if orjson is not None:
+        return orjson.loads(serialized)
+    return json.loads(serialized)
+
+
 class SubtitleCache:
-    """Thread-safe in-memory cache for subtitle content with TTL support."""
+    """Thread-safe in-memory LRU cache of compressed subtitle content with TTL support."""
     
-    def __init__(self, default_ttl: int = 3600, max_size: int = 1000):
+    def __init__(self, default_ttl: int = 3600, max_size: int = 1000, max_bytes: Optional[int] = None):
         """
         Initialize the subtitle cache.
         
         Args:
             default_ttl: Default time-to-live in seconds (default: 1 hour)
             max_size: Maximum number of cached items (default: 1000)
+            max_bytes: Maximum compressed size of cached items (default: no limit)
         """
-        self._cache: Dict[str, Tuple[Any, float]] = {}
+        # Entries are (payload, expiry, movie_id), least recently used first
+        self._cache: OrderedDict[str, Tuple[bytes, float, int]] = OrderedDict()
+        self._movie_keys: Dict[int, Set[str]] = {}
         self._lock = Lock()
         self.default_ttl = default_ttl
         self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._bytes = 0
         self._hits = 0
         self._misses = 0
+        self._shared = None
+        self._local_ttl = default_ttl
     
     def _generate_key(self, movie_id: int, language_id: int) -> str:
         """Generate cache key for movie-language combination."""
         return f"subtitles:{movie_id}:{language_id}"
     
-    def _is_expired(self, timestamp: float) -> bool:
-        """Check if cached item has expired."""
-        return time.time() > timestamp
-    
-    def _evict_expired(self) -> None:
-        """Remove expired items from cache."""
-        current_time = time.time()
-        expired_keys = [
-            key for key, (_, expiry) in self._cache.items()
-            if current_time > expiry
-        ]
-        for key in expired_keys:
-            del self._cache[key]
-    
-    def _enforce_size_limit(self) -> None:
-        """Remove oldest items if cache exceeds max size."""
-        if len(self._cache) <= self.max_size:
-            return
-        
-        # Sort by expiry time and remove oldest entries
-        sorted_items = sorted(
-            self._cache.items(),
-            key=lambda item: item[1][1]  # Sort by expiry timestamp
-        )
-        
-        # Keep only the newest max_size items
-        items_to_remove = len(self._cache) - self.max_size
-        for key, _ in sorted_items[:items_to_remove]:
-            del self._cache[key]
+    def use_shared_store(self, client: Any, local_ttl: int = 60) -> None:
+        """
+        Share cached content across worker processes through Redis.
+        
+        In-process entries become a short-lived first tier in front of the
+        shared store, so each worker serves its hottest movies without a
+        network round trip while cold workers start from the shared copy.
+        Other workers may keep serving an invalidated entry for up to
+        local_ttl seconds.
+        
+        Args:
+            client: redis.Redis client holding the shared entries
+            local_ttl: Time-to-live in seconds of the in-process copies
+        """
+        with self._lock:
+            self._shared = client
+            self._local_ttl = local_ttl
+    
+    def _shared_call(self, method: Callable, *args, **kwargs) -> Any:
+        """Run a shared store command, treating an unreachable store as a miss."""
+        try:
+            return method(*args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Shared subtitle cache unavailable: {str(e)}")
+            return None
+    
+    def _over_limit(self) -> bool:
+        """Check if the cache holds more items or bytes than allowed; the caller holds the lock."""
+        if len(self._cache) > self.max_size:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+    
+    def _store(self, key: str, movie_id: int, payload: bytes, expiry: float) -> None:
+        """Store an entry as most recently used, evicting the least recently used; the caller holds the lock."""
+        if key in self._cache:
+            self._remove(key)
+        self._cache[key] = (payload, expiry, movie_id)
+        self._movie_keys.setdefault(movie_id, set()).add(key)
+        self._bytes += len(payload)
+        
+        while self._cache and self._over_limit():
+            self._remove(next(iter(self._cache)))
+    
+    def _remove(self, key: str) -> None:
+        """Remove an entry and its movie index reference; the caller holds the lock."""
+        payload, _, movie_id = self._cache.pop(key)
+        self._bytes -= len(payload)
+        movie_keys = self._movie_keys[movie_id]
+        movie_keys.discard(key)
+        if not movie_keys:
+            del self._movie_keys[movie_id]
+    
+    def _get_local(self, key: str) -> Optional[bytes]:
+        """Get an unexpired in-process payload, marking it most recently used; the caller holds the lock."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        
+        payload, expiry, _ = entry
+        if time.time() > expiry:
+            self._remove(key)
+            return None
+        
+        self._cache.move_to_end(key)
+        return payload
     
     def get(self, movie_id: int, language_id: int) -> Optional[Any]:
         """
@@ -68,24 +143,32 @@ class SubtitleCache:
             language_id: Language ID
             
         Returns:
-            Cached subtitle content or None if not found/expired
+            Fresh copy of the cached subtitle content or None if not found/expired
         """
         key = self._generate_key(movie_id, language_id)
         
         with self._lock:
-            if key not in self._cache:
-                self._misses += 1
-                return None
-            
-            content, expiry = self._cache[key]
-            
-            if self._is_expired(expiry):
-                del self._cache[key]
+            payload = self._get_local(key)
+            shared = self._shared
+            if payload is not None:
+                self._hits += 1
+            elif shared is None:
                 self._misses += 1
                 return None
+        
+        if payload is None:
+            # Fall back to the copy another worker shared, outside the lock
+            payload = self._shared_call(shared.get, key)
             
-            self._hits += 1
-            return content
+            with self._lock:
+                if not payload:
+                    self._misses += 1
+                    return None
+                
+                self._store(key, movie_id, payload, time.time() + self._local_ttl)
+                self._hits += 1
+        
+        return _decode(payload)
     
     def set(self, movie_id: int, language_id: int, content: Any, ttl: Optional[int] = None) -> None:
         """
@@ -94,17 +177,20 @@ class SubtitleCache:
         Args:
             movie_id: Movie ID
             language_id: Language ID  
-            content: Subtitle content to cache
+            content: JSON-serializable subtitle content to cache
             ttl: Time-to-live in seconds (uses default if not specified)
         """
         key = self._generate_key(movie_id, language_id)
         ttl = ttl or self.default_ttl
-        expiry = time.time() + ttl
+        payload = _encode(content)
         
         with self._lock:
-            self._cache[key] = (content, expiry)
-            self._evict_expired()
-            self._enforce_size_limit()
+            shared = self._shared
+            local_ttl = ttl if shared is None else min(ttl, self._local_ttl)
+            self._store(key, movie_id, payload, time.time() + local_ttl)
+        
+        if shared is not None:
+            self._shared_call(shared.set, key, payload, ex=ttl)
             
         logger.debug(f"Cached subtitles for movie {movie_id}, language {language_id}")
     
@@ -121,24 +207,41 @@ class SubtitleCache:
                 # Invalidate specific movie-language combination
                 key = self._generate_key(movie_id, language_id)
                 if key in self._cache:
-                    del self._cache[key]
+                    self._remove(key)
                     logger.debug(f"Invalidated cache for movie {movie_id}, language {language_id}")
             else:
                 # Invalidate all languages for the movie
-                prefix = f"subtitles:{movie_id}:"
-                keys_to_remove = [key for key in self._cache.keys() if key.startswith(prefix)]
-                for key in keys_to_remove:
-                    del self._cache[key]
+                for key in list(self._movie_keys.get(movie_id, ())):
+                    self._remove(key)
                 logger.debug(f"Invalidated all cached subtitles for movie {movie_id}")
+            shared = self._shared
+        
+        if shared is not None:
+            if language_id is not None:
+                self._shared_call(shared.delete, self._generate_key(movie_id, language_id))
+            else:
+                self._delete_shared(shared, f"subtitles:{movie_id}:*")
     
     def clear(self) -> None:
         """Clear all cached content."""
         with self._lock:
             self._cache.clear()
+            self._movie_keys.clear()
+            self._bytes = 0
             self._hits = 0
             self._misses = 0
+            shared = self._shared
+        
+        if shared is not None:
+            self._delete_shared(shared, "subtitles:*")
         logger.debug("Cleared all cached subtitle content")
     
+    def _delete_shared(self, client: Any, pattern: str) -> None:
+        """Delete the shared entries whose keys match a glob pattern."""
+        keys = self._shared_call(lambda: list(client.scan_iter(match=pattern, count=500)))
+        if keys:
+            self._shared_call(client.delete, *keys)
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Get cache performance statistics.
@@ -150,12 +253,6 @@ class SubtitleCache:
             total_requests = self._hits + self._misses
             hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
             
-            # Calculate memory usage estimate
-            memory_estimate = sum(
-                len(str(content)) + len(key) 
-                for key, (content, _) in self._cache.items()
-            )
-            
             return {
                 'hits': self._hits,
                 'misses': self._misses,
@@ -163,8 +260,10 @@ class SubtitleCache:
                 'hit_rate_percent': round(hit_rate, 2),
                 'cache_size': len(self._cache),
                 'max_size': self.max_size,
+                'max_bytes': self.max_bytes,
                 'default_ttl': self.default_ttl,
-                'memory_estimate_bytes': memory_estimate,
+                'memory_estimate_bytes': self._bytes,
+                'shared_store': self._shared is not None,
                 'timestamp': time.time()
             }
     
@@ -175,14 +274,366 @@ class SubtitleCache:
         Args:
             subtitle_data: Dictionary mapping (movie_id, language_id) tuples to subtitle content
         """
+        payloads = {
+            (movie_id, language_id): _encode(content)
+            for (movie_id, language_id), content in subtitle_data.items()
+        }
+        
         with self._lock:
-            for (movie_id, language_id), content in subtitle_data.items():
+            shared = self._shared
+            local_ttl = self.default_ttl if shared is None else min(self.default_ttl, self._local_ttl)
+            for (movie_id, language_id), payload in payloads.items():
                 key = self._generate_key(movie_id, language_id)
-                expiry = time.time() + self.default_ttl
-                self._cache[key] = (content, expiry)
+                expiry = time.time() + local_ttl
+                self._store(key, movie_id, payload, expiry)
+        
+        if shared is not None:
+            pipeline = shared.pipeline()
+            for (movie_id, language_id), payload in payloads.items():
+                pipeline.set(self._generate_key(movie_id, language_id), payload, ex=self.default_ttl)
+            self._shared_call(pipeline.execute)
                 
         logger.info(f"Warmed cache with {len(subtitle_data)} subtitle entries")
 
 
-# Global cache instance
-subtitle_cache = SubtitleCache()
\ No newline at end of file
+class TTLCache:
+    """Thread-safe in-memory LRU cache with a time-to-live per entry."""
+    
+    def __init__(self, default_ttl: int = 300, max_size: int = 1000):
+        """
+        Initialize the cache.
+        
+        Args:
+            default_ttl: Default time-to-live in seconds (default: 5 minutes)
+            max_size: Maximum number of cached entries (default: 1000)
+        """
+        # Entries are (value, expiry), least recently used first
+        self._cache: OrderedDict[Hashable, Tuple[Any, float]] = OrderedDict()
+        self._lock = Lock()
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+    
+    def _store(self, key: Hashable, value: Any, expiry: float) -> None:
+        """Add an entry as most recently used; the caller holds the lock."""
+        self._cache[key] = (value, expiry)
+    
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry; the caller holds the lock."""
+        del self._cache[key]
+    
+    def _make_room(self, now: float) -> None:
+        """Drop expired entries from the least recently used end, then the oldest, until one more fits."""
+        while self._cache:
+            key, (_, expiry) = next(iter(self._cache.items()))
+            if now <= expiry and len(self._cache) < self.max_size:
+                break
+            self._remove(key)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value or None if not found/expired
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            
+            value, expiry = entry
+            if time.time() > expiry:
+                self._remove(key)
+                return None
+            
+            self._cache.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Cache a value.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time-to-live in seconds (uses default if None)
+        """
+        now = time.time()
+        expiry = now + (ttl if ttl is not None else self.default_ttl)
+        
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            else:
+                self._make_room(now)
+            self._store(key, value, expiry)
+    
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Invalidate a cached value.
+        
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+    
+    def clear(self) -> None:
+        """Clear all cached values."""
+        with self._lock:
+            self._cache.clear()
+
+
+class CatalogCache(TTLCache):
+    """Thread-safe in-memory cache of catalog query results keyed by language pair and filters."""
+    
+    def __init__(self, default_ttl: int = 300, max_size: int = 256):
+        """
+        Initialize the catalog cache.
+        
+        Args:
+            default_ttl: Time-to-live in seconds (default: 5 minutes)
+            max_size: Maximum number of cached results (default: 256)
+        """
+        super().__init__(default_ttl, max_size)
+    
+    def _generate_key(self, language_a: int, language_b: int, filters: Tuple) -> Tuple:
+        """Generate cache key; results are symmetric so the pair is order-independent."""
+        return (min(language_a, language_b), max(language_a, language_b),
+                tuple(value or None for value in filters))
+    
+    def get(self, language_a: int, language_b: int, filters: Tuple = ()) -> Optional[Any]:
+        """
+        Get a cached result.
+        
+        Args:
+            language_a: One language ID of the pair
+            language_b: The other language ID of the pair
+            filters: Filter values the result was queried with, empty values
+                being equivalent to None
+            
+        Returns:
+            Cached result or None if not found/expired
+        """
+        return super().get(self._generate_key(language_a, language_b, filters))
+    
+    def set(self, language_a: int, language_b: int, filters: Tuple, value: Any) -> None:
+        """
+        Cache a result.
+        
+        Args:
+            language_a: One language ID of the pair
+            language_b: The other language ID of the pair
+            filters: Filter values the result was queried with
+            value: Query result to cache
+        """
+        super().set(self._generate_key(language_a, language_b, filters), value)
+
+
+class IdTokenCache(TTLCache):
+    """Thread-safe in-memory cache of verified ID token claims keyed by token and nonce digest."""
+    
+    def __init__(self, default_ttl: int = 60, max_size: int = 1024):
+        """
+        Initialize the ID token cache.
+        
+        Args:
+            default_ttl: Time-to-live in seconds (default: 1 minute)
+            max_size: Maximum number of cached tokens (default: 1024)
+        """
+        super().__init__(default_ttl, max_size)
+    
+    def _generate_key(self, provider: str, id_token: str, nonce: str) -> Tuple[str, bytes]:
+        """Generate cache key; tokens are digested so raw credentials are not kept as keys."""
+        digest = hashlib.sha256()
+        for part in (id_token, nonce):
+            encoded = part.encode()
+            digest.update(len(encoded).to_bytes(4, 'big'))
+            digest.update(encoded)
+        return (provider, digest.digest())
+    
+    def get(self, provider: str, id_token: str, nonce: str) -> Optional[Any]:
+        """
+        Get the cached claims of an ID token.
+        
+        Args:
+            provider: OAuth provider that issued the token
+            id_token: Encoded ID token
+            nonce: Nonce the claims were verified against
+            
+        Returns:
+            Verified claims or None if not found/expired
+        """
+        return super().get(self._generate_key(provider, id_token, nonce))
+    
+    def set(self, provider: str, id_token: str, nonce: str, claims: Any) -> None:
+        """
+        Cache the verified claims of an ID token.
+        
+        Args:
+            provider: OAuth provider that issued the token
+            id_token: Encoded ID token
+            nonce: Nonce the claims were verified against
+            claims: Claims verified from the token
+        """
+        super().set(self._generate_key(provider, id_token, nonce), claims)
+
+
+class AnalyticsCache(TTLCache):
+    """Thread-safe in-memory cache of per-user analytics results, invalidated per user."""
+    
+    def __init__(self, default_ttl: int = 30, max_size: int = 10000):
+        """
+        Initialize the analytics cache.
+        
+        Args:
+            default_ttl: Time-to-live in seconds (default: 30 seconds)
+            max_size: Maximum number of cached results (default: 10000)
+        """
+        super().__init__(default_ttl, max_size)
+        self._user_keys: Dict[int, Set[Tuple]] = {}
+    
+    def _store(self, key: Tuple, value: Any, expiry: float) -> None:
+        """Add a result and index it by user; the caller holds the lock."""
+        super()._store(key, value, expiry)
+        self._user_keys.setdefault(key[0], set()).add(key)
+    
+    def _remove(self, key: Tuple) -> None:
+        """Remove a result and its user index entry; the caller holds the lock."""
+        super()._remove(key)
+        user_keys = self._user_keys.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._user_keys[key[0]]
+    
+    def get(self, user_id: int, key: Tuple) -> Optional[Any]:
+        """
+        Get a cached result.
+        
+        Args:
+            user_id: User the result was computed for
+            key: Name and parameters of the computation
+            
+        Returns:
+            Cached result or None if not found/expired
+        """
+        return super().get((user_id, key))
+    
+    def set(self, user_id: int, key: Tuple, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Cache a result.
+        
+        Args:
+            user_id: User the result was computed for
+            key: Name and parameters of the computation
+            value: Result to cache
+            ttl: Time-to-live in seconds (uses default if None)
+        """
+        super().set((user_id, key), value, ttl)
+    
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Invalidate all cached results of a user.
+        
+        Args:
+            user_id: User whose results to invalidate
+        """
+        with self._lock:
+            for key in list(self._user_keys.get(user_id, ())):
+                self._remove(key)
+    
+    def clear(self) -> None:
+        """Clear all cached results."""
+        with self._lock:
+            self._cache.clear()
+            self._user_keys.clear()
+
+
+class CodeExchangeCache:
+    """Thread-safe registry sharing one authorization code exchange between duplicate callbacks."""
+    
+    def __init__(self, wait_timeout: int = 30):
+        """
+        Initialize the code exchange cache.
+        
+        Args:
+            wait_timeout: Seconds a duplicate waits for the exchange in flight (default: 30)
+        """
+        self._cache: Dict[Tuple[str, bytes], Future] = {}
+        self._lock = Lock()
+        self.wait_timeout = wait_timeout
+    
+    def _generate_key(self, provider: str, flow: str, code: str) -> Tuple[str, bytes]:
+        """Generate cache key; flow state and code are digested so raw credentials are not kept as keys."""
+        digest = hashlib.sha256()
+        for part in (flow, code):
+            encoded = part.encode()
+            digest.update(len(encoded).to_bytes(4, 'big'))
+            digest.update(encoded)
+        return (provider, digest.digest())
+    
+    def run(self, provider: str, flow: str, code: str, exchange: Callable[[], Any]) -> Any:
+        """
+        Run an exchange once per code and login flow, sharing it with concurrent duplicates.
+        
+        The first caller runs the exchange; callers from the same flow that
+        arrive while it is in flight wait for the same result instead of
+        spending the single-use code again. The entry is dropped as soon as
+        the exchange finishes, so a code replayed later, or from another
+        flow, is exchanged with the provider again and rejected there.
+        
+        Args:
+            provider: OAuth provider the code was issued by
+            flow: State stored in the session that started the login flow
+            code: Authorization code from the callback
+            exchange: Callable performing the exchange
+        
+        Returns:
+            Result of the exchange
+        
+        Raises:
+            TimeoutError: If a duplicate caller waits longer than wait_timeout
+        """
+        key = self._generate_key(provider, flow, code)
+        
+        with self._lock:
+            future = self._cache.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._cache[key] = future
+        
+        if not owner:
+            return future.result(timeout=self.wait_timeout)
+        
+        try:
+            result = exchange()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._cache.pop(key, None)
+    
+    def clear(self) -> None:
+        """Clear all recorded exchanges."""
+        with self._lock:
+            self._cache.clear()
+
+
+# Global cache instances
+subtitle_cache = SubtitleCache(max_bytes=64 * 1024 * 1024)
+movie_list_cache = CatalogCache()
+letter_count_cache = CatalogCache()
+id_token_cache = IdTokenCache()
+analytics_cache = AnalyticsCache()
+alignment_total_cache = TTLCache(default_ttl=300, max_size=4096)
+code_exchange_cache = CodeExchangeCache()
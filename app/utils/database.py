@@ -3,13 +3,57 @@ import sqlite3
 import logging
 from contextlib import contextmanager
 from typing import Dict, Any, Optional, Tuple
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.exc import SQLAlchemyError
 
 from app import db
 
 logger = logging.getLogger(__name__)
 
+# Optimization settings from architecture requirements
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", "10000"),
+    ("temp_store", "memory"),
+    ("mmap_size", "268435456")  # 256MB
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply the optimization PRAGMAs to a new pooled SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for setting, value in SQLITE_PRAGMAS:
+            try:
+                cursor.execute(f"PRAGMA {setting} = {value}")
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to apply PRAGMA {setting}: {e}")
+    finally:
+        cursor.close()
+
+
+def register_sqlite_pragmas(engine) -> bool:
+    """
+    Apply the SQLite optimization PRAGMAs to every connection an engine opens.
+
+    Most of these settings only last for the connection that sets them, so
+    they are applied as each pooled connection is created rather than once
+    on a separate connection.
+
+    Args:
+        engine: SQLAlchemy engine to configure
+
+    Returns:
+        True if the engine uses SQLite and was configured, False otherwise
+    """
+    if engine.dialect.name != 'sqlite':
+        return False
+
+    if not event.contains(engine, 'connect', _set_sqlite_pragmas):
+        event.listen(engine, 'connect', _set_sqlite_pragmas)
+    return True
+
 
 def test_database_connection() -> Tuple[bool, Optional[str]]:
     """
@@ -62,23 +106,42 @@ def get_database_info() -> Dict[str, Any]:
         inspector = db.inspect(db.engine)
         tables = inspector.get_table_names()
 
-        table_info = []
-        for table_name in tables:
+        # Count every table in one UNION ALL query; only names reported by
+        # the inspector are interpolated, quoted as identifiers
+        row_counts = {}
+        count_error = None
+        if tables:
             try:
                 with db.engine.connect() as conn:
-                    count_result = conn.execute(
-                        text(f'SELECT COUNT(*) FROM {table_name}')).fetchone()
-                    row_count = count_result[0] if count_result else 0
+                    quote = conn.dialect.identifier_preparer.quote
+                    count_query = " UNION ALL ".join(
+                        f"SELECT :name_{index} AS name, COUNT(*) AS row_count FROM {quote(table_name)}"
+                        for index, table_name in enumerate(tables)
+                    )
+                    params = {f"name_{index}": table_name for index, table_name in enumerate(tables)}
+                    row_counts = {row.name: row.row_count for row in conn.execute(text(count_query), params)}
+            except Exception as e:
+                count_error = str(e)
 
+        table_info = []
+        for table_name in tables:
+            error = count_error
+            if error is None:
+                try:
+                    columns = [col['name'] for col in inspector.get_columns(table_name)]
+                except Exception as e:
+                    error = str(e)
+
+            if error is None:
                 table_info.append({
                     "name": table_name,
-                    "row_count": row_count,
-                    "columns": [col['name'] for col in inspector.get_columns(table_name)]
+                    "row_count": row_counts.get(table_name, 0),
+                    "columns": columns
                 })
-            except Exception as e:
+            else:
                 table_info.append({
                     "name": table_name,
-                    "error": str(e),
+                    "error": error,
                     "row_count": None,
                     "columns": []
                 })
@@ -98,7 +161,11 @@ def get_database_info() -> Dict[str, Any]:
 
 def apply_sqlite_optimizations(db_path: str) -> Dict[str, Any]:
     """
-    Apply SQLite optimization settings.
+    Apply SQLite optimization settings to a database file.
+
+    The application applies these settings to its own connections through
+    register_sqlite_pragmas; this bootstraps offline database files, where
+    the persistent WAL journal mode is the setting that outlives the call.
 
     Args:
         db_path: Path to the SQLite database file
@@ -113,18 +180,9 @@ def apply_sqlite_optimizations(db_path: str) -> Dict[str, Any]:
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
 
-        # Optimization settings from architecture requirements
-        optimizations = [
-            ("journal_mode", "WAL"),
-            ("synchronous", "NORMAL"),
-            ("cache_size", "10000"),
-            ("temp_store", "memory"),
-            ("mmap_size", "268435456")  # 256MB
-        ]
-
         results = {}
 
-        for setting, value in optimizations:
+        for setting, value in SQLITE_PRAGMAS:
             try:
                 pragma_cmd = f"PRAGMA {setting} = {value};"
                 cursor.execute(pragma_cmd)
@@ -215,6 +273,14 @@ def safe_execute_query(query: str, params: Optional[Dict[str, Any]] = None) -> T
         return False, error_msg
 
 
+def _table_exists(conn, table_name: str) -> bool:
+    """Check for a table on an open connection without reflecting the schema."""
+    if conn.dialect.name == 'sqlite':
+        query = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name LIMIT 1")
+        return conn.execute(query, {'name': table_name}).first() is not None
+    return db.inspect(conn).has_table(table_name)
+
+
 def check_table_exists(table_name: str) -> bool:
     """
     Check if a table exists in the database.
@@ -226,9 +292,8 @@ def check_table_exists(table_name: str) -> bool:
         True if table exists, False otherwise
     """
     try:
-        inspector = db.inspect(db.engine)
-        tables = inspector.get_table_names()
-        return table_name in tables
+        with db.engine.connect() as conn:
+            return _table_exists(conn, table_name)
     except Exception as e:
         logger.error(f"Failed to check if table '{table_name}' exists: {e}")
         return False
@@ -244,14 +309,104 @@ def get_table_row_count(table_name: str) -> Optional[int]:
     Returns:
         Number of rows, or None if error occurred
     """
-    if not check_table_exists(table_name):
-        logger.warning(f"Table '{table_name}' does not exist")
-        return None
-
     try:
+        # Look the table up and count it on the same connection
         with db.engine.connect() as conn:
-            result = conn.execute(text(f'SELECT COUNT(*) FROM {table_name}')).fetchone()
+            if not _table_exists(conn, table_name):
+                logger.warning(f"Table '{table_name}' does not exist")
+                return None
+
+            result = conn.execute(text(f'SELECT COUNT(*) FROM "{table_name}"')).fetchone()
             return result[0] if result else 0
     except Exception as e:
         logger.error(f"Failed to get row count for table '{table_name}': {e}")
         return None
+
+
+def create_bookmark_search_index() -> bool:
+    """
+    Create and rebuild the bookmark full-text search index.
+
+    New databases get the index from ``db.create_all()``; this brings
+    databases created before the index existed up to date.
+
+    Returns:
+        True if the index is in place, False otherwise
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return False
+
+    from app.models.bookmark import BOOKMARK_FTS_DDL
+
+    try:
+        with db.engine.begin() as conn:
+            for statement in BOOKMARK_FTS_DDL:
+                conn.execute(text(statement))
+            conn.execute(text("INSERT INTO bookmark_fts(bookmark_fts) VALUES ('rebuild')"))
+        logger.info("Bookmark search index created")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to create bookmark search index: {e}")
+        return False
+
+
+def create_title_search_index() -> bool:
+    """
+    Create and rebuild the movie title full-text search index.
+
+    New databases get the index from ``db.create_all()``; this brings
+    databases created before the index existed up to date.
+
+    Returns:
+        True if the index is in place, False otherwise
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return False
+
+    from app.models.subtitle import SUB_TITLE_FTS_DDL
+
+    try:
+        with db.engine.begin() as conn:
+            for statement in SUB_TITLE_FTS_DDL:
+                conn.execute(text(statement))
+            conn.execute(text("INSERT INTO sub_title_fts(sub_title_fts) VALUES ('rebuild')"))
+        logger.info("Title search index created")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to create title search index: {e}")
+        return False
+
+
+def backfill_sub_link_alignments() -> int:
+    """
+    Populate sub_link_alignments for links that have none yet.
+
+    Alignment rows are kept in sync when SubLinkLine rows are saved
+    through the ORM; this covers data loaded before the table existed
+    or imported directly into sub_link_lines.
+
+    Returns:
+        Number of alignment rows inserted
+    """
+    from app.models.subtitle import SubLinkAlignment, SubLinkLine
+
+    alignments = SubLinkAlignment.__table__
+    missing = db.session.query(SubLinkLine.sub_link_id, SubLinkLine.link_data).filter(
+        ~db.session.query(alignments.c.sub_link_id).filter(
+            alignments.c.sub_link_id == SubLinkLine.sub_link_id
+        ).exists()
+    )
+
+    inserted = 0
+    try:
+        for sub_link_id, link_data in missing.all():
+            rows = SubLinkAlignment.rows_from_link_data(sub_link_id, link_data)
+            if rows:
+                db.session.execute(alignments.insert(), rows)
+                inserted += len(rows)
+        db.session.commit()
+        logger.info(f"Backfilled {inserted} subtitle alignment rows")
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logger.error(f"Failed to backfill subtitle alignments: {e}")
+    return inserted
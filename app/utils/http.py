@@ -0,0 +1,38 @@
+"""Outbound HTTP connection pooling shared by short-lived sessions."""
+import os
+
+from requests.adapters import HTTPAdapter
+
+
+class SharedHTTPAdapter(HTTPAdapter):
+    """HTTP adapter whose connection pool outlives the sessions it is mounted on."""
+
+    def close(self) -> None:
+        """Keep pooled connections open when a session using the adapter closes."""
+
+    def reset(self) -> None:
+        """Drop pooled connections so they are never shared across processes."""
+        super().close()
+
+
+# Global adapter instance
+http_adapter = SharedHTTPAdapter(pool_connections=8, pool_maxsize=32)
+
+# A forked worker must not reuse sockets its parent opened
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=http_adapter.reset)
+
+
+def mount_shared_pool(session) -> None:
+    """
+    Route a requests session through the shared connection pool.
+
+    Authlib creates a new session for every token exchange and API call;
+    mounting the shared adapter lets them reuse kept-alive connections
+    instead of paying a TCP and TLS handshake each time.
+
+    Args:
+        session: requests.Session to mount the shared adapter on
+    """
+    session.mount('https://', http_adapter)
+    session.mount('http://', http_adapter)
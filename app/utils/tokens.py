@@ -0,0 +1,72 @@
+"""Random token generation, optionally backed by a shared entropy pool."""
+import base64
+import os
+import secrets
+from threading import Lock
+from flask import current_app, has_app_context
+
+
+class EntropyPool:
+    """Thread-safe buffer of OS randomness handed out in slices."""
+
+    def __init__(self, refill_size: int = 4096):
+        """
+        Initialize the entropy pool.
+
+        Args:
+            refill_size: Bytes drawn from the OS per refill (default: 4096)
+        """
+        self.refill_size = refill_size
+        self._buffer = bytearray()
+        self._lock = Lock()
+
+    def take(self, nbytes: int) -> bytes:
+        """
+        Remove and return random bytes from the pool.
+
+        Every byte is handed out exactly once; the pool refills from
+        os.urandom when it runs low.
+
+        Args:
+            nbytes: Number of random bytes to return
+
+        Returns:
+            bytes: nbytes of random data
+        """
+        with self._lock:
+            if len(self._buffer) < nbytes:
+                self._buffer += os.urandom(max(self.refill_size, nbytes))
+            chunk = bytes(self._buffer[:nbytes])
+            del self._buffer[:nbytes]
+        return chunk
+
+    def reset(self) -> None:
+        """Discard buffered bytes so they are never shared across processes."""
+        self._buffer = bytearray()
+        self._lock = Lock()
+
+
+# Global entropy pool instance
+entropy_pool = EntropyPool()
+
+# A forked worker must not reuse bytes its parent or siblings may also hand out
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=entropy_pool.reset)
+
+
+def token_urlsafe(nbytes: int = 32) -> str:
+    """
+    Return a URL-safe text token, like secrets.token_urlsafe.
+
+    Tokens come from the shared entropy pool only when the app enables
+    TOKEN_POOL_ENABLED; otherwise secrets.token_urlsafe is used.
+
+    Args:
+        nbytes: Number of random bytes in the token (default: 32)
+
+    Returns:
+        str: Base64url encoded token without padding
+    """
+    if not (has_app_context() and current_app.config.get('TOKEN_POOL_ENABLED', False)):
+        return secrets.token_urlsafe(nbytes)
+    return base64.urlsafe_b64encode(entropy_pool.take(nbytes)).rstrip(b'=').decode('ascii')
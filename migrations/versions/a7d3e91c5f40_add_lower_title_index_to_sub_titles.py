@@ -0,0 +1,24 @@
+"""Add lower(title) index to sub_titles
+
+Revision ID: a7d3e91c5f40
+Revises: f2b6d8e4a137
+Create Date: 2026-10-17 11:58:03.126874
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e91c5f40'
+down_revision = 'f2b6d8e4a137'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('idx_sub_titles_title_lower', 'sub_titles', [sa.text('lower(title)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('idx_sub_titles_title_lower', table_name='sub_titles')
@@ -0,0 +1,61 @@
+"""Add full-text search index over bookmark notes
+
+Revision ID: b1e7c4f9a2d3
+Revises: e8f1a6c3d952
+Create Date: 2026-10-17 19:12:36.408215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b1e7c4f9a2d3'
+down_revision = 'e8f1a6c3d952'
+branch_labels = None
+depends_on = None
+
+
+BOOKMARK_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS bookmark_fts USING fts5(
+        note, content='bookmarks', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bookmarks_fts_insert AFTER INSERT ON bookmarks BEGIN
+        INSERT INTO bookmark_fts(rowid, note) VALUES (new.id, new.note);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bookmarks_fts_delete AFTER DELETE ON bookmarks BEGIN
+        INSERT INTO bookmark_fts(bookmark_fts, rowid, note) VALUES ('delete', old.id, old.note);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS bookmarks_fts_update AFTER UPDATE OF note ON bookmarks BEGIN
+        INSERT INTO bookmark_fts(bookmark_fts, rowid, note) VALUES ('delete', old.id, old.note);
+        INSERT INTO bookmark_fts(rowid, note) VALUES (new.id, new.note);
+    END
+    """,
+]
+
+
+def upgrade():
+    # FTS5 is SQLite only; other databases keep the ILIKE note search
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for statement in BOOKMARK_FTS_DDL:
+        op.execute(statement)
+    # Index the notes of bookmarks saved before the triggers existed
+    op.execute("INSERT INTO bookmark_fts(bookmark_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for trigger in ('bookmarks_fts_update', 'bookmarks_fts_delete', 'bookmarks_fts_insert'):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS bookmark_fts')
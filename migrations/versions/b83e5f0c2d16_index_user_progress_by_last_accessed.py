@@ -0,0 +1,26 @@
+"""Index user progress by last_accessed
+
+Revision ID: b83e5f0c2d16
+Revises: a7d3e91c5f40
+Create Date: 2026-10-17 13:08:44.519327
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b83e5f0c2d16'
+down_revision = 'a7d3e91c5f40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_progress', schema=None) as batch_op:
+        batch_op.create_index('idx_user_progress_user_accessed', ['user_id', 'last_accessed'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_progress', schema=None) as batch_op:
+        batch_op.drop_index('idx_user_progress_user_accessed')
@@ -0,0 +1,35 @@
+"""Index active bookmarks by created_at
+
+Revision ID: c41d7e2a5f93
+Revises: 8b2f4c1e9a07
+Create Date: 2026-10-16 11:47:05.902113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d7e2a5f93'
+down_revision = '8b2f4c1e9a07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The bookmarks table is created by db.create_all() on older databases
+    if 'bookmarks' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    with op.batch_alter_table('bookmarks', schema=None) as batch_op:
+        batch_op.drop_index('idx_bookmarks_active')
+        batch_op.create_index('idx_bookmarks_active_created', ['user_id', 'is_active', 'created_at'], unique=False)
+
+
+def downgrade():
+    if 'bookmarks' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    with op.batch_alter_table('bookmarks', schema=None) as batch_op:
+        batch_op.drop_index('idx_bookmarks_active_created')
+        batch_op.create_index('idx_bookmarks_active', ['user_id', 'is_active'], unique=False)
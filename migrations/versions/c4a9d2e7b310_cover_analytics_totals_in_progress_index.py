@@ -0,0 +1,31 @@
+"""Cover analytics totals in the user progress last_accessed index
+
+Revision ID: c4a9d2e7b310
+Revises: b83e5f0c2d16
+Create Date: 2026-10-17 16:42:10.208315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a9d2e7b310'
+down_revision = 'b83e5f0c2d16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_progress', schema=None) as batch_op:
+        batch_op.create_index('idx_user_progress_user_accessed_totals',
+                              ['user_id', 'last_accessed', 'session_duration_minutes',
+                               'total_alignments_completed', 'current_alignment_index'],
+                              unique=False)
+        batch_op.drop_index('idx_user_progress_user_accessed')
+
+
+def downgrade():
+    with op.batch_alter_table('user_progress', schema=None) as batch_op:
+        batch_op.create_index('idx_user_progress_user_accessed', ['user_id', 'last_accessed'], unique=False)
+        batch_op.drop_index('idx_user_progress_user_accessed_totals')
@@ -0,0 +1,61 @@
+"""Add trigram full-text search index over movie titles
+
+Revision ID: c8d2f5a1e6b4
+Revises: b1e7c4f9a2d3
+Create Date: 2026-10-17 19:48:02.153794
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8d2f5a1e6b4'
+down_revision = 'b1e7c4f9a2d3'
+branch_labels = None
+depends_on = None
+
+
+SUB_TITLE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS sub_title_fts USING fts5(
+        title, content='sub_titles', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sub_titles_fts_insert AFTER INSERT ON sub_titles BEGIN
+        INSERT INTO sub_title_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sub_titles_fts_delete AFTER DELETE ON sub_titles BEGIN
+        INSERT INTO sub_title_fts(sub_title_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sub_titles_fts_update AFTER UPDATE OF title ON sub_titles BEGIN
+        INSERT INTO sub_title_fts(sub_title_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        INSERT INTO sub_title_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+]
+
+
+def upgrade():
+    # FTS5 is SQLite only; other databases keep the LIKE title search
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for statement in SUB_TITLE_FTS_DDL:
+        op.execute(statement)
+    # Index the titles imported before the triggers existed
+    op.execute("INSERT INTO sub_title_fts(sub_title_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for trigger in ('sub_titles_fts_update', 'sub_titles_fts_delete', 'sub_titles_fts_insert'):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS sub_title_fts')
@@ -0,0 +1,24 @@
+"""Index sub_lines by movie, language and sequence
+
+Revision ID: e8f1a6c3d952
+Revises: c4a9d2e7b310
+Create Date: 2026-10-17 18:05:44.671920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8f1a6c3d952'
+down_revision = 'c4a9d2e7b310'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_sublines_mls', 'sub_lines', ['movie_id', 'language_id', 'sequence'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_sublines_mls', table_name='sub_lines')
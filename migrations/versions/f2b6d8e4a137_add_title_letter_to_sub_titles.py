@@ -0,0 +1,40 @@
+"""Add generated title_letter column to sub_titles
+
+Revision ID: f2b6d8e4a137
+Revises: e5a9c3d71b28
+Create Date: 2026-10-17 10:42:18.337051
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b6d8e4a137'
+down_revision = 'e5a9c3d71b28'
+branch_labels = None
+depends_on = None
+
+
+TITLE_LETTER_SQL = (
+    "CASE WHEN substr(title, 1, 1) BETWEEN '0' AND '9' THEN '#' "
+    "ELSE upper(substr(title, 1, 1)) END"
+)
+
+
+def upgrade():
+    # SQLite can only add VIRTUAL generated columns with ALTER TABLE; they
+    # are still indexable, so the index serves the letter queries either way
+    persisted = op.get_bind().dialect.name != 'sqlite'
+
+    op.add_column('sub_titles', sa.Column(
+        'title_letter', sa.String(length=1),
+        sa.Computed(TITLE_LETTER_SQL, persisted=persisted)
+    ))
+    op.create_index('idx_sub_titles_title_letter', 'sub_titles', ['title_letter'], unique=False)
+
+
+def downgrade():
+    op.drop_index('idx_sub_titles_title_letter', table_name='sub_titles')
+    with op.batch_alter_table('sub_titles', schema=None) as batch_op:
+        batch_op.drop_column('title_letter')
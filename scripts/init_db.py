@@ -8,6 +8,9 @@ This script:
 """
 from app.models import User, Language
 from app import create_app, db
+from app.utils.database import (
+    backfill_sub_link_alignments, create_bookmark_search_index, create_title_search_index
+)
 import os
 import sys
 from pathlib import Path
@@ -188,6 +191,13 @@ def main():
         print("Creating database tables...")
         db.create_all()
 
+        # Make sure databases created before the search indexes existed have them
+        create_bookmark_search_index()
+        create_title_search_index()
+
+        # Split existing link_data arrays into per-alignment rows
+        backfill_sub_link_alignments()
+
         # Get database path for optimization
         db_uri = app.config['SQLALCHEMY_DATABASE_URI']
         if db_uri.startswith('sqlite:///'):
@@ -1,8 +1,12 @@
 """Pytest configuration and fixtures."""
+import contextlib
 import pytest
+from sqlalchemy import event
 from app import create_app
 from app import db as database
 from app.models.user import User
+from app.services.progress_service import progress_write_buffer
+from app.utils.cache import alignment_total_cache, analytics_cache, code_exchange_cache, id_token_cache, letter_count_cache, movie_list_cache
 from flask_login import login_user
 
 
@@ -19,6 +23,13 @@ def app():
 
     with app.app_context():
         database.create_all()
+        movie_list_cache.clear()
+        letter_count_cache.clear()
+        id_token_cache.clear()
+        code_exchange_cache.clear()
+        analytics_cache.clear()
+        alignment_total_cache.clear()
+        progress_write_buffer.clear()
         
         # Add sample data for testing
         from app.models import Language, SubTitle, SubLink
@@ -80,6 +91,31 @@ def db(app):
     return database
 
 
+@pytest.fixture
+def count_queries(app):
+    """
+    Record the SQL statements the engine executes inside a with block.
+
+    Usage: ``with count_queries() as statements: ...``; statements is the
+    list of SQL strings sent to the database while the block ran.
+    """
+    @contextlib.contextmanager
+    def counting():
+        statements = []
+
+        def record_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = database.engine
+        event.listen(engine, 'before_cursor_execute', record_statement)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record_statement)
+
+    return counting
+
+
 @pytest.fixture
 def auth_user(app, client):
     """Create and authenticate a test user."""
@@ -1,5 +1,6 @@
 """Test Flask app factory."""
-from app import create_app
+import importlib
+from app import config, create_app
 
 
 def test_config():
@@ -12,8 +13,30 @@ def test_config():
     assert create_app(test_config).testing
 
 
+def test_sqlite_engine_options(monkeypatch):
+    """Test SQLite URLs get no pool sizing options."""
+    monkeypatch.setenv('DATABASE_URL', 'sqlite:///:memory:')
+    try:
+        options = importlib.reload(config).Config.SQLALCHEMY_ENGINE_OPTIONS
+        assert options == {'pool_pre_ping': True}
+
+        monkeypatch.setenv('DATABASE_URL', 'postgresql://localhost/subtitles')
+        options = importlib.reload(config).Config.SQLALCHEMY_ENGINE_OPTIONS
+        assert options['pool_size'] == 10
+        assert options['pool_recycle'] == 3600
+    finally:
+        monkeypatch.undo()
+        importlib.reload(config)
+
+
 def test_app_creation():
     """Test Flask app creation."""
     app = create_app()
     assert app is not None
     assert app.config['SECRET_KEY'] is not None
+
+
+def test_oauth_clients_materialized(app):
+    """Test provider clients are looked up once when the app is created."""
+    assert set(app.extensions['oauth_clients']) == {'google', 'facebook', 'apple'}
+    assert all(client is not None for client in app.extensions['oauth_clients'].values())
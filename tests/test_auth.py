@@ -2,7 +2,14 @@
 import pytest
 from flask import url_for
 from app.models import User
-from app.services.auth_service import AuthService, AuthenticationError
+from app.services.auth_service import AuthService, AuthenticationError, normalize_email
+
+
+def test_normalize_email_is_idempotent():
+    """Test email normalization trims, lowercases and can be reapplied."""
+    assert normalize_email('  User@Example.COM ') == 'user@example.com'
+    assert normalize_email(normalize_email(' A@B.io')) == 'a@b.io'
+    assert normalize_email(None) is None
 
 
 class TestAuthService:
@@ -73,6 +80,26 @@ class TestAuthService:
             with pytest.raises(AuthenticationError, match='Invalid email or password'):
                 AuthService.authenticate_user('nonexistent@example.com', 'password')
     
+    def test_authenticate_user_invalid_email_checks_dummy_hash(self, app, db, monkeypatch):
+        """Test unknown emails still pay for a password verification, off the event loop."""
+        from app.services import auth_service
+
+        calls = []
+        real_run = auth_service._run_password_hashing
+
+        def recording_run(func, *args):
+            calls.append((func, args))
+            return real_run(func, *args)
+
+        monkeypatch.setattr(auth_service, '_run_password_hashing', recording_run)
+        with app.app_context():
+            with pytest.raises(AuthenticationError, match='Invalid email or password'):
+                AuthService.authenticate_user('nonexistent@example.com', 'password')
+
+        assert calls == [
+            (auth_service.check_password_hash, (auth_service.DUMMY_PASSWORD_HASH, 'password'))
+        ]
+    
     def test_authenticate_user_invalid_password(self, app, db):
         """Test authentication with invalid password fails."""
         with app.app_context():
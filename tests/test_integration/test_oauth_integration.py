@@ -1,4 +1,5 @@
 """Integration tests for complete OAuth flow."""
+import json
 import pytest
 from unittest.mock import patch, Mock
 from app.models.user import User
@@ -13,9 +14,9 @@ class TestOAuthIntegration:
         """Test complete Google OAuth flow for new user registration."""
         with app.app_context():
             # Step 1: Initiate OAuth flow
-            with patch('app.services.oauth_service.oauth') as mock_oauth:
+            with patch('app.services.oauth_service._oauth_client') as mock_oauth:
                 mock_client = Mock()
-                mock_oauth.create_client.return_value = mock_client
+                mock_oauth.return_value = mock_client
                 mock_client.create_authorization_url.return_value = {
                     'url': 'https://accounts.google.com/oauth/authorize?client_id=test'
                 }
@@ -28,14 +29,13 @@ class TestOAuthIntegration:
                 
                 # Verify session state was set
                 with client.session_transaction() as sess:
-                    assert 'oauth_state' in sess
-                    assert sess['oauth_provider'] == 'google'
-                    stored_state = sess['oauth_state']
+                    provider, _, stored_state = sess['oauth'].partition(':')
+                    assert provider == 'google'
 
             # Step 2: Mock OAuth callback with user creation
             with patch.multiple(
                 'app.services.oauth_service',
-                oauth=Mock(),
+                _oauth_client=Mock(),
                 current_app=Mock()
             ) as mocks:
                 # Setup OAuth client mock for token exchange
@@ -53,12 +53,11 @@ class TestOAuthIntegration:
                     'family_name': 'User',
                     'picture': 'https://example.com/avatar.jpg'
                 }
-                mocks['oauth'].create_client.return_value = mock_client
+                mocks['_oauth_client'].return_value = mock_client
                 
                 # Simulate successful OAuth callback
                 with client.session_transaction() as sess:
-                    sess['oauth_state'] = stored_state
-                    sess['oauth_provider'] = 'google'
+                    sess['oauth'] = f"google:{stored_state}"
                 
                 response = client.get(
                     f'/auth/oauth/google/callback?code=test_auth_code&state={stored_state}',
@@ -86,9 +85,9 @@ class TestOAuthIntegration:
             existing_id = existing_user.id
             
             # Step 1: Initiate Facebook OAuth
-            with patch('app.services.oauth_service.oauth') as mock_oauth:
+            with patch('app.services.oauth_service._oauth_client') as mock_oauth:
                 mock_client = Mock()
-                mock_oauth.create_client.return_value = mock_client
+                mock_oauth.return_value = mock_client
                 mock_client.create_authorization_url.return_value = {
                     'url': 'https://www.facebook.com/v18.0/dialog/oauth?client_id=test'
                 }
@@ -97,12 +96,12 @@ class TestOAuthIntegration:
                 assert response.status_code == 302
                 
                 with client.session_transaction() as sess:
-                    stored_state = sess['oauth_state']
+                    stored_state = sess['oauth'].partition(':')[2]
 
             # Step 2: Complete OAuth callback with account linking
             with patch.multiple(
                 'app.services.oauth_service',
-                oauth=Mock(),
+                _oauth_client=Mock(),
                 current_app=Mock()
             ) as mocks:
                 mock_client = Mock()
@@ -112,20 +111,19 @@ class TestOAuthIntegration:
                 # Mock Facebook API response
                 mock_response = Mock()
                 mock_response.status_code = 200
-                mock_response.json.return_value = {
+                mock_response.content = json.dumps({
                     'id': 'facebook_user_67890',
                     'email': 'existing@example.com',
                     'name': 'Existing User',
                     'first_name': 'Existing',
                     'last_name': 'User',
                     'picture': {'data': {'url': 'https://example.com/fb_avatar.jpg'}}
-                }
+                }).encode()
                 mock_client.get.return_value = mock_response
-                mocks['oauth'].create_client.return_value = mock_client
+                mocks['_oauth_client'].return_value = mock_client
                 
                 with client.session_transaction() as sess:
-                    sess['oauth_state'] = stored_state
-                    sess['oauth_provider'] = 'facebook'
+                    sess['oauth'] = f"facebook:{stored_state}"
                 
                 response = client.get(
                     f'/auth/oauth/facebook/callback?code=fb_auth_code&state={stored_state}',
@@ -171,9 +169,9 @@ class TestOAuthIntegration:
         """Test OAuth session data is properly cleaned up."""
         with app.app_context():
             # Initiate OAuth to set session data
-            with patch('app.services.oauth_service.oauth') as mock_oauth:
+            with patch('app.services.oauth_service._oauth_client') as mock_oauth:
                 mock_client = Mock()
-                mock_oauth.create_client.return_value = mock_client
+                mock_oauth.return_value = mock_client
                 mock_client.create_authorization_url.return_value = {
                     'url': 'https://accounts.google.com/oauth/authorize'
                 }
@@ -182,8 +180,7 @@ class TestOAuthIntegration:
                 
                 # Verify session data is set
                 with client.session_transaction() as sess:
-                    assert 'oauth_state' in sess
-                    assert 'oauth_provider' in sess
+                    assert sess['oauth'].startswith('google:')
 
             # Complete OAuth callback (with failure to trigger cleanup)
             response = client.get(
@@ -193,8 +190,7 @@ class TestOAuthIntegration:
             
             # Verify session data is cleaned up
             with client.session_transaction() as sess:
-                assert 'oauth_state' not in sess
-                assert 'oauth_provider' not in sess
+                assert 'oauth' not in sess
 
     def test_oauth_duplicate_provider_prevention(self, app, client):
         """Test prevention of duplicate OAuth accounts for same provider."""
@@ -223,9 +219,9 @@ class TestOAuthIntegration:
         """Test provider-specific OAuth configuration differences."""
         with app.app_context():
             # Test Apple Sign-In specific configuration
-            with patch('app.services.oauth_service.oauth') as mock_oauth:
+            with patch('app.services.oauth_service._oauth_client') as mock_oauth:
                 mock_client = Mock()
-                mock_oauth.create_client.return_value = mock_client
+                mock_oauth.return_value = mock_client
                 mock_client.create_authorization_url.return_value = {
                     'url': 'https://appleid.apple.com/auth/authorize'
                 }
@@ -243,7 +239,7 @@ class TestOAuthIntegration:
         with app.app_context():
             with patch.multiple(
                 'app.services.oauth_service',
-                oauth=Mock(),
+                _oauth_client=Mock(),
                 current_app=Mock()
             ) as mocks:
                 # Setup mock for successful token exchange
@@ -258,7 +254,7 @@ class TestOAuthIntegration:
                     'sub': 'user_123',
                     'email': 'secure@example.com'
                 }
-                mocks['oauth'].create_client.return_value = mock_client
+                mocks['_oauth_client'].return_value = mock_client
                 
                 # Test token handling doesn't store sensitive data in user model
                 user_info = OAuthService.get_user_info('google', 'auth_code', 'callback_uri')
@@ -295,9 +291,9 @@ class TestOAuthIntegration:
     def test_oauth_api_endpoint_integration(self, app, client):
         """Test OAuth API endpoints for AJAX integration."""
         with app.app_context():
-            with patch('app.services.oauth_service.oauth') as mock_oauth:
+            with patch('app.services.oauth_service._oauth_client') as mock_oauth:
                 mock_client = Mock()
-                mock_oauth.create_client.return_value = mock_client
+                mock_oauth.return_value = mock_client
                 mock_client.create_authorization_url.return_value = {
                     'url': 'https://accounts.google.com/oauth/authorize?test=1'
                 }
@@ -178,4 +178,48 @@ class TestAuthServiceDetailed:
                 # Test deactivation logging
                 user = User.query.filter_by(email='test@example.com').first()
                 AuthService.deactivate_user(user.id)
-                mock_logger.info.assert_called_with('User deactivated: test@example.com')
\ No newline at end of file
+                mock_logger.info.assert_called_with('User deactivated: test@example.com')
+    
+    def test_authenticate_user_sees_password_reset_after_login(self, app, db):
+        """Test a password reset applies to the next login."""
+        with app.app_context():
+            AuthService.register_user('cached@example.com', 'OldPassword123')
+            AuthService.authenticate_user('cached@example.com', 'OldPassword123')
+            
+            AuthService.reset_password('cached@example.com', 'NewPassword123')
+            db.session.remove()
+            
+            with pytest.raises(AuthenticationError, match='Invalid email or password'):
+                AuthService.authenticate_user('cached@example.com', 'OldPassword123')
+            assert AuthService.authenticate_user('cached@example.com', 'NewPassword123').email == 'cached@example.com'
+    
+    def test_authenticate_user_sees_writes_from_other_workers(self, app, db):
+        """Test password and active status changes made outside this process apply at once."""
+        from sqlalchemy import text
+        from werkzeug.security import generate_password_hash
+        
+        with app.app_context():
+            user = AuthService.register_user('shared@example.com', 'OldPassword123')
+            user_id = user.id
+            AuthService.authenticate_user('shared@example.com', 'OldPassword123')
+            assert db.session.get(User, user_id).is_active
+            
+            # Raw SQL stands in for a write handled by another worker
+            db.session.execute(
+                text("UPDATE users SET password_hash = :password_hash, is_active = 0 WHERE id = :user_id"),
+                {'password_hash': generate_password_hash('NewPassword123'), 'user_id': user_id}
+            )
+            db.session.commit()
+            db.session.remove()
+            
+            assert db.session.get(User, user_id).is_active is False
+            with pytest.raises(AuthenticationError, match='Account is deactivated'):
+                AuthService.authenticate_user('shared@example.com', 'OldPassword123')
+            
+            db.session.execute(text("UPDATE users SET is_active = 1 WHERE id = :user_id"), {'user_id': user_id})
+            db.session.commit()
+            db.session.remove()
+            
+            with pytest.raises(AuthenticationError, match='Invalid email or password'):
+                AuthService.authenticate_user('shared@example.com', 'OldPassword123')
+            assert AuthService.authenticate_user('shared@example.com', 'NewPassword123').id == user_id
@@ -450,4 +450,88 @@ def test_enrich_bookmark_data(sample_data):
     assert bookmark_data['from_language'] == 'English'
     assert 'to_language' in bookmark_data
     assert bookmark_data['to_language'] == 'Spanish'
-    assert 'content_preview' in bookmark_data
\ No newline at end of file
+    assert 'content_preview' in bookmark_data
+
+
+def test_get_user_bookmarks_enriches_in_constant_queries(app, sample_data, count_queries):
+    """Test bookmark listing enrichment does not issue per-bookmark queries."""
+    for alignment_index in range(3):
+        BookmarkService.create_bookmark(user_id=1, sub_link_id=1, alignment_index=alignment_index)
+    db.session.expunge_all()
+
+    with count_queries() as statements:
+        result = BookmarkService.get_user_bookmarks(user_id=1)
+
+    assert len(result['bookmarks']) == 3
+    for bookmark in result['bookmarks']:
+        assert bookmark['movie_title'] == 'Test Movie 1'
+        assert bookmark['to_language'] == 'Spanish'
+        assert bookmark['content_preview'] == 'Hello world | Hola mundo'
+    # count + bookmarks + bookmarked alignments + preview lines
+    assert len(statements) == 4
+
+
+def test_alignment_rows_follow_link_data_updates(app, sample_data):
+    """Test alignment rows are rewritten when SubLinkLine changes."""
+    from app.models.subtitle import SubLinkAlignment
+
+    alignment = db.session.get(SubLinkAlignment, (1, 2))
+    assert alignment is not None
+
+    sub_link_line = db.session.get(SubLinkLine, 1)
+    sub_link_line.link_data = [[[101], [102]]]
+    db.session.commit()
+    db.session.expire_all()
+
+    assert db.session.get(SubLinkAlignment, (1, 0)).source_line_ids == [101]
+    assert db.session.get(SubLinkAlignment, (1, 2)) is None
+    with pytest.raises(BookmarkServiceError, match=r"exceeds available alignments \(1\)"):
+        BookmarkService.create_bookmark(user_id=1, sub_link_id=1, alignment_index=2)
+
+
+def test_search_bookmarks_uses_full_text_index(app, sample_data):
+    """Test note search matches indexed terms and follows note edits."""
+    BookmarkService.create_bookmark(user_id=1, sub_link_id=1, alignment_index=0, note='Grammar "tricky" AND')
+    BookmarkService.create_bookmark(user_id=1, sub_link_id=1, alignment_index=1, note='Vocabulary')
+
+    results = BookmarkService.search_bookmarks(user_id=1, search_query='gramm')
+    assert [result['note'] for result in results] == ['Grammar "tricky" AND']
+    assert results[0]['search_highlight'] == 'note'
+
+    # FTS5 operators and quotes in user input are treated as plain terms
+    assert len(BookmarkService.search_bookmarks(user_id=1, search_query='"tricky AND')) == 1
+
+    bookmark = Bookmark.query.filter_by(note='Vocabulary').first()
+    bookmark.note = 'Idioms'
+    db.session.commit()
+
+    assert BookmarkService.get_user_bookmarks(user_id=1, search_query='vocabulary')['total_count'] == 0
+    assert BookmarkService.get_user_bookmarks(user_id=1, search_query='idioms')['total_count'] == 1
+
+
+def test_iter_export_bookmarks_streams_in_batches(app, sample_data, monkeypatch):
+    """Test the streamed export matches the full export across batch boundaries."""
+    from app.services import bookmark_service
+
+    for alignment_index in range(3):
+        BookmarkService.create_bookmark(user_id=1, sub_link_id=1, alignment_index=alignment_index)
+
+    monkeypatch.setattr(bookmark_service, 'EXPORT_BATCH_SIZE', 2)
+    chunks = list(BookmarkService.iter_export_bookmarks(1))
+
+    assert chunks[0] == bookmark_service.EXPORT_HEADER
+    assert len(chunks) == 4
+    assert "".join(chunks) == BookmarkService.export_bookmarks(1)
+
+
+def test_create_bookmark_relies_on_unique_constraint_for_duplicates(app, sample_data, count_queries):
+    """Test creation does one lookup before inserting and still rejects duplicates."""
+    with count_queries() as statements:
+        BookmarkService.create_bookmark(user_id=1, sub_link_id=1, alignment_index=0)
+
+    # alignment lookup, then the insert
+    assert [statement.lstrip().split()[0].upper() for statement in statements[:2]] == ['SELECT', 'INSERT']
+
+    BookmarkService.delete_bookmark(user_id=1, bookmark_id=1)
+    with pytest.raises(BookmarkServiceError, match="Bookmark already exists for this alignment"):
+        BookmarkService.create_bookmark(user_id=1, sub_link_id=1, alignment_index=0)
@@ -1,7 +1,10 @@
 """Tests for content service functionality."""
 import pytest
-from app.services.content_service import ContentService
+from unittest.mock import patch
+from sqlalchemy import text
+from app.services.content_service import AVAILABLE_MOVIES_VARIANTS, ContentService
 from app.models import SubTitle, SubLink, Language
+from app.models.subtitle import SubLine
 from app import db
 
 
@@ -22,7 +25,6 @@ class TestContentService:
             for movie in movies:
                 assert 'id' in movie
                 assert 'title' in movie
-                assert 'subtitle_links_count' in movie
                 assert 'has_subtitles' in movie
                 assert movie['has_subtitles'] is True
 
@@ -51,6 +53,116 @@ class TestContentService:
             with pytest.raises(ValueError, match="Native and target languages must be different"):
                 ContentService.get_available_movies(1, 1)
 
+    def test_get_available_movies_lists_each_linked_movie_once(self, app):
+        """Test movies are found on either side of a link in both directions."""
+        with app.app_context():
+            # Spanish -> English link between two different movies
+            db.session.add(SubLink(id=6, fromid=5, fromlang=2, toid=2, tolang=1))
+            db.session.commit()
+
+            movie_ids = [movie['id'] for movie in ContentService.get_available_movies(1, 2)]
+
+            # Casablanca is only reachable as the source of an ES -> EN link
+            assert 5 in movie_ids
+            # Inception has two links and The Matrix links to itself; each is listed once
+            assert {1, 2} <= set(movie_ids)
+            assert len(movie_ids) == len(set(movie_ids))
+
+    def test_get_available_movies_cached_until_links_change(self, app):
+        """Test listings are shared across pair order and dropped on new links."""
+        with app.app_context():
+            first = ContentService.get_available_movies(1, 2)
+
+            with patch.object(db.session, 'execute') as mock_execute:
+                assert ContentService.get_available_movies(2, 1) == first
+                mock_execute.assert_not_called()
+
+            db.session.add(SubLink(id=6, fromid=5, fromlang=2, toid=5, tolang=1))
+            db.session.commit()
+
+            titles = [movie['title'] for movie in ContentService.get_available_movies(1, 2)]
+            assert 'Casablanca' in titles
+
+    def test_get_letter_counts_cached_until_movies_change(self, app):
+        """Test letter counts are served from cache and refreshed on new movies."""
+        with app.app_context():
+            counts = ContentService.get_letter_counts(1, 2)
+
+            with patch.object(db.session, 'execute') as mock_execute:
+                assert ContentService.get_letter_counts(2, 1) == counts
+                mock_execute.assert_not_called()
+
+            db.session.add(SubTitle(id=6, title='Amelie'))
+            db.session.add(SubLink(id=6, fromid=6, fromlang=1, toid=6, tolang=2))
+            db.session.commit()
+
+            assert ContentService.get_letter_counts(1, 2)['A'] == counts.get('A', 0) + 1
+
+    def test_title_letter_groups_digits_under_hash(self, app):
+        """Test the generated title letter drives letter filters and counts."""
+        with app.app_context():
+            db.session.add(SubTitle(id=6, title='2001: A Space Odyssey'))
+            db.session.add(SubLink(id=6, fromid=6, fromlang=1, toid=6, tolang=2))
+            db.session.commit()
+
+            assert db.session.get(SubTitle, 6).title_letter == '#'
+            assert db.session.get(SubTitle, 2).title_letter == 'I'
+
+            movies = ContentService.get_available_movies(1, 2, letter_filter='#')
+            assert [movie['id'] for movie in movies] == [6]
+            assert ContentService.get_letter_counts(1, 2)['#'] == 1
+
+    def test_get_available_movies_reuses_prebuilt_statements(self, app):
+        """Test filter values are only bound into statements built at import."""
+        with app.app_context():
+            with patch.object(db.session, 'execute', wraps=db.session.execute) as mock_execute:
+                ContentService.get_available_movies(1, 2, letter_filter='t')
+                ContentService.get_available_movies(1, 2, letter_filter='M')
+
+            first, second = (call.args for call in mock_execute.call_args_list)
+            assert first[0] is second[0]
+            assert any(first[0] is statement for statement in AVAILABLE_MOVIES_VARIANTS.values())
+            assert (first[1]['letter_filter'], second[1]['letter_filter']) == ('T', 'M')
+
+    def test_get_available_movies_prefix_search(self, app):
+        """Test prefix search only matches title starts, case-insensitively."""
+        with app.app_context():
+            prefix = ContentService.get_available_movies(1, 2, search_query='the MAT', search_mode='prefix')
+            contains = ContentService.get_available_movies(1, 2, search_query='matrix')
+
+            assert [movie['title'] for movie in prefix] == ['The Matrix']
+            assert ContentService.get_available_movies(1, 2, search_query='matrix', search_mode='prefix') == []
+            assert [movie['title'] for movie in contains] == ['The Matrix']
+            assert ContentService.get_letter_counts(1, 2, search_query='inc', search_mode='prefix') == {'I': 1}
+
+            with pytest.raises(ValueError, match="Search mode"):
+                ContentService.get_available_movies(1, 2, search_query='the', search_mode='regex')
+
+    def test_contains_search_uses_title_index(self, app):
+        """Test substring searches go through the trigram index and follow title changes."""
+        with app.app_context():
+            movie = db.session.get(SubTitle, 1)
+            movie.title = 'The "Matrix" Reloaded'
+            db.session.commit()
+
+            titles = [movie['title'] for movie in ContentService.get_available_movies(1, 2, search_query='"MATRIX"')]
+            assert titles == ['The "Matrix" Reloaded']
+            assert ContentService.get_available_movies(1, 2, search_query='the matrix') == []
+            assert ContentService.get_letter_counts(1, 2, search_query='reload') == {'T': 1}
+            # Too short for a trigram, served by LIKE instead
+            assert [movie['id'] for movie in ContentService.get_available_movies(1, 2, search_query='"m')] == [1]
+
+    def test_iter_available_movies_matches_listing(self, app):
+        """Test streamed movies match the listing and validate before iterating."""
+        with app.app_context():
+            streamed = ContentService.iter_available_movies(2, 1, letter_filter='i')
+
+            assert list(streamed) == ContentService.get_available_movies(2, 1, letter_filter='i')
+            assert next(ContentService.iter_available_movies(1, 2))['title'] == ContentService.get_available_movies(1, 2)[0]['title']
+
+            with pytest.raises(ValueError, match="Letter filter"):
+                ContentService.iter_available_movies(1, 2, letter_filter='1')
+
     def test_get_movie_subtitle_info_valid_movie(self, app):
         """Test getting subtitle info for a valid movie and language pair."""
         with app.app_context():
@@ -64,6 +176,34 @@ class TestContentService:
             assert 'from_language' in info
             assert 'to_language' in info
 
+    def test_get_movie_subtitle_info_bulk(self, app):
+        """Test subtitle info for several movies comes back keyed by movie ID."""
+        with app.app_context():
+            info = ContentService.get_movie_subtitle_info_bulk([1, 2, 4, 999], 1, 2)
+
+            # Godfather only has an EN -> IT link, 999 does not exist
+            assert set(info) == {1, 2}
+            assert info[1] == ContentService.get_movie_subtitle_info(1, 1, 2)
+            assert info[2]['sub_link_id'] == 3
+            assert ContentService.get_movie_subtitle_info_bulk([], 1, 2) == {}
+
+    def test_get_movie_subtitle_availability(self, app):
+        """Test availability lists each subtitle language once, as integers."""
+        with app.app_context():
+            db.session.add_all([
+                SubLine(movie_id=1, sequence=i, content=f'line {i}', language_id=language_id)
+                for i, language_id in enumerate([2, 1, 2, 1])
+            ])
+            db.session.commit()
+
+            availability = ContentService.get_movie_subtitle_availability(1)
+            assert availability['available_language_ids'] == [1, 2]
+            assert availability['subtitle_count'] == 2
+
+            assert ContentService.get_movie_subtitle_availability(3)['available_language_ids'] == []
+            with pytest.raises(ValueError, match="not found"):
+                ContentService.get_movie_subtitle_availability(999)
+
     def test_get_movie_subtitle_info_no_results(self, app):
         """Test getting subtitle info for movie with no available language pair."""
         with app.app_context():
@@ -84,6 +224,30 @@ class TestContentService:
             assert ContentService.validate_language_pair(999, 1000) is False
             assert ContentService.validate_language_pair(1, 999) is False
 
+    def test_validate_language_pair_short_circuits(self, app):
+        """Test missing or repeated IDs are rejected without a query."""
+        with app.app_context():
+            with patch.object(db.session, 'execute') as mock_execute:
+                assert ContentService.validate_language_pair(1, 1) is False
+                assert ContentService.validate_language_pair(0, 2) is False
+                assert ContentService.validate_language_pair(1, None) is False
+                mock_execute.assert_not_called()
+
+            assert ContentService.validate_language_pair(2, 1) is True
+
+    def test_validate_language_pair_sees_new_languages(self, app):
+        """Test language pair validation sees languages added outside the ORM."""
+        with app.app_context():
+            assert ContentService.validate_language_pair(1, 6) is False
+
+            # Raw SQL stands in for a migration or another worker
+            db.session.execute(text(
+                "INSERT INTO languages (id, name, display_name, code) VALUES (6, 'dutch', 'Dutch', 'nl')"
+            ))
+            db.session.commit()
+
+            assert ContentService.validate_language_pair(1, 6) is True
+
     def test_get_available_movies_with_search_query(self, app):
         """Test getting movies with search query filtering."""
         with app.app_context():
@@ -99,7 +263,6 @@ class TestContentService:
                 assert 'matrix' in movie['title'].lower()
                 assert 'id' in movie
                 assert 'title' in movie
-                assert 'subtitle_links_count' in movie
                 assert 'has_subtitles' in movie
 
     def test_get_available_movies_with_search_case_insensitive(self, app):
@@ -200,6 +363,17 @@ class TestContentService:
                 assert isinstance(movies, list)
                 # Results should only match literal text, not wildcard patterns
 
+    def test_short_search_matches_wildcards_literally(self, app):
+        """Test LIKE searches escape %, _ and the escape character itself."""
+        with app.app_context():
+            db.session.add(SubTitle(id=6, title='100% Wolf'))
+            db.session.add(SubLink(id=6, fromid=6, fromlang=1, toid=6, tolang=2))
+            db.session.commit()
+
+            assert [movie['id'] for movie in ContentService.get_available_movies(1, 2, search_query='%')] == [6]
+            assert ContentService.get_available_movies(1, 2, search_query='_') == []
+            assert ContentService.get_available_movies(1, 2, search_query='\\') == []
+
     def test_get_available_movies_with_letter_filter(self, app):
         """Test getting movies with letter filtering."""
         with app.app_context():
@@ -212,7 +386,6 @@ class TestContentService:
                 assert movie['title'][0].upper() == 'M'
                 assert 'id' in movie
                 assert 'title' in movie
-                assert 'subtitle_links_count' in movie
                 assert 'has_subtitles' in movie
 
     def test_get_available_movies_with_letter_filter_all(self, app):
@@ -1,4 +1,5 @@
 """Tests for OAuth service layer."""
+import json
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from app.services.oauth_service import OAuthService
@@ -20,31 +21,30 @@ class TestOAuthService:
         assert isinstance(state1, str)
         assert isinstance(state2, str)
 
-    @patch('app.services.oauth_service.oauth')
+    @patch('app.services.oauth_service._oauth_client')
     @patch('app.services.oauth_service.session')
     def test_get_authorization_url_google(self, mock_session, mock_oauth, app):
         """Test getting Google OAuth authorization URL."""
         with app.app_context():
             mock_client = Mock()
             mock_client.create_authorization_url.return_value = {'url': 'https://accounts.google.com/oauth/authorize?test=1'}
-            mock_oauth.create_client.return_value = mock_client
+            mock_oauth.return_value = mock_client
             
             redirect_uri = 'https://example.com/callback'
             auth_url, state = OAuthService.get_authorization_url('google', redirect_uri)
             
             assert 'https://accounts.google.com' in auth_url
             assert len(state) > 20
-            mock_session.__setitem__.assert_any_call('oauth_state', state)
-            mock_session.__setitem__.assert_any_call('oauth_provider', 'google')
+            mock_session.__setitem__.assert_called_once_with('oauth', f'google:{state}')
 
-    @patch('app.services.oauth_service.oauth')
+    @patch('app.services.oauth_service._oauth_client')
     @patch('app.services.oauth_service.session')
     def test_get_authorization_url_apple(self, mock_session, mock_oauth, app):
         """Test Apple OAuth authorization URL with response_mode=form_post."""
         with app.app_context():
             mock_client = Mock()
             mock_client.create_authorization_url.return_value = {'url': 'https://appleid.apple.com/auth/authorize?test=1'}
-            mock_oauth.create_client.return_value = mock_client
+            mock_oauth.return_value = mock_client
             
             redirect_uri = 'https://example.com/callback'
             auth_url, state = OAuthService.get_authorization_url('apple', redirect_uri)
@@ -67,11 +67,29 @@ class TestOAuthService:
         assert hasattr(OAuthService, 'cleanup_oauth_session')
         assert callable(OAuthService.cleanup_oauth_session)
 
-    @patch('app.services.oauth_service.oauth')
+    def test_validate_state_checks_state_and_provider(self, app):
+        """Test state validation against the session, including the provider cross-check."""
+        with app.test_request_context():
+            assert OAuthService.validate_state('some_state') is False
+            assert OAuthService.validate_state(None) is False
+
+            from flask import session
+            session['oauth'] = 'google:expected_state'
+
+            assert OAuthService.validate_state('expected_state') is True
+            assert OAuthService.validate_state('expected_state', 'google') is True
+            assert OAuthService.validate_state('expected_state', 'facebook') is False
+            assert OAuthService.validate_state('wrong_state', 'google') is False
+            assert OAuthService.validate_state(None, 'google') is False
+
+    @patch('app.services.oauth_service._oauth_client')
     @patch('app.services.oauth_service.current_app')
     def test_get_user_info_google_success(self, mock_app, mock_oauth, app):
         """Test successful Google user info retrieval."""
-        with app.app_context():
+        from flask import session
+        
+        with app.test_request_context():
+            session['oauth_nonce'] = 'test_nonce'
             mock_client = Mock()
             token = {'access_token': 'test_token', 'id_token': 'test_id_token'}
             mock_client.authorize_access_token.return_value = token
@@ -83,35 +101,128 @@ class TestOAuthService:
                 'family_name': 'User',
                 'picture': 'https://example.com/avatar.jpg'
             }
-            mock_oauth.create_client.return_value = mock_client
+            mock_oauth.return_value = mock_client
             
             result = OAuthService.get_user_info('google', 'auth_code', 'https://example.com/callback')
             
             assert result['oauth_id'] == 'google_user_123'
             assert result['email'] == 'user@example.com'
             assert result['name'] == 'Test User'
+            mock_client.parse_id_token.assert_called_once_with(token, nonce='test_nonce')
+
+    @patch('app.services.oauth_service._oauth_client')
+    @patch('app.services.oauth_service.current_app')
+    def test_get_user_info_reuses_verified_id_token(self, mock_app, mock_oauth, app):
+        """Test a repeated ID token is not verified a second time."""
+        from flask import session
+        
+        with app.test_request_context():
+            session['oauth_nonce'] = 'test_nonce'
+            mock_client = Mock()
+            mock_client.name = 'google'
+            mock_client.authorize_access_token.return_value = {'access_token': 'test_token', 'id_token': 'test_id_token'}
+            mock_client.parse_id_token.return_value = {'sub': 'google_user_123', 'email': 'user@example.com'}
+            mock_oauth.return_value = mock_client
+            
+            first = OAuthService.get_user_info('google', 'auth_code', 'https://example.com/callback')
+            second = OAuthService.get_user_info('google', 'other_auth_code', 'https://example.com/callback')
+            
+            assert first == second
+            assert first['oauth_id'] == 'google_user_123'
+            mock_client.parse_id_token.assert_called_once()
+
+    @patch('app.services.oauth_service._oauth_client')
+    @patch('app.services.oauth_service.current_app')
+    def test_get_user_info_uses_claims_verified_during_exchange(self, mock_app, mock_oauth, app):
+        """Test claims Authlib verified during the code exchange are used as they are."""
+        with app.test_request_context():
+            mock_client = Mock()
+            mock_client.authorize_access_token.return_value = {
+                'access_token': 'test_token',
+                'id_token': 'test_id_token',
+                'userinfo': {'sub': 'google_user_123', 'email': 'user@example.com'}
+            }
+            mock_oauth.return_value = mock_client
+            
+            result = OAuthService.get_user_info('google', 'auth_code', 'https://example.com/callback')
+            
+            assert result['oauth_id'] == 'google_user_123'
+            mock_client.parse_id_token.assert_not_called()
 
-    @patch('app.services.oauth_service.oauth')
+    @patch('app.services.oauth_service._oauth_client')
+    @patch('app.services.oauth_service.current_app')
+    def test_get_user_info_id_token_needs_session_nonce(self, mock_app, mock_oauth, app):
+        """Test an ID token is not trusted without the nonce the flow was started with."""
+        with app.test_request_context():
+            mock_client = Mock()
+            mock_client.name = 'apple'
+            mock_client.authorize_access_token.return_value = {'access_token': 'test_token', 'id_token': 'test_id_token'}
+            mock_client.parse_id_token.return_value = {'sub': 'apple_user_123', 'email': 'user@example.com'}
+            mock_oauth.return_value = mock_client
+            
+            assert OAuthService.get_user_info('apple', 'auth_code', 'https://example.com/callback') is None
+            mock_client.parse_id_token.assert_not_called()
+
+    @patch('app.services.oauth_service._oauth_client')
+    def test_get_authorization_url_stores_nonce(self, mock_oauth, app):
+        """Test the nonce of an OpenID Connect flow is kept for ID token verification."""
+        from flask import session
+        
+        with app.test_request_context():
+            mock_client = Mock()
+            mock_client.create_authorization_url.return_value = {
+                'url': 'https://accounts.google.com/oauth/authorize?test=1', 'nonce': 'test_nonce'
+            }
+            mock_oauth.return_value = mock_client
+            
+            OAuthService.get_authorization_url('google', 'https://example.com/callback')
+            assert session['oauth_nonce'] == 'test_nonce'
+            
+            OAuthService.cleanup_oauth_session()
+            assert 'oauth_nonce' not in session
+
+    @patch('app.services.oauth_service._oauth_client')
+    @patch('app.services.oauth_service.current_app')
+    def test_get_user_info_replayed_code_is_exchanged_again(self, mock_app, mock_oauth, app):
+        """Test a finished exchange is not handed to a later callback, even with the same code."""
+        from flask import session
+        
+        with app.test_request_context():
+            mock_client = Mock()
+            mock_client.authorize_access_token.return_value = {'access_token': 'test_token', 'id_token': 'test_id_token'}
+            mock_client.parse_id_token.return_value = {'sub': 'google_user_123', 'email': 'user@example.com'}
+            mock_oauth.return_value = mock_client
+            
+            session['oauth'] = 'google:victim_state'
+            OAuthService.get_user_info('google', 'auth_code', 'https://example.com/callback')
+            
+            # Another session replaying the code goes back to the provider
+            session['oauth'] = 'google:attacker_state'
+            OAuthService.get_user_info('google', 'auth_code', 'https://example.com/callback')
+            
+            assert mock_client.authorize_access_token.call_count == 2
+
+    @patch('app.services.oauth_service._oauth_client')
     @patch('app.services.oauth_service.current_app')
     def test_get_user_info_facebook_success(self, mock_app, mock_oauth, app):
         """Test successful Facebook user info retrieval."""
-        with app.app_context():
+        with app.test_request_context():
             mock_client = Mock()
             token = {'access_token': 'test_token'}
             mock_client.authorize_access_token.return_value = token
             
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {
+            mock_response.content = json.dumps({
                 'id': 'facebook_user_456',
                 'email': 'user@example.com',
                 'name': 'Test User',
                 'first_name': 'Test',
                 'last_name': 'User',
                 'picture': {'data': {'url': 'https://example.com/avatar.jpg'}}
-            }
+            }).encode()
             mock_client.get.return_value = mock_response
-            mock_oauth.create_client.return_value = mock_client
+            mock_oauth.return_value = mock_client
             
             result = OAuthService.get_user_info('facebook', 'auth_code', 'https://example.com/callback')
             
@@ -119,25 +230,25 @@ class TestOAuthService:
             assert result['email'] == 'user@example.com'
             assert result['name'] == 'Test User'
 
-    @patch('app.services.oauth_service.oauth')
+    @patch('app.services.oauth_service._oauth_client')
     @patch('app.services.oauth_service.current_app')
     def test_get_user_info_no_client(self, mock_app, mock_oauth, app):
         """Test user info retrieval with no OAuth client."""
-        with app.app_context():
-            mock_oauth.create_client.return_value = None
+        with app.test_request_context():
+            mock_oauth.return_value = None
             
             result = OAuthService.get_user_info('google', 'auth_code', 'https://example.com/callback')
             
             assert result is None
 
-    @patch('app.services.oauth_service.oauth')
+    @patch('app.services.oauth_service._oauth_client')
     @patch('app.services.oauth_service.current_app')
     def test_get_user_info_token_exchange_failure(self, mock_app, mock_oauth, app):
         """Test user info retrieval when token exchange fails."""
-        with app.app_context():
+        with app.test_request_context():
             mock_client = Mock()
             mock_client.authorize_access_token.return_value = None
-            mock_oauth.create_client.return_value = mock_client
+            mock_oauth.return_value = mock_client
             
             result = OAuthService.get_user_info('google', 'auth_code', 'https://example.com/callback')
             
@@ -205,6 +316,24 @@ class TestOAuthService:
             assert user.oauth_provider == 'google'
             assert user.oauth_id == 'google_789'
 
+    def test_find_or_create_user_prefers_oauth_match(self, app):
+        """Test the OAuth identity wins when it and the email match different users."""
+        with app.app_context():
+            oauth_user = User(email='changed@example.com', oauth_provider='google', oauth_id='google_321')
+            email_user = User(email='taken@example.com', oauth_provider='facebook', oauth_id='fb_321')
+            db.session.add_all([oauth_user, email_user])
+            db.session.commit()
+            oauth_user_id = oauth_user.id
+
+            user_info = {'oauth_id': 'google_321', 'email': 'taken@example.com'}
+            user = OAuthService.find_or_create_user('google', user_info)
+
+            assert user.id == oauth_user_id
+
+            # The email alone belongs to an account linked to another provider
+            user_info = {'oauth_id': 'google_654', 'email': 'taken@example.com'}
+            assert OAuthService.find_or_create_user('google', user_info) is None
+
     def test_find_or_create_user_missing_required_data(self, app):
         """Test user creation with missing required data."""
         with app.app_context():
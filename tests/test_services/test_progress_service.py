@@ -1,5 +1,6 @@
 """Tests for progress service business logic."""
 import pytest
+from unittest.mock import patch
 from datetime import datetime, timedelta, UTC
 from app import create_app, db
 from app.models.user import User
@@ -168,7 +169,43 @@ class TestProgressService:
             assert result['session_duration_minutes'] == 30
             assert result['completion_percentage'] == 50.0  # 5/10 * 100
             assert result['total_alignments'] == sample_subtitle_data['total_alignments']
-    
+
+    def test_get_user_progress_bulk(self, app, sample_subtitle_data, count_queries):
+        """Test getting progress for several links in one query."""
+        with app.app_context():
+            user_id = sample_subtitle_data['user_id']
+            sub_link_id = sample_subtitle_data['sub_link_id']
+
+            # A second link without progress or alignments
+            subtitle = SubTitle(title='Other Movie')
+            db.session.add(subtitle)
+            db.session.flush()
+            other_link = SubLink(fromid=subtitle.id, fromlang=1, toid=subtitle.id, tolang=2)
+            db.session.add(other_link)
+            db.session.add(UserProgress(
+                user_id=user_id,
+                sub_link_id=sub_link_id,
+                current_alignment_index=5,
+                total_alignments_completed=5
+            ))
+            db.session.commit()
+            other_link_id = other_link.id
+
+            with count_queries() as statements:
+                result = ProgressService.get_user_progress_bulk(user_id, [sub_link_id, other_link_id])
+
+            # progress records with their alignment totals
+            assert len(statements) == 1
+            assert list(result) == [sub_link_id, other_link_id]
+            assert result[sub_link_id]['completion_percentage'] == 50.0
+            assert result[sub_link_id]['total_alignments'] == 10
+            assert result[other_link_id] is None
+
+            assert ProgressService.get_user_progress_bulk(user_id, []) == {}
+            with pytest.raises(ProgressServiceError) as exc_info:
+                ProgressService.get_user_progress_bulk(user_id, [sub_link_id, 99999])
+            assert "99999 not found" in str(exc_info.value)
+
     def test_update_progress_new_record(self, app, sample_subtitle_data):
         """Test creating new progress record."""
         with app.app_context():
@@ -218,7 +255,86 @@ class TestProgressService:
             assert result['total_alignments_completed'] == 7  # Should be max(2, 7)
             assert result['session_duration_minutes'] == 30  # 10 + 20
             assert result['completion_percentage'] == 70.0  # 7/10 * 100
+
+    def test_update_progress_single_statement(self, app, sample_subtitle_data, count_queries):
+        """Test existing progress is upserted and returned without further queries."""
+        with app.app_context():
+            user_id = sample_subtitle_data['user_id']
+            sub_link_id = sample_subtitle_data['sub_link_id']
+            ProgressService.update_progress(user_id, sub_link_id, 2)
+
+            with count_queries() as statements:
+                result = ProgressService.update_progress(user_id, sub_link_id, 4, 5)
+
+            # a single upsert; the alignment total is memoized
+            assert len(statements) == 1
+            assert statements[0].startswith('INSERT')
+            assert result['current_alignment_index'] == 4
+            assert result['session_duration_minutes'] == 5
+            assert result['last_accessed'] is not None
     
+    @patch('app.services.progress_service._ensure_progress_writer')
+    def test_update_progress_deferred_updates_coalesced(self, mock_writer, app, sample_subtitle_data, count_queries):
+        """Test deferred updates are buffered, merged and written together."""
+        with app.app_context():
+            app.config['PROGRESS_WRITE_BEHIND_SECONDS'] = 60
+            user_id = sample_subtitle_data['user_id']
+            sub_link_id = sample_subtitle_data['sub_link_id']
+
+            # The first update is written through so the record is known
+            ProgressService.update_progress(user_id, sub_link_id, 2, 1, defer=True)
+
+            with count_queries() as statements:
+                ProgressService.update_progress(user_id, sub_link_id, 8, 2, defer=True)
+                result = ProgressService.update_progress(user_id, sub_link_id, 6, 3, defer=True)
+
+            assert statements == []
+            mock_writer.assert_called()
+            assert result['current_alignment_index'] == 6
+            assert result['total_alignments_completed'] == 8
+            assert result['session_duration_minutes'] == 6
+            assert result['completion_percentage'] == 60.0
+            assert db.session.get(UserProgress, result['id']).session_duration_minutes == 1
+
+            # Reads include the updates still waiting in the buffer
+            progress = ProgressService.get_user_progress(user_id, sub_link_id)
+            assert progress['current_alignment_index'] == 6
+            assert progress['total_alignments_completed'] == 8
+            assert progress['session_duration_minutes'] == 6
+            assert progress['completion_percentage'] == 60.0
+            assert progress['last_accessed'] == result['last_accessed']
+
+            assert ProgressService.flush_pending_progress() == 1
+            assert ProgressService.flush_pending_progress() == 0
+            progress = db.session.get(UserProgress, result['id'])
+            assert progress.current_alignment_index == 6
+            assert progress.total_alignments_completed == 8
+            assert progress.session_duration_minutes == 6
+
+            # A save that is not deferred writes through along with anything still buffered
+            ProgressService.update_progress(user_id, sub_link_id, 9, 4, defer=True)
+            result = ProgressService.update_progress(user_id, sub_link_id, 7, 5)
+            db.session.expire_all()
+            progress = db.session.get(UserProgress, result['id'])
+            assert progress.current_alignment_index == 7
+            assert progress.total_alignments_completed == 9
+            assert progress.session_duration_minutes == 15
+            assert result['session_duration_minutes'] == 15
+
+    def test_update_progress_invalidates_cached_analytics(self, app, sample_subtitle_data):
+        """Test cached dashboard statistics are dropped when progress is written."""
+        from app.services.session_analytics_service import SessionAnalyticsService
+
+        with app.app_context():
+            user_id = sample_subtitle_data['user_id']
+            assert SessionAnalyticsService.get_dashboard_statistics(user_id)['total_sessions'] == 0
+
+            ProgressService.update_progress(user_id, sample_subtitle_data['sub_link_id'], 3, 10)
+
+            stats = SessionAnalyticsService.get_dashboard_statistics(user_id)
+            assert stats['total_sessions'] == 1
+            assert stats['total_study_minutes'] == 10
+
     def test_update_progress_backward_movement(self, app, sample_subtitle_data):
         """Test updating progress when user moves backward."""
         with app.app_context():
@@ -292,7 +408,53 @@ class TestProgressService:
                     session_duration_minutes=5
                 )
             assert "exceeds total alignments" in str(exc_info.value)
-    
+
+    def test_alignment_total_cached_until_alignment_data_changes(self, app, sample_subtitle_data):
+        """Test alignment totals are cached and refreshed when link_data is saved."""
+        from app.utils.cache import alignment_total_cache
+
+        with app.app_context():
+            alignment_total_cache.clear()
+            sub_link_id = sample_subtitle_data['sub_link_id']
+            ProgressService.update_progress(sample_subtitle_data['user_id'], sub_link_id, 5)
+
+            assert alignment_total_cache.get(sub_link_id) == 10
+            assert ProgressService.update_progress(sample_subtitle_data['user_id'], sub_link_id, 5)['total_alignments'] == 10
+
+            sub_link_line = SubLinkLine.query.filter_by(sub_link_id=sub_link_id).first()
+            sub_link_line.link_data = sub_link_line.link_data[:5]
+            db.session.commit()
+
+            result = ProgressService.update_progress(sample_subtitle_data['user_id'], sub_link_id, 5)
+            assert result['total_alignments'] == 5
+            assert result['completion_percentage'] == 100.0
+
+    def test_alignment_total_recounted_after_alignments_loaded_outside_orm(self, app, sample_subtitle_data):
+        """Test a link whose alignments are loaded by SQL later is not stuck at zero."""
+        from app.utils.cache import alignment_total_cache
+        from app.utils.database import backfill_sub_link_alignments
+
+        with app.app_context():
+            alignment_total_cache.clear()
+            user_id = sample_subtitle_data['user_id']
+            sub_link = SubLink(fromid=1, fromlang=1, toid=1, tolang=2)
+            db.session.add(sub_link)
+            db.session.commit()
+
+            ProgressService.update_progress(user_id, sub_link.id, 0)
+            assert alignment_total_cache.get(sub_link.id) is None
+
+            # Bulk loads skip the ORM events that invalidate cached totals
+            db.session.execute(SubLinkLine.__table__.insert(), {
+                'sub_link_id': sub_link.id,
+                'link_data': [[[1], [2]], [[3], [4]]]
+            })
+            db.session.commit()
+            backfill_sub_link_alignments()
+
+            result = ProgressService.update_progress(user_id, sub_link.id, 1)
+            assert result['total_alignments'] == 2
+
     def test_calculate_completion_percentage(self):
         """Test completion percentage calculation."""
         # Normal case
@@ -314,7 +476,7 @@ class TestProgressService:
             result = ProgressService.get_recent_progress(sample_subtitle_data['user_id'])
             assert result == []
     
-    def test_get_recent_progress_with_data(self, app):
+    def test_get_recent_progress_with_data(self, app, count_queries):
         """Test getting recent progress with existing data."""
         with app.app_context():
             # Create languages and user first
@@ -370,10 +532,15 @@ class TestProgressService:
             db.session.add_all(progress_records)
             db.session.commit()
             
-            # Get recent progress
-            result = ProgressService.get_recent_progress(user.id, limit=3)
-            
+            # Get recent progress, counting the statements it issues
+            user_id = user.id
+            with count_queries() as statements:
+                result = ProgressService.get_recent_progress(user_id, limit=3)
+
             assert len(result) == 3  # Limited to 3 records
+            # progress records with their alignment totals
+            assert len(statements) == 1
+            assert all(progress_item['total_alignments'] == 2 for progress_item in result)
             
             # Should be sorted by last_accessed descending (most recent first)
             for i in range(len(result) - 1):
@@ -5,6 +5,7 @@ from app import create_app, db
 from app.models.user import User
 from app.models.subtitle import UserProgress, SubLink, SubLinkLine
 from app.services.session_analytics_service import SessionAnalyticsService, SessionAnalyticsServiceError
+from app.utils.cache import analytics_cache
 
 
 @pytest.fixture
@@ -16,6 +17,7 @@ def app():
     
     with app.app_context():
         db.create_all()
+        analytics_cache.clear()
         yield app
         db.drop_all()
 
@@ -279,6 +281,92 @@ class TestSessionAnalyticsService:
             percentage = SessionAnalyticsService._calculate_progress_percentage(5, test_sub_link.id)
             assert percentage == 0.0
     
+    def test_query_count_independent_of_sessions(self, app, count_queries):
+        """Test each analytics method issues a fixed number of statements however many sessions exist."""
+        with app.app_context():
+            user = User(email='counts@example.com')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+            for sub_link_id in range(1, 6):
+                db.session.add(UserProgress(
+                    user_id=user_id,
+                    sub_link_id=sub_link_id,
+                    current_alignment_index=sub_link_id,
+                    total_alignments_completed=sub_link_id,
+                    session_duration_minutes=10,
+                    last_accessed=datetime.now() - timedelta(days=sub_link_id)
+                ))
+            db.session.commit()
+            
+            calls = [
+                (lambda: SessionAnalyticsService.get_dashboard_statistics(user_id), 1),
+                (lambda: SessionAnalyticsService.calculate_learning_streak(user_id), 1),
+                (lambda: SessionAnalyticsService.get_learning_velocity_trends(user_id), 1),
+                (lambda: SessionAnalyticsService.get_progress_chart_data(user_id, 'weekly'), 1),
+                (lambda: SessionAnalyticsService.get_progress_chart_data(user_id, 'monthly', 90), 1),
+                (lambda: SessionAnalyticsService.get_session_history(user_id), 1),
+            ]
+            with count_queries() as statements:
+                for call, expected in calls:
+                    analytics_cache.clear()
+                    statements.clear()
+                    call()
+                    assert len(statements) == expected, statements
+    
+    def test_session_history_pages_by_cursor(self, app):
+        """Test passing the last entry's time as the cursor continues with the older sessions."""
+        with app.app_context():
+            user = User(email='pages@example.com')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+            for sub_link_id in range(1, 6):
+                db.session.add(SubLink(id=sub_link_id, fromid=1, fromlang=1, toid=2, tolang=2))
+                db.session.add(UserProgress(
+                    user_id=user_id,
+                    sub_link_id=sub_link_id,
+                    session_duration_minutes=10,
+                    last_accessed=datetime.now() - timedelta(days=sub_link_id)
+                ))
+            db.session.commit()
+            
+            first_page = SessionAnalyticsService.get_session_history(user_id, limit=3)
+            cursor = (datetime.fromisoformat(first_page[-1]['datetime']), first_page[-1]['progress_id'])
+            second_page = SessionAnalyticsService.get_session_history(user_id, limit=3, before=cursor)
+            
+            assert [entry['sub_link_id'] for entry in first_page] == [1, 2, 3]
+            assert [entry['sub_link_id'] for entry in second_page] == [4, 5]
+    
+    def test_session_history_pages_through_shared_timestamps(self, app):
+        """Test sessions accessed in the same second are neither skipped nor repeated across pages."""
+        with app.app_context():
+            user = User(email='same-second@example.com')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+            accessed = datetime.now().replace(microsecond=0) - timedelta(hours=1)
+            for sub_link_id in range(1, 5):
+                db.session.add(SubLink(id=sub_link_id, fromid=1, fromlang=1, toid=2, tolang=2))
+                db.session.add(UserProgress(
+                    user_id=user_id,
+                    sub_link_id=sub_link_id,
+                    session_duration_minutes=10,
+                    last_accessed=accessed
+                ))
+            db.session.commit()
+            
+            pages = []
+            cursor = None
+            while True:
+                page = SessionAnalyticsService.get_session_history(user_id, limit=2, before=cursor)
+                if not page:
+                    break
+                pages.append([entry['sub_link_id'] for entry in page])
+                cursor = (datetime.fromisoformat(page[-1]['datetime']), page[-1]['progress_id'])
+            
+            assert pages == [[4, 3], [2, 1]]
+    
     def test_error_handling(self, app, test_user):
         """Test error handling in service methods."""
         with app.app_context():
@@ -1,5 +1,6 @@
 """Tests for subtitle service functionality."""
 import pytest
+from collections import namedtuple
 from unittest.mock import patch, MagicMock
 from sqlalchemy.exc import SQLAlchemyError
 from app.services.subtitle_service import SubtitleService
@@ -29,50 +30,85 @@ class TestSubtitleService:
         with pytest.raises(ValueError, match="Both movie_id and language_id are required"):
             SubtitleService.get_subtitle_content(0, 1)
 
-    @patch('app.services.subtitle_service.SubtitleService._movie_exists')
-    @patch('app.services.subtitle_service.SubtitleService._language_exists')
-    def test_get_subtitle_content_nonexistent_movie(self, mock_lang_exists, mock_movie_exists):
+    def test_get_subtitle_content_nonexistent_movie(self):
         """Test subtitle content retrieval with nonexistent movie."""
-        mock_movie_exists.return_value = False
-        mock_lang_exists.return_value = True
-        
         with pytest.raises(ValueError, match="Movie with ID 999 not found"):
             SubtitleService.get_subtitle_content(999, 1)
 
-    @patch('app.services.subtitle_service.SubtitleService._movie_exists')
-    @patch('app.services.subtitle_service.SubtitleService._language_exists')
-    def test_get_subtitle_content_nonexistent_language(self, mock_lang_exists, mock_movie_exists):
+    def test_get_subtitle_content_nonexistent_language(self):
         """Test subtitle content retrieval with nonexistent language."""
-        mock_movie_exists.return_value = True
-        mock_lang_exists.return_value = False
-        
         with pytest.raises(ValueError, match="Language with ID 999 not found"):
             SubtitleService.get_subtitle_content(1, 999)
 
+    def test_get_subtitle_content_single_query(self, count_queries):
+        """Test lines and existence checks are read in one statement."""
+        from app import db
+        from app.models.subtitle import SubLine
+
+        db.session.add_all([
+            SubLine(movie_id=2, sequence=2, content='World', language_id=1),
+            SubLine(movie_id=2, sequence=1, content='Hello', language_id=1),
+            SubLine(movie_id=2, sequence=1, content='Hola', language_id=2)
+        ])
+        db.session.commit()
+
+        with count_queries() as statements:
+            result = SubtitleService.get_subtitle_content(2, 1)
+
+        assert [line['content'] for line in result] == ['Hello', 'World']
+        assert len(statements) == 1
+
+        # Lines are cached column by column and expanded again on a hit
+        cached = subtitle_cache.get(2, 1)
+        assert cached['language_id'] == 1
+        assert cached['contents'] == ['Hello', 'World']
+        assert SubtitleService.get_subtitle_content(2, 1) == result
+
+        # A known movie and language without lines is empty, not an error
+        assert SubtitleService.get_subtitle_content(3, 1) == []
+
+    def test_get_subtitle_content_pair(self, count_queries):
+        """Test both languages are read in one statement and cached separately."""
+        from app import db
+        from app.models.subtitle import SubLine
+
+        db.session.add_all([
+            SubLine(movie_id=2, sequence=2, content='World', language_id=1),
+            SubLine(movie_id=2, sequence=1, content='Hello', language_id=1),
+            SubLine(movie_id=2, sequence=1, content='Hola', language_id=2)
+        ])
+        db.session.commit()
+
+        with count_queries() as statements:
+            english, spanish = SubtitleService.get_subtitle_content_pair(2, 1, 2)
+            assert len(statements) == 1
+
+            # Both entries are cached, so either single-language read is a hit
+            assert SubtitleService.get_subtitle_content(2, 2) == spanish
+            assert SubtitleService.get_subtitle_content_pair(2, 2, 1) == (spanish, english)
+            assert len(statements) == 1
+
+        assert [line['content'] for line in english] == ['Hello', 'World']
+        assert [line['content'] for line in spanish] == ['Hola']
+
+        # A language without lines is empty, an unknown one still raises
+        assert SubtitleService.get_subtitle_content_pair(2, 1, 3) == (english, [])
+        with pytest.raises(ValueError, match="Language with ID 999 not found"):
+            SubtitleService.get_subtitle_content_pair(2, 1, 999)
+
     @patch('app.services.subtitle_service.db.engine.connect')
-    @patch('app.services.subtitle_service.SubtitleService._movie_exists')
-    @patch('app.services.subtitle_service.SubtitleService._language_exists')
-    def test_get_subtitle_content_success(self, mock_lang_exists, mock_movie_exists, mock_connect):
+    def test_get_subtitle_content_success(self, mock_connect):
         """Test successful subtitle content retrieval."""
-        mock_movie_exists.return_value = True
-        mock_lang_exists.return_value = True
-        
         # Mock database response
-        mock_row1 = MagicMock()
-        mock_row1.id = 1
-        mock_row1.sequence = 1
-        mock_row1.content = "Hello world"
-        mock_row1.language_id = 1
-        
-        mock_row2 = MagicMock()
-        mock_row2.id = 2
-        mock_row2.sequence = 2
-        mock_row2.content = "How are you?"
-        mock_row2.language_id = 1
+        SubtitleRow = namedtuple(
+            'SubtitleRow', 'movie_found language_found id sequence content language_id'
+        )
+        mock_row1 = SubtitleRow(True, True, 1, 1, "Hello world", 1)
+        mock_row2 = SubtitleRow(True, True, 2, 2, "How are you?", 1)
         
         mock_result = [mock_row1, mock_row2]
         mock_conn = MagicMock()
-        mock_conn.execute.return_value = mock_result
+        mock_conn.execute.return_value.all.return_value = mock_result
         mock_connect.return_value.__enter__.return_value = mock_conn
         
         result = SubtitleService.get_subtitle_content(123, 1)
@@ -92,12 +128,8 @@ class TestSubtitleService:
         mock_conn.execute.assert_called_once()
 
     @patch('app.services.subtitle_service.db.engine.connect')
-    @patch('app.services.subtitle_service.SubtitleService._movie_exists')
-    @patch('app.services.subtitle_service.SubtitleService._language_exists')
-    def test_get_subtitle_content_database_error(self, mock_lang_exists, mock_movie_exists, mock_connect):
+    def test_get_subtitle_content_database_error(self, mock_connect):
         """Test subtitle content retrieval with database error."""
-        mock_movie_exists.return_value = True
-        mock_lang_exists.return_value = True
         mock_connect.side_effect = SQLAlchemyError("Database connection failed")
         
         with pytest.raises(Exception, match="Database error while fetching subtitles"):
@@ -110,19 +142,12 @@ class TestSubtitleService:
         mock_movie_exists.return_value = True
         
         # Mock database response
-        mock_row1 = MagicMock()
-        mock_row1.language_id = 1
-        mock_row1.language_name = "english"
-        mock_row1.display_name = "English"
-        
-        mock_row2 = MagicMock()
-        mock_row2.language_id = 2
-        mock_row2.language_name = "spanish"
-        mock_row2.display_name = "Spanish"
-        
-        mock_result = [mock_row1, mock_row2]
+        mock_result = [
+            {'id': 1, 'name': 'english', 'display_name': 'English'},
+            {'id': 2, 'name': 'spanish', 'display_name': 'Spanish'}
+        ]
         mock_conn = MagicMock()
-        mock_conn.execute.return_value = mock_result
+        mock_conn.execute.return_value.mappings.return_value.all.return_value = mock_result
         mock_connect.return_value.__enter__.return_value = mock_conn
         
         result = SubtitleService.get_available_languages(123)
@@ -146,10 +171,8 @@ class TestSubtitleService:
     def test_validate_subtitle_access_success(self, mock_connect):
         """Test successful subtitle access validation."""
         # Mock database response indicating access is allowed
-        mock_result = MagicMock()
-        mock_result.count = 1
         mock_conn = MagicMock()
-        mock_conn.execute.return_value.fetchone.return_value = mock_result
+        mock_conn.execute.return_value.first.return_value = (1,)
         mock_connect.return_value.__enter__.return_value = mock_conn
         
         result = SubtitleService.validate_subtitle_access(123, 1, 1, 2)
@@ -159,10 +182,8 @@ class TestSubtitleService:
     def test_validate_subtitle_access_denied(self, mock_connect):
         """Test subtitle access validation when access is denied."""
         # Mock database response indicating no access
-        mock_result = MagicMock()
-        mock_result.count = 0
         mock_conn = MagicMock()
-        mock_conn.execute.return_value.fetchone.return_value = mock_result
+        mock_conn.execute.return_value.first.return_value = None
         mock_connect.return_value.__enter__.return_value = mock_conn
         
         result = SubtitleService.validate_subtitle_access(123, 1, 1, 2)
@@ -210,36 +231,28 @@ class TestSubtitleService:
         assert 'hit_rate_percent' in stats
         assert 'cache_size' in stats
 
-    @patch('app.services.subtitle_service.db.engine.connect')
-    def test_movie_exists_true(self, mock_connect):
+    def test_movie_exists_true(self):
         """Test movie existence check returning True."""
-        mock_result = MagicMock()
-        mock_result.count = 1
         mock_conn = MagicMock()
-        mock_conn.execute.return_value.fetchone.return_value = mock_result
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.execute.return_value.first.return_value = (1,)
         
-        result = SubtitleService._movie_exists(123)
+        result = SubtitleService._movie_exists(mock_conn, 123)
         assert result is True
 
-    @patch('app.services.subtitle_service.db.engine.connect')
-    def test_movie_exists_false(self, mock_connect):
+    def test_movie_exists_false(self):
         """Test movie existence check returning False."""
-        mock_result = MagicMock()
-        mock_result.count = 0
         mock_conn = MagicMock()
-        mock_conn.execute.return_value.fetchone.return_value = mock_result
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.execute.return_value.first.return_value = None
         
-        result = SubtitleService._movie_exists(999)
+        result = SubtitleService._movie_exists(mock_conn, 999)
         assert result is False
 
-    @patch('app.services.subtitle_service.db.engine.connect')
-    def test_movie_exists_database_error(self, mock_connect):
+    def test_movie_exists_database_error(self):
         """Test movie existence check with database error."""
-        mock_connect.side_effect = SQLAlchemyError("Database error")
+        mock_conn = MagicMock()
+        mock_conn.execute.side_effect = SQLAlchemyError("Database error")
         
-        result = SubtitleService._movie_exists(123)
+        result = SubtitleService._movie_exists(mock_conn, 123)
         assert result is False
 
     def test_validate_subtitle_data_valid(self):
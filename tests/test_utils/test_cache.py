@@ -2,7 +2,7 @@
 import pytest
 import time
 from unittest.mock import patch
-from app.utils.cache import SubtitleCache
+from app.utils.cache import AnalyticsCache, CatalogCache, CodeExchangeCache, IdTokenCache, SubtitleCache, TTLCache
 
 
 class TestSubtitleCache:
@@ -153,6 +153,42 @@ class TestSubtitleCache:
         # Cache should not exceed max_size
         assert len(cache._cache) <= cache.max_size
 
+    def test_cache_evicts_least_recently_used(self, cache):
+        """Test reading an entry keeps it when the size limit evicts."""
+        for i in range(10):
+            cache.set(i, 1, [{'id': i}])
+
+        cache.get(0, 1)
+        cache.set(10, 1, [{'id': 10}])
+
+        assert cache.get(0, 1) is not None
+        assert cache.get(1, 1) is None
+        assert len(cache._cache) == cache.max_size
+
+        # Evicted entries leave the movie index, so invalidation only sees live keys
+        cache.invalidate(1)
+        cache.invalidate(0)
+        assert 0 not in cache._movie_keys
+        assert 1 not in cache._movie_keys
+
+    def test_cache_byte_limit_and_copies(self):
+        """Test entries are capped by compressed size and reads return copies."""
+        lines = [{'id': i, 'sequence': i, 'content': f'Line {i}', 'language_id': 1} for i in range(200)]
+        cache = SubtitleCache(default_ttl=60, max_size=10)
+        cache.set(1, 1, lines)
+        entry_bytes = cache.get_stats()['memory_estimate_bytes']
+
+        limited = SubtitleCache(default_ttl=60, max_size=10, max_bytes=entry_bytes * 2)
+        for movie_id in range(1, 4):
+            limited.set(movie_id, 1, lines)
+
+        assert limited.get(1, 1) is None
+        assert limited.get_stats()['memory_estimate_bytes'] == entry_bytes * 2
+
+        result = limited.get(3, 1)
+        result[0]['content'] = 'Changed'
+        assert limited.get(3, 1) == lines
+
     def test_cache_stats(self, cache):
         """Test cache statistics collection."""
         movie_id = 123
@@ -242,4 +278,244 @@ class TestSubtitleCache:
         # Expired item should be cleaned up, non-expired should remain
         assert cache.get(123, 456) is None  # Expired
         assert cache.get(456, 789) is not None  # Still valid
-        assert cache.get(789, 123) is not None  # Still valid
\ No newline at end of file
+        assert cache.get(789, 123) is not None  # Still valid
+
+    def test_shared_store_across_workers(self):
+        """Test caches sharing a store see each other's entries and invalidations."""
+        import fnmatch
+
+        class FakeRedis:
+            def __init__(self):
+                self.data = {}
+
+            def get(self, key):
+                return self.data.get(key)
+
+            def set(self, key, value, ex=None):
+                self.data[key] = value
+
+            def delete(self, *keys):
+                for key in keys:
+                    self.data.pop(key, None)
+
+            def scan_iter(self, match, count=None):
+                return [key for key in self.data if fnmatch.fnmatch(key, match)]
+
+        shared = FakeRedis()
+        worker_a = SubtitleCache(default_ttl=60, max_size=10)
+        worker_b = SubtitleCache(default_ttl=60, max_size=10)
+        worker_a.use_shared_store(shared, local_ttl=1)
+        worker_b.use_shared_store(shared, local_ttl=1)
+
+        content = [{'id': 1, 'sequence': 1, 'content': 'Hello', 'language_id': 2}]
+        worker_a.set(123, 2, content)
+
+        assert worker_b.get(123, 2) == content
+        assert worker_b._hits == 1
+
+        worker_a.invalidate(123)
+        assert shared.data == {}
+
+        # The other worker's in-process copy lapses after the local TTL
+        time.sleep(1.1)
+        assert worker_b.get(123, 2) is None
+
+
+class TestTTLCache:
+    """Test cases for TTLCache class."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a fresh cache instance for testing."""
+        return TTLCache(default_ttl=60, max_size=3)
+
+    def test_full_cache_evicts_least_recently_used(self, cache):
+        """Test a full cache drops its least recently used entry, not everything."""
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key.upper())
+        assert cache.get('a') == 'A'
+
+        cache.set('d', 'D')
+
+        assert cache.get('b') is None
+        assert [cache.get(key) for key in ('a', 'c', 'd')] == ['A', 'C', 'D']
+
+    def test_full_cache_drops_expired_entries_first(self, cache):
+        """Test expired entries make room before live ones are evicted."""
+        cache.set('a', 'A', ttl=1)
+        cache.set('b', 'B', ttl=1)
+        cache.set('c', 'C')
+
+        with patch('time.time', return_value=time.time() + 2):
+            cache.set('d', 'D')
+            assert list(cache._cache) == ['c', 'd']
+            assert cache.get('c') == 'C'
+
+    def test_invalidate_and_clear(self, cache):
+        """Test single entries and the whole cache can be dropped."""
+        cache.set('a', 'A')
+        cache.set('b', 'B')
+
+        cache.invalidate('a')
+        cache.invalidate('missing')
+        assert cache.get('a') is None
+        assert cache.get('b') == 'B'
+
+        cache.clear()
+        assert cache.get('b') is None
+
+
+class TestCatalogCache:
+    """Test cases for CatalogCache class."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a fresh cache instance for testing."""
+        return CatalogCache(default_ttl=60, max_size=2)
+
+    def test_language_pair_order_shares_entry(self, cache):
+        """Test (a, b) and (b, a) resolve to the same result."""
+        movies = [{'id': 1, 'title': 'The Matrix'}]
+        cache.set(1, 2, (None, None), movies)
+
+        assert cache.get(2, 1, (None, None)) == movies
+        assert cache.get(1, 2, ('', None)) == movies
+        assert cache.get(1, 2, ('matrix', None)) is None
+        assert cache.get(1, 3, (None, None)) is None
+
+    def test_expired_result_is_dropped(self, cache):
+        """Test results expire after the TTL."""
+        cache.set(1, 2, (None, 'M'), [])
+
+        with patch('time.time', return_value=time.time() + 61):
+            assert cache.get(1, 2, (None, 'M')) is None
+
+
+class TestAnalyticsCache:
+    """Test cases for AnalyticsCache class."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a fresh cache instance for testing."""
+        return AnalyticsCache(default_ttl=30, max_size=2)
+
+    def test_invalidate_user_drops_only_their_results(self, cache):
+        """Test invalidating a user keeps other users' results."""
+        cache.set(1, ('dashboard', (), ()), {'total_sessions': 1})
+        cache.set(1, ('streak', (), ()), {'current_streak': 2})
+        cache.set(2, ('dashboard', (), ()), {'total_sessions': 3})
+
+        cache.invalidate_user(1)
+
+        assert cache.get(1, ('dashboard', (), ())) is None
+        assert cache.get(1, ('streak', (), ())) is None
+        assert cache.get(2, ('dashboard', (), ())) == {'total_sessions': 3}
+
+    def test_ttl_per_result(self, cache):
+        """Test results expire after their own TTL."""
+        cache.set(1, ('dashboard', (), ()), {})
+        cache.set(1, ('streak', (), ()), {}, ttl=60)
+
+        with patch('time.time', return_value=time.time() + 31):
+            assert cache.get(1, ('dashboard', (), ())) is None
+            assert cache.get(1, ('streak', (), ())) == {}
+
+
+class TestIdTokenCache:
+    """Test cases for IdTokenCache class."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a fresh cache instance for testing."""
+        return IdTokenCache(default_ttl=60, max_size=2)
+
+    def test_claims_keyed_by_provider_token_and_nonce(self, cache):
+        """Test claims are only returned for the same provider, token and nonce."""
+        claims = {'sub': 'user_123'}
+        cache.set('google', 'header.payload.signature', 'nonce_1', claims)
+
+        assert cache.get('google', 'header.payload.signature', 'nonce_1') == claims
+        assert cache.get('apple', 'header.payload.signature', 'nonce_1') is None
+        assert cache.get('google', 'other.payload.signature', 'nonce_1') is None
+        assert cache.get('google', 'header.payload.signature', 'nonce_2') is None
+        assert 'header.payload.signature' not in repr(cache._cache)
+
+    def test_expired_claims_are_dropped(self, cache):
+        """Test claims expire after the TTL."""
+        cache.set('google', 'token', 'nonce', {'sub': 'user_123'})
+
+        with patch('time.time', return_value=time.time() + 61):
+            assert cache.get('google', 'token', 'nonce') is None
+
+class TestCodeExchangeCache:
+    """Test cases for CodeExchangeCache class."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a fresh cache instance for testing."""
+        return CodeExchangeCache(wait_timeout=5)
+
+    def test_concurrent_duplicates_share_exchange(self, cache):
+        """Test a duplicate arriving mid-exchange waits for the same result."""
+        import threading
+
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def exchange():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {'oauth_id': 'user_123'}
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(cache.run('google', 'flow', 'code', exchange)))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(target=lambda: results.append(cache.run('google', 'flow', 'code', exchange)))
+        second.start()
+        release.set()
+        first.join()
+        second.join()
+
+        assert len(calls) == 1
+        assert results == [{'oauth_id': 'user_123'}, {'oauth_id': 'user_123'}]
+        assert cache.run('google', 'flow', 'other_code', lambda: None) is None
+
+    def test_failed_exchange_is_not_shared(self, cache):
+        """Test an exchange that raised is run again by the next caller."""
+        def failing_exchange():
+            raise RuntimeError('provider unavailable')
+
+        with pytest.raises(RuntimeError):
+            cache.run('google', 'flow', 'code', failing_exchange)
+
+        assert cache.run('google', 'flow', 'code', lambda: 'retried') == 'retried'
+
+    def test_finished_exchange_is_not_kept(self, cache):
+        """Test only exchanges in flight are shared, never a finished result."""
+        assert cache.run('google', 'flow', 'code', lambda: 'first') == 'first'
+        assert cache.run('google', 'flow', 'code', lambda: 'second') == 'second'
+        assert cache._cache == {}
+
+    def test_other_flow_does_not_share_exchange(self, cache):
+        """Test a duplicate code from another login flow runs its own exchange."""
+        import threading
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def exchange():
+            started.set()
+            release.wait(5)
+            return 'victim'
+
+        first = threading.Thread(target=lambda: cache.run('google', 'victim_flow', 'code', exchange))
+        first.start()
+        started.wait(5)
+        try:
+            assert cache.run('google', 'attacker_flow', 'code', lambda: 'attacker') == 'attacker'
+        finally:
+            release.set()
+            first.join()
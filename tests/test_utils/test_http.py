@@ -0,0 +1,47 @@
+"""Tests for outbound HTTP pooling utilities."""
+import requests
+
+from app.utils.http import SharedHTTPAdapter, http_adapter, mount_shared_pool
+
+
+class TestSharedHTTPAdapter:
+    """Test cases for SharedHTTPAdapter class."""
+
+    def test_pool_survives_session_close(self):
+        """Test closing a session does not clear the shared pool."""
+        adapter = SharedHTTPAdapter()
+        pool = adapter.poolmanager.connection_from_url('https://example.com')
+
+        with requests.Session() as session:
+            session.mount('https://', adapter)
+
+        assert adapter.poolmanager.connection_from_url('https://example.com') is pool
+
+    def test_reset_clears_pool(self):
+        """Test reset drops pooled connections."""
+        adapter = SharedHTTPAdapter()
+        pool = adapter.poolmanager.connection_from_url('https://example.com')
+
+        adapter.reset()
+
+        assert adapter.poolmanager.connection_from_url('https://example.com') is not pool
+
+
+def test_mount_shared_pool():
+    """Test sessions are routed through the global adapter."""
+    session = requests.Session()
+
+    mount_shared_pool(session)
+
+    assert session.get_adapter('https://accounts.google.com/') is http_adapter
+    assert session.get_adapter('http://localhost/') is http_adapter
+
+
+def test_oauth_clients_use_shared_pool(app):
+    """Test Authlib sessions created for registered providers mount the adapter."""
+    from app import oauth
+
+    with app.app_context():
+        client = oauth.create_client('facebook')
+        with client._get_oauth_client() as session:
+            assert session.get_adapter('https://graph.facebook.com/') is http_adapter
@@ -0,0 +1,67 @@
+"""Tests for token generation utilities."""
+import base64
+import os
+
+from app.utils import tokens
+from app.utils.tokens import EntropyPool, token_urlsafe
+
+
+class TestEntropyPool:
+    """Test cases for EntropyPool class."""
+
+    def test_take_returns_requested_length(self):
+        """Test slices have the requested size."""
+        pool = EntropyPool(refill_size=64)
+
+        assert len(pool.take(32)) == 32
+        assert len(pool.take(100)) == 100
+
+    def test_take_never_repeats_bytes(self):
+        """Test consecutive slices come from distinct parts of the pool."""
+        pool = EntropyPool(refill_size=64)
+
+        chunks = [pool.take(16) for _ in range(8)]
+
+        assert len(set(chunks)) == len(chunks)
+
+    def test_reset_discards_buffer(self):
+        """Test reset drops buffered entropy."""
+        pool = EntropyPool(refill_size=64)
+        pool.take(1)
+
+        pool.reset()
+
+        assert len(pool._buffer) == 0
+
+
+def test_token_urlsafe_format():
+    """Test tokens are unpadded base64url of the requested size."""
+    token = token_urlsafe(32)
+
+    assert '=' not in token
+    assert len(base64.urlsafe_b64decode(token + '=')) == 32
+    assert token != token_urlsafe(32)
+
+
+def test_token_urlsafe_skips_pool_by_default(app, monkeypatch):
+    """Test tokens come from secrets unless the pool is enabled."""
+    taken = []
+    monkeypatch.setattr(tokens.entropy_pool, 'take', lambda nbytes: taken.append(nbytes) or os.urandom(nbytes))
+
+    with app.app_context():
+        token_urlsafe(32)
+
+    assert taken == []
+
+
+def test_token_urlsafe_uses_pool_when_enabled(app, monkeypatch):
+    """Test tokens are drawn from the entropy pool when TOKEN_POOL_ENABLED is set."""
+    taken = []
+    monkeypatch.setattr(tokens.entropy_pool, 'take', lambda nbytes: taken.append(nbytes) or os.urandom(nbytes))
+    app.config['TOKEN_POOL_ENABLED'] = True
+
+    with app.app_context():
+        token = token_urlsafe(32)
+
+    assert taken == [32]
+    assert len(base64.urlsafe_b64decode(token + '=')) == 32
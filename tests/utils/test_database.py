@@ -141,3 +141,23 @@ class TestDatabaseUtils:
 
                 assert info["connection_status"] == "disconnected"
                 assert "connection_error" in info
+
+    def test_get_database_info_counts_in_one_query(self, app, count_queries):
+        """Test every table's row count comes from a single statement."""
+        with app.app_context():
+            with count_queries() as statements:
+                info = get_database_info()
+
+            count_statements = [s for s in statements if 'COUNT(*)' in s]
+            assert len(count_statements) == 1
+            assert all(table["row_count"] is not None for table in info["tables"])
+            assert next(t for t in info["tables"] if t["name"] == "languages")["row_count"] == 5
+
+    def test_pooled_connections_get_sqlite_pragmas(self, app):
+        """Test every new pooled connection is configured, not just a bootstrap one."""
+        with app.app_context():
+            db.engine.dispose()
+
+            with db.engine.connect() as conn:
+                assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == 10000
+                assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2  # memory